@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Run the cnxn command line interface, see sbc.py."""
+import os.path
+import sys
+
+# the modules of cnxn import each other by their flat module names
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sbc
+
+sys.exit(sbc.main())
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""The analysis module analyzes bolt connections for many load cases and
+reduces the bolt reactions to envelopes.
+
+A connection is a bolt group together with the load cases applied to it. The
+load cases are given as an (N, 3) array of application points in the user
+coordinate system and an (N, 3) array of force components. The reactions of
+every load case are calculated with the batched functions of the bolt_group
+and ic_solver modules and reduced to the maximum and minimum reaction on each
+bolt. envelope_bolt_forces spreads the work over a pool of processes.
+
+Definitions:
+    elastic reactions: direct shear plus elastic eccentric shear, the sum of
+                       the Rs and Re reactions of the demand module
+    plastic reactions: bolt reactions at the IC for the applied load, the Ru
+                       reactions of the demand module
+"""
+import concurrent.futures
+
+import numpy as np
+
+import bolt_group
+import ic_solver
+import models
+
+
+METHODS = ('elastic', 'plastic')
+
+
+class Envelope(object):
+    """Running envelope of the reactions on each bolt of a bolt group.
+
+    Args:
+        num_bolts (int): number of bolts in the bolt group
+
+    Attributes:
+        max_rx, min_rx (ndarray): extreme x-component of the reaction
+        max_ry, min_ry (ndarray): extreme y-component of the reaction
+        max_r (ndarray): maximum resultant reaction
+        max_r_case (ndarray): index of the load case causing max_r
+        num_cases (int): number of load cases included in the envelope
+        num_failed (int): number of those load cases with nan reactions, a
+                          plastic solve that did not converge, which are left
+                          out of the extremes
+    """
+
+    def __init__(self, num_bolts):
+        self.max_rx = np.full(num_bolts, -np.inf)
+        self.min_rx = np.full(num_bolts, np.inf)
+        self.max_ry = np.full(num_bolts, -np.inf)
+        self.min_ry = np.full(num_bolts, np.inf)
+        self.max_r = np.full(num_bolts, -np.inf)
+        self.max_r_case = np.full(num_bolts, -1, dtype=int)
+        self.num_cases = 0
+        self.num_failed = 0
+
+    def update(self, reactions, first_case=None):
+        """Add the reactions of a block of load cases to the envelope.
+
+        Args:
+            reactions (ndarray): (N, num_bolts, 2) bolt reactions
+            first_case (int): index of the first load case of the block,
+                              defaults to the number of cases seen so far
+
+        Returns:
+            None
+        """
+        if first_case is None:
+            first_case = self.num_cases
+        if reactions.shape[0] == 0:
+            return
+
+        rx = reactions[:, :, 0]
+        ry = reactions[:, :, 1]
+        r = np.hypot(rx, ry)
+        failed = np.isnan(r)
+
+        # fmax and fmin skip the nan reactions of failed load cases
+        np.fmax(self.max_rx, np.fmax.reduce(rx, axis=0), out=self.max_rx)
+        np.fmin(self.min_rx, np.fmin.reduce(rx, axis=0), out=self.min_rx)
+        np.fmax(self.max_ry, np.fmax.reduce(ry, axis=0), out=self.max_ry)
+        np.fmin(self.min_ry, np.fmin.reduce(ry, axis=0), out=self.min_ry)
+
+        r[failed] = -np.inf
+        case = r.argmax(axis=0)
+        block_max = r[case, np.arange(r.shape[1])]
+        larger = block_max > self.max_r
+        self.max_r[larger] = block_max[larger]
+        self.max_r_case[larger] = case[larger] + first_case
+
+        self.num_cases += reactions.shape[0]
+        self.num_failed += int(failed.any(axis=1).sum())
+
+    def merge(self, other):
+        """Combine another envelope of the same bolt group into this one.
+
+        Args:
+            other (Envelope): envelope of other load cases
+
+        Returns:
+            None
+        """
+        np.fmax(self.max_rx, other.max_rx, out=self.max_rx)
+        np.fmin(self.min_rx, other.min_rx, out=self.min_rx)
+        np.fmax(self.max_ry, other.max_ry, out=self.max_ry)
+        np.fmin(self.min_ry, other.min_ry, out=self.min_ry)
+
+        larger = other.max_r > self.max_r
+        self.max_r[larger] = other.max_r[larger]
+        self.max_r_case[larger] = other.max_r_case[larger]
+
+        self.num_cases += other.num_cases
+        self.num_failed += other.num_failed
+
+
+def calc_elastic_reactions(group, points, loads):
+    """Calculate the elastic bolt reactions of many load cases.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+
+    Returns:
+        reactions (ndarray): (N, num_bolts, 2) direct plus eccentric shear
+                             reaction (Rsx + Rex, Rsy + Rey) of each bolt
+
+    Raises:
+        ValueError: a load case has a moment about a bolt group with j of 0,
+                    see bolt_group.ecc_in_plane_elastic_batch
+    """
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    reactions = bolt_group.ecc_in_plane_elastic_batch(group, points, loads)
+    reactions -= loads[:, np.newaxis, :2]/len(group)
+
+    return reactions
+
+
+def calc_plastic_reactions(group, points, loads, **kwargs):
+    """Calculate the plastic bolt reactions of many load cases.
+
+    The bolt reactions at the IC are scaled so their moment about the IC
+    balances the applied load, as in demand.calc_bolt_fraction_reactions.
+    Concentric load cases share the load equally between the bolts.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+        **kwargs: passed on to ic_solver.solve_ic_batch
+
+    Returns:
+        reactions (ndarray): (N, num_bolts, 2) plastic reaction (Rux, Ruy) of
+                             each bolt, nan for load cases that did not converge
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    result = ic_solver.solve_ic_batch(group, points, loads, **kwargs)
+
+    x_cent, y_cent = group.centroid
+    xc, yc = group.local_coords
+    px = loads[:, 0]
+    py = loads[:, 1]
+    cx = points[:, 0] - x_cent
+    cy = points[:, 1] - y_cent
+    x_ic = np.where(result.concentric, 0.0, result.x_ic)
+    y_ic = np.where(result.concentric, 0.0, result.y_ic)
+
+    dx = xc - x_ic[:, np.newaxis]
+    dy = yc - y_ic[:, np.newaxis]
+    d = np.hypot(dx, dy)
+    r = ic_solver.calc_force_fraction(d, d.max(axis=1)[:, np.newaxis])
+    mp = py*(cx - x_ic) - px*(cy - y_ic)
+    rult = -1*mp/np.einsum('ij,ij->i', r, d)
+    r_d = np.divide(r, d, out=np.zeros_like(d), where=d > 0.0)*rult[:, np.newaxis]
+
+    reactions = np.empty((points.shape[0], len(group), 2))
+    reactions[:, :, 0] = -1*dy*r_d
+    reactions[:, :, 1] = dx*r_d
+
+    reactions[result.concentric] = (-1*loads[result.concentric, np.newaxis, :2]/
+                                    len(group))
+    reactions[~result.converged & ~result.concentric] = np.nan
+
+    return reactions
+
+
+def calc_reactions(group, points, loads, method='elastic', **kwargs):
+    """Calculate the bolt reactions of many load cases with either method.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+        method (str): 'elastic' or 'plastic'
+        **kwargs: passed on to calc_plastic_reactions, the elastic method
+                  takes none
+
+    Returns:
+        reactions (ndarray): (N, num_bolts, 2) bolt reactions
+    """
+    if method == 'elastic':
+        return calc_elastic_reactions(group, points, loads, **kwargs)
+    elif method == 'plastic':
+        return calc_plastic_reactions(group, points, loads, **kwargs)
+    raise ValueError('method must be one of %s' % (METHODS,))
+
+
+def envelope_stream(group, chunks, method='elastic'):
+    """Envelope the bolt reactions of a stream of load case chunks.
+
+    Only the current chunk and the running envelope are held in memory, so the
+    memory used does not depend on the number of load cases.
+
+    Args:
+        group (BoltGroup): bolt group
+        chunks (iterable): (points, loads) chunks of load cases, for example
+                           from loads.read_loads
+        method (str): 'elastic' or 'plastic'
+
+    Returns:
+        envelope (Envelope): envelope of every load case in the stream
+    """
+    envelope = Envelope(len(group))
+    for points, loads in chunks:
+        envelope.update(calc_reactions(group, points, loads, method))
+
+    return envelope
+
+
+def _envelope_task(task):
+    """Envelope one chunk of load cases of one connection in a worker."""
+    index, group, points, loads, first_case, method = task
+    envelope = Envelope(len(group))
+    envelope.update(calc_reactions(group, points, loads, method), first_case)
+    return index, envelope
+
+
+def _tasks(connections, chunk_size, method):
+    """Split every connection into chunks of at most chunk_size load cases."""
+    for index, (group, points, loads) in enumerate(connections):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+        for start in range(0, points.shape[0], chunk_size):
+            stop = start + chunk_size
+            yield (index, group, points[start:stop], loads[start:stop], start,
+                   method)
+
+
+def envelope_bolt_forces(connections, method='elastic', max_workers=None,
+                         chunk_size=1024, tasks_per_submit=8):
+    """Envelope the bolt reactions of many connections over a process pool.
+
+    Each connection is split into chunks of load cases. The chunks are
+    enveloped in worker processes and the chunk envelopes are merged back
+    into one envelope per connection.
+
+    Args:
+        connections (iterable): (group, points, loads) of each connection
+                                where points and loads are (N, 3) arrays
+        method (str): 'elastic' or 'plastic'
+        max_workers (int): number of worker processes, 0 or 1 runs in the
+                           calling process, None uses one per CPU
+        chunk_size (int): maximum number of load cases per task
+        tasks_per_submit (int): number of tasks sent to a worker at a time
+
+    Returns:
+        envelopes (list): Envelope of each connection in input order
+    """
+    if method not in METHODS:
+        raise ValueError('method must be one of %s' % (METHODS,))
+
+    connections = list(connections)
+    envelopes = [Envelope(len(group)) for group, _, _ in connections]
+    tasks = _tasks(connections, chunk_size, method)
+
+    if max_workers is not None and max_workers <= 1:
+        results = (_envelope_task(task) for task in tasks)
+        for index, envelope in results:
+            envelopes[index].merge(envelope)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers, initializer=models.init_worker,
+                initargs=(models.active,)) as executor:
+            results = executor.map(_envelope_task, tasks,
+                                   chunksize=tasks_per_submit)
+            for index, envelope in results:
+                envelopes[index].merge(envelope)
+
+    return envelopes
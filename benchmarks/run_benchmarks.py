@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the demand hot paths over a sweep of bolt counts and load cases.
+
+Each benchmark times one operation of the demand, bolt_group, ic_solver or
+analysis modules on a rectangular grid of bolts loaded by random eccentric
+forces. The sweep runs every benchmark for every combination of bolt count and
+number of load cases, skipping combinations whose work, bolts times load
+cases, exceeds the limit of the benchmark. The legacy list based functions
+get lower limits than the vectorized ones so a full run stays in minutes.
+
+The results are written as JSON so runs on different commits can be compared:
+
+    python benchmarks/run_benchmarks.py -o before.json
+    git checkout other-commit
+    python benchmarks/run_benchmarks.py -o after.json --compare before.json
+
+Output:
+    {"metadata": {"commit", "python", "numpy", "platform", "timestamp"},
+     "results": [{"name", "bolts", "cases", "number", "repeat", "best",
+                  "median", "per_case"}, ...]}
+
+    best and median are the best and median seconds for one call of the
+    benchmarked operation over all of its load cases, per_case is best/cases.
+"""
+import argparse
+import collections
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analysis
+import bolt_group
+import demand
+import ic_solver
+
+
+BOLT_COUNTS = (4, 16, 100, 1000, 10000)
+CASE_COUNTS = (1, 10, 100, 1000, 10000, 100000)
+QUICK_BOLT_COUNTS = (4, 100)
+QUICK_CASE_COUNTS = (1, 100)
+
+#: ratio of new to old time above which --compare reports a regression
+REGRESSION = 1.2
+
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'setup', 'cases',
+                                                 'max_work'])
+
+
+def grid(num_bolts, spacing=3.0):
+    """User coordinates of num_bolts bolts on a square-ish grid."""
+    cols = int(np.ceil(np.sqrt(num_bolts)))
+    index = np.arange(num_bolts)
+    return spacing*(index // cols), spacing*(index % cols)
+
+
+def random_loads(num_cases, seed=0):
+    """(points, loads) of num_cases random eccentric forces."""
+    rng = np.random.RandomState(seed)
+    points = np.column_stack([rng.uniform(20.0, 40.0, num_cases),
+                              rng.uniform(-10.0, 10.0, num_cases),
+                              np.zeros(num_cases)])
+    angle = rng.uniform(0.0, np.pi, num_cases)
+    loads = np.column_stack([np.cos(angle), -1*np.sin(angle),
+                             np.zeros(num_cases)])
+    return points, loads
+
+
+def legacy_bolts(num_bolts):
+    """List of bolt data structures on the benchmark grid."""
+    x, y = grid(num_bolts)
+    return bolt_group.BoltGroup(x, y, 0.75).to_bolts()
+
+
+def legacy_force(point, load):
+    """Force data structure of a single load case."""
+    return [tuple(point.tolist()), tuple(load.tolist()), [None, None, None],
+            [None, None, None], None, [None, None], None]
+
+
+def setup_demand_calc_j(num_bolts, num_cases):
+    bolts = legacy_bolts(num_bolts)
+    demand.calc_bolt_coords_wrt_centroid(bolts)
+    return lambda: demand.calc_j(bolts)
+
+
+def setup_group_calc_j(num_bolts, num_cases):
+    x, y = grid(num_bolts)
+    # a new group each call so the memoized j is not reused
+    return lambda: bolt_group.BoltGroup(x, y).j
+
+
+def _legacy_case_setup(num_bolts, num_cases):
+    bolts = legacy_bolts(num_bolts)
+    demand.calc_bolt_coords_wrt_centroid(bolts)
+    forces = [legacy_force(p, l) for p, l in zip(*random_loads(num_cases))]
+    for force in forces:
+        demand.calc_force_coords_wrt_centroid(bolts, force)
+        demand.calc_moments_about_centroid(force)
+    return bolts, forces
+
+
+def setup_demand_ecc_in_plane_elastic(num_bolts, num_cases):
+    bolts, forces = _legacy_case_setup(num_bolts, num_cases)
+
+    def run():
+        for force in forces:
+            demand.ecc_in_plane_elastic(bolts, force)
+    return run
+
+
+def setup_batch_ecc_in_plane_elastic(num_bolts, num_cases):
+    x, y = grid(num_bolts)
+    group = bolt_group.BoltGroup(x, y)
+    points, loads = random_loads(num_cases)
+    return lambda: bolt_group.ecc_in_plane_elastic_batch(group, points, loads)
+
+
+def setup_demand_iterate_to_ic(num_bolts, num_cases):
+    bolts, forces = _legacy_case_setup(num_bolts, num_cases)
+
+    def run():
+        for force in forces:
+            demand.iterate_to_ic(bolts, force)
+    return run
+
+
+def setup_solve_ic(num_bolts, num_cases):
+    x, y = grid(num_bolts)
+    group = bolt_group.BoltGroup(x, y)
+    points, loads = random_loads(num_cases)
+
+    def run():
+        for force in zip(points, loads):
+            ic_solver.solve_ic(group, force)
+    return run
+
+
+def setup_solve_ic_batch(num_bolts, num_cases):
+    x, y = grid(num_bolts)
+    group = bolt_group.BoltGroup(x, y)
+    points, loads = random_loads(num_cases)
+    return lambda: ic_solver.solve_ic_batch(group, points, loads)
+
+
+def _setup_envelope(method):
+    def setup(num_bolts, num_cases):
+        x, y = grid(num_bolts)
+        group = bolt_group.BoltGroup(x, y)
+        points, loads = random_loads(num_cases)
+        return lambda: analysis.envelope_bolt_forces([(group, points, loads)],
+                                                     method, max_workers=1)
+    return setup
+
+
+def setup_envelope_parallel(num_bolts, num_cases):
+    x, y = grid(num_bolts)
+    group = bolt_group.BoltGroup(x, y)
+    points, loads = random_loads(num_cases)
+    return lambda: analysis.envelope_bolt_forces([(group, points, loads)],
+                                                 'elastic')
+
+
+BENCHMARKS = [
+    Benchmark('demand.calc_j', setup_demand_calc_j, False, 10**4),
+    Benchmark('bolt_group.calc_j', setup_group_calc_j, False, 10**4),
+    Benchmark('demand.ecc_in_plane_elastic', setup_demand_ecc_in_plane_elastic,
+              True, 10**6),
+    Benchmark('bolt_group.ecc_in_plane_elastic_batch',
+              setup_batch_ecc_in_plane_elastic, True, 10**8),
+    Benchmark('demand.iterate_to_ic', setup_demand_iterate_to_ic, True, 10**4),
+    Benchmark('ic_solver.solve_ic', setup_solve_ic, True, 10**5),
+    Benchmark('ic_solver.solve_ic_batch', setup_solve_ic_batch, True, 10**7),
+    Benchmark('analysis.envelope_elastic', _setup_envelope('elastic'), True,
+              10**8),
+    Benchmark('analysis.envelope_plastic', _setup_envelope('plastic'), True,
+              10**7),
+    Benchmark('analysis.envelope_elastic_parallel', setup_envelope_parallel,
+              True, 10**8),
+]
+
+
+def time_call(func, min_time=0.2, repeat=5):
+    """Time func with timeit, calling it often enough to last min_time.
+
+    Returns:
+        number (int): calls per repeat
+        times (list): seconds per call of each repeat
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number*min_time/max(elapsed, 1e-9)))
+    times = [t/number for t in timer.repeat(repeat=repeat, number=number)]
+    return number, times
+
+
+def run(benchmarks, bolt_counts, case_counts, min_time=0.2, repeat=5,
+        max_work_scale=1.0, stream=None):
+    """Run every benchmark over the sweep.
+
+    Returns:
+        results (list): one dict per benchmark and sweep point, see the module
+                        docstring
+    """
+    results = []
+    for bench in benchmarks:
+        cases = case_counts if bench.cases else (1,)
+        for num_bolts in bolt_counts:
+            for num_cases in cases:
+                if num_bolts*num_cases > bench.max_work*max_work_scale:
+                    continue
+                func = bench.setup(num_bolts, num_cases)
+                number, times = time_call(func, min_time, repeat)
+                result = {'name': bench.name, 'bolts': num_bolts,
+                          'cases': num_cases, 'number': number,
+                          'repeat': repeat, 'best': min(times),
+                          'median': float(np.median(times)),
+                          'per_case': min(times)/num_cases}
+                results.append(result)
+                if stream is not None:
+                    stream.write('%-40s bolts=%-6d cases=%-7d %.3es\n' %
+                                 (bench.name, num_bolts, num_cases,
+                                  result['best']))
+                    stream.flush()
+    return results
+
+
+def metadata():
+    """Commit and platform the benchmarks were run on."""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         cwd=ROOT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': datetime.datetime.now().isoformat()}
+
+
+def compare(old, new, threshold=REGRESSION):
+    """Match the results of two runs and return the ratio of their times.
+
+    Returns:
+        rows (list): (name, bolts, cases, old best, new best, new/old) of
+                     every sweep point in both runs
+        regressions (list): the rows with new/old above threshold
+    """
+    key = lambda r: (r['name'], r['bolts'], r['cases'])
+    old_best = dict((key(r), r['best']) for r in old['results'])
+    rows = []
+    for result in new['results']:
+        if key(result) in old_best:
+            before = old_best[key(result)]
+            rows.append(key(result) + (before, result['best'],
+                                       result['best']/before))
+    regressions = [row for row in rows if row[5] > threshold]
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', help='JSON file for the results')
+    parser.add_argument('-k', '--filter', default='',
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('--quick', action='store_true',
+                        help='small sweep for a smoke test')
+    parser.add_argument('--bolts', type=int, nargs='+',
+                        help='bolt counts of the sweep')
+    parser.add_argument('--cases', type=int, nargs='+',
+                        help='load case counts of the sweep')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimum seconds per repeat')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--compare', metavar='JSON',
+                        help='previous results to compare against')
+    args = parser.parse_args(argv)
+
+    bolt_counts = args.bolts or (QUICK_BOLT_COUNTS if args.quick
+                                 else BOLT_COUNTS)
+    case_counts = args.cases or (QUICK_CASE_COUNTS if args.quick
+                                 else CASE_COUNTS)
+    benchmarks = [b for b in BENCHMARKS if args.filter in b.name]
+
+    data = {'metadata': metadata(),
+            'results': run(benchmarks, bolt_counts, case_counts,
+                           args.min_time, args.repeat, stream=sys.stderr)}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=1)
+    else:
+        json.dump(data, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        rows, regressions = compare(old, data)
+        for row in rows:
+            sys.stderr.write('%-40s bolts=%-6d cases=%-7d %.3es -> %.3es '
+                             '(%.2fx)\n' % row)
+        if regressions:
+            sys.stderr.write('%d regression(s) above %.2fx\n' %
+                             (len(regressions), REGRESSION))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,711 @@
+# -*- coding: utf-8 -*-
+"""The bolt_group module provides a columnar, NumPy backed bolt group and the
+array versions of the demand calculations.
+
+The demand module stores each bolt as an 11 slot list and loops over the bolts
+one at a time. This module stores the same information as one array per
+attribute (a column) so each calculation is a single whole-array operation.
+The functions in this module have the same names, arguments, and results as
+their counterparts in the demand module with a BoltGroup taking the place of
+the list of bolt data structures. The force data structure is unchanged.
+
+Definitions:
+    BoltGroup columns (one entry per bolt):
+        bolt_num: bolt number for user identification purposes
+        x, y: user entered bolt coordinates (user_x, user_y)
+        diameter: diameter of bolt
+        xc, yc: bolt coordinates with respect to the centroid of the bolt group
+        rsx, rsy: elastic shear reactions due to a direct shear load
+        rex, rey: elastic shear reactions due to an eccentric load in the plane
+                  of the connection
+        dx, dy: bolt coordinates with respect to the IC of the bolt group
+        d: distance from the IC to the bolt, sqrt(dx^2 + dy^2)
+        delta: deformation of the fastener
+        r: Ri/Rult ratio
+        rux, ruy: plastic shear reactions on the bolt
+
+Notes:
+    The columns map one to one onto the slots of the bolt data structure in the
+    demand module. BoltGroup.from_bolts and BoltGroup.to_bolts convert between
+    the two layouts.
+"""
+import hashlib
+
+import numpy as np
+
+import demand
+import instrument
+import models
+import out_plane
+import spatial
+
+
+class BoltGroup(object):
+    """Columnar representation of a bolt group.
+
+    Args:
+        x (array like): user entered x-coordinate of each bolt
+        y (array like): user entered y-coordinate of each bolt
+        diameter (float or array like): diameter of each bolt
+        bolt_num (array like): bolt number of each bolt, defaults to 1..n
+
+    Notes:
+        The result columns are initialized to nan and populated by the
+        functions in this module in the same order the demand module populates
+        the bolt data structure.
+
+        The section properties of the bolt group (centroid, ixx, iyy, j) are
+        calculated on first use and memoized. The user coordinates x and y are
+        read-only arrays; change them with set_coords or move_bolt so the
+        memoized properties are invalidated. The properties that depend on the
+        IC (d_max, sum_d_squared) are memoized until calc_bolt_location_wrt_ic
+        moves the IC.
+    """
+
+    result_columns = ('xc', 'yc', 'rsx', 'rsy', 'rex', 'rey', 'dx', 'dy', 'd',
+                      'delta', 'r', 'rux', 'ruy')
+
+    def __init__(self, x, y, diameter=None, bolt_num=None):
+        self._set_coords(x, y)
+
+        num_bolts = self._x.shape[0]
+
+        if diameter is None:
+            diameter = np.nan
+        self.diameter = np.broadcast_to(np.asarray(diameter, dtype=float),
+                                        (num_bolts,)).copy()
+
+        if bolt_num is None:
+            bolt_num = np.arange(1, num_bolts + 1)
+        self.bolt_num = np.array(bolt_num)
+
+        for name in self.result_columns:
+            setattr(self, name, np.full(num_bolts, np.nan))
+
+    def __len__(self):
+        return self._x.shape[0]
+
+    def _set_coords(self, x, y):
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+
+        if x.ndim != 1 or x.shape != y.shape:
+            raise ValueError('x and y must be 1-d arrays of the same length')
+
+        x.flags.writeable = False
+        y.flags.writeable = False
+        self._x = x
+        self._y = y
+        self._cache = {}
+        self._ic_cache = {}
+
+    @property
+    def x(self):
+        """User entered x-coordinate of each bolt (read-only)."""
+        return self._x
+
+    @property
+    def y(self):
+        """User entered y-coordinate of each bolt (read-only)."""
+        return self._y
+
+    def set_coords(self, x, y):
+        """Replace the user coordinates of every bolt.
+
+        Args:
+            x (array like): user entered x-coordinate of each bolt
+            y (array like): user entered y-coordinate of each bolt
+
+        Returns:
+            None
+
+        Notes:
+            The number of bolts can not change. Invalidates the memoized
+            section properties.
+        """
+        if np.shape(x) != self._x.shape:
+            raise ValueError('set_coords can not change the number of bolts')
+        self._set_coords(x, y)
+
+    def move_bolt(self, index, x, y):
+        """Move a single bolt to new user coordinates.
+
+        Args:
+            index (int): position of the bolt in the bolt group
+            x (float): new user entered x-coordinate of the bolt
+            y (float): new user entered y-coordinate of the bolt
+
+        Returns:
+            None
+
+        Notes:
+            Invalidates the memoized section properties.
+        """
+        new_x = self._x.copy()
+        new_y = self._y.copy()
+        new_x[index] = x
+        new_y[index] = y
+        self._set_coords(new_x, new_y)
+
+    def _memoize(self, name, func):
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = func()
+            return value
+
+    @property
+    def centroid(self):
+        """(x_centroid, y_centroid) of the bolt group."""
+        return self._memoize('centroid', lambda: (self._x.mean().item(),
+                                                  self._y.mean().item()))
+
+    @property
+    def local_coords(self):
+        """Read-only (xc, yc) arrays with respect to the centroid."""
+        def calc():
+            x_cent, y_cent = self.centroid
+            xc = self._x - x_cent
+            yc = self._y - y_cent
+            xc.flags.writeable = False
+            yc.flags.writeable = False
+            return xc, yc
+        return self._memoize('local_coords', calc)
+
+    @property
+    def ixx(self):
+        """2nd moment of area of the bolt pattern about the x-axis."""
+        return self._memoize('ixx', lambda: np.dot(self.local_coords[1],
+                                                   self.local_coords[1]).item())
+
+    @property
+    def iyy(self):
+        """2nd moment of area of the bolt pattern about the y-axis."""
+        return self._memoize('iyy', lambda: np.dot(self.local_coords[0],
+                                                   self.local_coords[0]).item())
+
+    @property
+    def j(self):
+        """Polar moment of area of the bolt pattern about the z-axis."""
+        return self._memoize('j', lambda: self.ixx + self.iyy)
+
+    @property
+    def index(self):
+        """spatial.BoltIndex of the bolt coordinates wrt the centroid."""
+        return self._memoize('index',
+                             lambda: spatial.BoltIndex(*self.local_coords))
+
+    def geometry_key(self, decimals=9):
+        """Hash of the bolt pattern, independent of bolt order and location.
+
+        The coordinates with respect to the centroid are rounded to the given
+        number of decimals and sorted, so two bolt groups that differ only by
+        a translation or the numbering of the bolts have the same key.
+
+        Args:
+            decimals (int): number of decimals kept of each coordinate
+
+        Returns:
+            key (str): hex digest of the canonical bolt coordinates
+        """
+        def calc():
+            xc, yc = self.local_coords
+            # adding 0.0 turns the -0.0 left by rounding into 0.0
+            coords = np.round(np.column_stack([xc, yc]), decimals) + 0.0
+            coords = coords[np.lexsort((coords[:, 1], coords[:, 0]))]
+            return hashlib.sha1(np.ascontiguousarray(coords).tobytes()
+                                ).hexdigest()
+        return self._memoize(('geometry_key', decimals), calc)
+
+    @classmethod
+    def from_bolts(cls, bolts):
+        """Build a bolt group from a list of bolt data structures.
+
+        Args:
+            bolts (data struct): list of the bolt data structure or of
+                                 records.Bolt records
+
+        Returns:
+            group (BoltGroup): columnar copy of the bolt user input
+        """
+        x = [bolt[1][0] for bolt in bolts]
+        y = [bolt[1][1] for bolt in bolts]
+        diameter = [bolt[2] for bolt in bolts]
+        bolt_num = [bolt[0] for bolt in bolts]
+
+        return cls(x, y, diameter, bolt_num)
+
+    def to_bolts(self):
+        """Return the bolt group as a list of bolt data structures.
+
+        Returns:
+            bolts (data struct): list of the bolt data structure populated with
+                                 the current contents of every column
+        """
+        bolts = []
+        for i in range(len(self)):
+            bolts.append([self.bolt_num[i].item(),
+                          (self.x[i].item(), self.y[i].item()),
+                          self.diameter[i].item(),
+                          [self.xc[i].item(), self.yc[i].item()],
+                          [self.rsx[i].item(), self.rsy[i].item()],
+                          [self.rex[i].item(), self.rey[i].item()],
+                          [self.dx[i].item(), self.dy[i].item()],
+                          self.d[i].item(),
+                          self.delta[i].item(),
+                          self.r[i].item(),
+                          [self.rux[i].item(), self.ruy[i].item()]])
+        return bolts
+
+
+def shear(group, force):
+    """Calculate the direct shear force in each direction on each bolt.
+
+    rx = px/num_bolts
+    ry = py/num_bolts
+
+    Args:
+        group (BoltGroup): bolt group
+        force (data struct): single force data structure
+
+    Returns:
+        None
+
+    Notes:
+        Populates the direct shear reactions rsx and rsy of the bolt group
+    """
+    num_bolts = len(group)
+    px = force[1][0]
+    py = force[1][1]
+
+    group.rsx[:] = -px/num_bolts
+    group.rsy[:] = -py/num_bolts
+
+
+def ecc_in_plane_elastic(group, force):
+    """Calc the bolt reactions in an elastic in plane eccentric shear connection.
+
+    rx = mz*local_yb/j
+    ry = -1*mz*local_xb/j
+
+    Args:
+        group (BoltGroup): bolt group
+        force (data struct): single force data structure
+
+    Returns:
+        None
+
+    Notes:
+        Populates the elastic eccentric reactions rex and rey of the bolt
+        group. See demand.ecc_in_plane_elastic for further details.
+    """
+    mz = force[2][2]
+
+    j = calc_j(group)
+
+    group.rex[:] = mz*group.yc/j
+    group.rey[:] = -1*mz*group.xc/j
+
+
+def ecc_in_plane_elastic_batch(group, points, loads):
+    """Calc the elastic in plane eccentric bolt reactions for many forces.
+
+    Evaluates ecc_in_plane_elastic for every force in one vectorized pass. The
+    centroid and polar moment of area of the bolt group are calculated once
+    and shared by all of the forces.
+
+    mz = py*cx - px*cy
+    rx = mz*local_yb/j
+    ry = -1*mz*local_xb/j
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates (user_x, user_y, user_z)
+                             of the application point of each force
+        loads (array like): (N, 3) force components (Px, Py, Pz) of each force
+
+    Returns:
+        reactions (ndarray): (N, num_bolts, 2) elastic eccentric reactions,
+                             reactions[i, j] = (Rex, Rey) of bolt j due to
+                             force i
+
+    Raises:
+        ValueError: points and loads have a different number of rows, or a
+                    force has a moment mz about a bolt group with j of 0, a
+                    single bolt, see out_plane.divide_moment
+
+    Notes:
+        The bolt group columns are not modified.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    if points.shape[0] != loads.shape[0]:
+        raise ValueError('points and loads must have the same number of rows')
+
+    x_cent, y_cent = group.centroid
+    xc, yc = group.local_coords
+    j = group.j
+
+    cx = points[:, 0] - x_cent
+    cy = points[:, 1] - y_cent
+    mz_j = out_plane.divide_moment(loads[:, 1]*cx - loads[:, 0]*cy, j, 'j')
+
+    reactions = np.empty((points.shape[0], len(group), 2))
+    np.multiply.outer(mz_j, yc, out=reactions[:, :, 0])
+    np.multiply.outer(-1*mz_j, xc, out=reactions[:, :, 1])
+
+    return reactions
+
+
+def elastic_reactions_batch(group, points, loads):
+    """Calc the elastic reactions of every bolt for arbitrary 3D forces.
+
+    Combines shear, ecc_in_plane_elastic and demand.ecc_out_plane_assume_na in
+    one pass. Each reaction component is linear in the basis (1, yc, xc) of the
+    bolt coordinates:
+
+    rx = -px/n + mz/j*local_yb
+    ry = -py/n - mz/j*local_xb
+    rz = -pz/n - mx/ixx*local_yb + my/iyy*local_xb
+
+    so the (N, 3, 3) coefficients of all of the forces are formed first and
+    applied to the (num_bolts, 3) basis with a single matrix multiply.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates (user_x, user_y, user_z)
+                             of the application point of each force
+        loads (array like): (N, 3) force components (Px, Py, Pz) of each force
+
+    Returns:
+        reactions (ndarray): (N, num_bolts, 3) elastic reactions,
+                             reactions[i, j] = (Rsx + Rex, Rsy + Rey, Rz) of
+                             bolt j due to force i
+
+    Notes:
+        The moments are taken about the centroid as in
+        demand.calc_moments_about_centroid. The bolt group columns are not
+        modified.
+
+    Raises:
+        ValueError: points and loads have a different number of rows, or a
+                    moment is applied about an axis the bolt pattern has no
+                    depth in (ixx, iyy or j of 0, a single row or column or a
+                    single bolt), see out_plane.divide_moment
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    if points.shape[0] != loads.shape[0]:
+        raise ValueError('points and loads must have the same number of rows')
+
+    num_bolts = len(group)
+    x_cent, y_cent = group.centroid
+    xc, yc = group.local_coords
+
+    cx = points[:, 0] - x_cent
+    cy = points[:, 1] - y_cent
+    cz = points[:, 2]
+    px, py, pz = loads[:, 0], loads[:, 1], loads[:, 2]
+
+    mx = pz*cy - py*cz
+    my = px*cz - pz*cx
+    mz = py*cx - px*cy
+
+    # coeffs[i, k] holds the multipliers of (1, yc, xc) for component k
+    coeffs = np.zeros((points.shape[0], 3, 3))
+    coeffs[:, :, 0] = -1*loads/num_bolts
+    mz_j = out_plane.divide_moment(mz, group.j, 'j')
+    coeffs[:, 0, 1] = mz_j
+    coeffs[:, 1, 2] = -1*mz_j
+    coeffs[:, 2, 1] = -1*out_plane.divide_moment(mx, group.ixx, 'ixx')
+    coeffs[:, 2, 2] = out_plane.divide_moment(my, group.iyy, 'iyy')
+
+    basis = np.column_stack((np.ones(num_bolts), yc, xc))
+
+    return np.matmul(basis, coeffs.transpose(0, 2, 1))
+
+
+def calc_centroid(group):
+    """Calculate the centroid of the bolt group.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        x_centroid (float): x-coordinate of bolt group centroid
+        y_centroid (float): y-coordinate of bolt group centroid
+    """
+    return group.centroid
+
+
+def calc_bolt_coords_wrt_centroid(group):
+    """Calculate bolt coords with respect to the centroid of the bolt group.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        None
+
+    Notes:
+        Populates xc and yc of the bolt group
+    """
+    group.xc[:], group.yc[:] = group.local_coords
+
+
+def calc_force_coords_wrt_centroid(group, force):
+    """Calculate force coords with respect to the centroid of the bolt group.
+
+    Args:
+        group (BoltGroup): bolt group
+        force (data struct): single force data structure attributes
+
+    Returns:
+        None
+
+    Notes:
+        Populates the x, y, and z coordinate location and the eccentricity of
+        the force data structure with respect to the centroid of the bolt group
+    """
+    x_cent, y_cent = group.centroid
+
+    cx = force[0][0] - x_cent
+    cy = force[0][1] - y_cent
+    cz = force[0][2]
+
+    force[3][0] = cx
+    force[3][1] = cy
+    force[3][2] = cz
+
+    delta_angle = demand.calc_delta_angle(force[1][0], force[1][1])
+
+    force[4] = abs(cx*np.cos(delta_angle) + cy*np.sin(delta_angle))
+
+
+def calc_ixx(group):
+    """Calculate the 2nd moment of area of the bolt pattern about the x-axis.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        sum_ixx (float): 2nd moment of area of bolt pattern about the x-axis
+    """
+    return group.ixx
+
+
+def calc_iyy(group):
+    """Calculate the 2nd moment of area of the bolt pattern about the y-axis.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        sum_iyy (float): 2nd moment of area of bolt pattern about the y-axis
+    """
+    return group.iyy
+
+
+def calc_j(group):
+    """Calculate the polar moment of area of bolt pattern about the z-axis.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        j (float): polar moment of area of the bolt pattern about the z-axis
+    """
+    return group.j
+
+
+def iterate_to_ic(group, force):
+    """Iterate to the location of the instantaneous center.
+
+    Same algorithm as demand.iterate_to_ic with every per bolt step carried
+    out on whole columns.
+
+    Args:
+        group (BoltGroup): bolt group
+        force (data struct): single force data structure
+
+    Returns:
+        x_ic (float): x-coordinate of the instantaneous center
+        y_ic (float): y-coordinate of the instantaneous center
+        ce (float): elastic coefficient from the first approximation
+        cu (float): ultimate coefficient from the last approximation
+
+    Raises:
+        RuntimeError: the iteration did not converge in 50 iterations
+    """
+    px = force[1][0]
+    py = force[1][1]
+    mo = force[2][2]
+    delta_angle = demand.calc_delta_angle(px, py)
+    x0 = 0.0 #coordinate system centered on centroid
+    y0 = 0.0 #coordinate system centered on centroid
+
+    fx = px
+    fy = py
+    count = 0
+    history = instrument.start_solve('bolt_group.iterate_to_ic')
+
+    while True:
+        x_ic, y_ic = calc_instanteous_center(group, fx, fy, mo, x0, y0)
+        calc_bolt_location_wrt_ic(group, x_ic, y_ic)
+        demand.calc_force_location_wrt_ic(force, x_ic, y_ic, delta_angle)
+        mp = demand.calc_mp(force)
+
+        sum_rux, sum_ruy, sum_m = calc_bolt_fraction_reactions(group, mp)
+
+        if count == 0:
+            sum_d_squared = calc_sum_d_squared(group)
+            d_max = calc_d_max(group)
+            ce = sum_d_squared/(d_max*mp)
+
+        cu = mp/sum_m
+
+        fx = px + sum_rux
+        fy = py + sum_ruy
+
+        error = max(abs(fx), abs(fy))
+        if history is not None:
+            history.append(error)
+
+        if error < 0.01:
+            if history is not None:
+                history.finish(count + 1, True)
+            break
+        elif count == 50:
+            if history is not None:
+                history.finish(count + 1, False)
+            raise RuntimeError('IC iteration did not converge')
+        else:
+            x0 = x_ic
+            y0 = y_ic
+
+        count += 1
+
+    return x_ic, y_ic, ce, cu
+
+
+def calc_bolt_fraction_reactions(group, mp):
+    """Calculate the resisting bolt force fraction.
+
+    Args:
+        group (BoltGroup): bolt group
+        mp (float): moment due to the applied force about the IC
+
+    Returns:
+        sum_rux (float): sum of the x-component of the bolt reactions
+        sum_ruy (float): sum of the y-component of the bolt reactions
+        sum_m (float): resisting moment of the bolt force fraction
+
+    Notes:
+        Populates delta, r, rux, and ruy of the bolt group.
+    """
+    sum_m = calc_moment_about_ic(group)
+
+    rult = -1*mp/sum_m
+    group.rux[:] = -1*group.dy/group.d*group.r*rult
+    group.ruy[:] = group.dx/group.d*group.r*rult
+
+    return group.rux.sum().item(), group.ruy.sum().item(), sum_m
+
+
+def calc_moment_about_ic(group):
+    """Calculate the moment about the IC of bolt force fraction.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        sum_m (float): The total resisting moment due to the bolt force fraction
+                       acting about the IC
+
+    Notes:
+        Populates delta and r of the bolt group with the active model of the
+        models module.
+    """
+    d_max = calc_d_max(group)
+
+    delta, r, sum_m = models.active.evaluate(group.d, d_max)
+    group.delta[:] = delta
+    group.r[:] = r #ri/rult
+
+    return float(sum_m)
+
+
+def calc_bolt_location_wrt_ic(group, x_ic, y_ic):
+    """Calculate the distance from the bolt to the instanteous center.
+
+    Args:
+        group (BoltGroup): bolt group
+        x_ic (float): x-coordinate of the instantaneous center
+        y_ic (float): y_coordinate of the instantaneous center
+
+    Returns:
+        None
+
+    Notes:
+        Populates dx, dy, and d of the bolt group and invalidates the memoized
+        IC dependent properties.
+    """
+    group.index.distances(x_ic, y_ic, out=(group.dx, group.dy, group.d))
+    group._ic_cache.clear()
+
+
+def calc_instanteous_center(group, fx, fy, mo, x0, y0):
+    """Calculate the instanteous center with respect to another coordinate point.
+
+    Args:
+        group (BoltGroup): bolt group
+        fx (float): x-component of the applied force
+        fy (float): y-component of the applied force
+        mo (float): moment about the centroid of the applied force
+        x0 (float): x-component of the previous approximation of the IC
+        y0 (float): y-component of the previous approximation of the IC
+
+    Returns
+        x1 (float): x-component of the current approximation of the IC
+        y1 (float): y-component of the current approximation of the IC
+    """
+    j = calc_j(group)
+
+    num_bolts = len(group)
+
+    ax = -fy/num_bolts*j/mo
+    ay = fx/num_bolts*j/mo
+
+    return x0 + ax, y0 + ay
+
+
+def calc_d_max(group):
+    """Return the maximum distance from the IC of any bolt in the bolt group.
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        d_max (float): Maximum distance from IC of any bolt in the bolt group
+
+    Notes:
+        Must call calc_bolt_location_wrt_ic before calling this function. The
+        IC iteration needs the distance to every bolt for the force fractions,
+        so the maximum is taken over those distances rather than queried from
+        BoltGroup.index. The result is memoized until the IC moves.
+    """
+    try:
+        return group._ic_cache['d_max']
+    except KeyError:
+        d_max = group._ic_cache['d_max'] = max(group.d.max().item(), 0.0)
+        return d_max
+
+
+def calc_sum_d_squared(group):
+    """Return the sum of the squared bolt distances."""
+    try:
+        return group._ic_cache['sum_d_squared']
+    except KeyError:
+        sum_d_squared = np.dot(group.d, group.d).item()
+        group._ic_cache['sum_d_squared'] = sum_d_squared
+        return sum_d_squared
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""The capacity module calculates the available strength of the bolts and the
+demand to capacity ratio of every bolt for many load cases at once.
+
+The strengths follow AISC 360-16 Section J3.6 and J3.7 with the nominal
+stresses of Table J3.2, in kips and inches:
+
+    shear: Rn = Fnv*Ab*ns
+    tension: Rn = Fnt*Ab
+    combined: Rn = F'nt*Ab, F'nt = 1.3*Fnt - Fnt/(phi*Fnv)*frv <= Fnt (LRFD)
+                            F'nt = 1.3*Fnt - omega*Fnt/Fnv*frv <= Fnt (ASD)
+
+The available strength is phi*Rn for LRFD and Rn/omega for ASD with phi = 0.75
+and omega = 2.00.
+
+Definitions:
+    reactions (ndarray): (..., num_bolts, 2) shear reactions (Rx, Ry) or
+                         (..., num_bolts, 3) reactions (Rx, Ry, Rz) as returned
+                         by the analysis and out_plane modules. The reactions
+                         are the negatives of the bolt forces, so the tension
+                         in a bolt is -Rz.
+    grade (str): bolt grade, a key of GRADES
+    threads_excluded (bool): threads are excluded from the shear planes (X),
+                             otherwise included (N)
+
+Notes:
+    Bearing and tearout at the bolt holes and the strength of the connected
+    parts are not considered, see the README.
+"""
+import collections
+
+import numpy as np
+
+import out_plane
+
+
+#: nominal tensile stress Fnt, shear stress Fnv with threads included (N) and
+#: shear stress Fnv with threads excluded (X) in ksi, AISC Table J3.2
+GRADES = {'A307': (45.0, 27.0, 27.0),
+          'A325': (90.0, 54.0, 68.0),
+          'A490': (113.0, 68.0, 84.0),
+          'F3125 Group A': (90.0, 54.0, 68.0),
+          'F3125 Group B': (113.0, 68.0, 84.0)}
+
+PHI = 0.75
+OMEGA = 2.00
+METHODS = ('LRFD', 'ASD')
+INTERACTIONS = ('aisc', 'elliptical')
+
+
+class Ratios(collections.namedtuple('Ratios', ['shear', 'tension',
+                                               'combined'])):
+    """Demand to capacity ratios, one entry per bolt and load case.
+
+    shear (ndarray): shear demand over available shear strength
+    tension (ndarray): tension demand over available tension strength
+    combined (ndarray): governing ratio including the interaction of shear
+                        and tension
+    """
+    __slots__ = ()
+
+
+def _stresses(grade, threads_excluded):
+    try:
+        fnt, fnv_n, fnv_x = GRADES[grade]
+    except KeyError:
+        raise ValueError('grade must be one of %s' % (sorted(GRADES),))
+    return fnt, fnv_x if threads_excluded else fnv_n
+
+
+def _resistance(method):
+    if method == 'LRFD':
+        return PHI
+    elif method == 'ASD':
+        return 1.0/OMEGA
+    raise ValueError('method must be one of %s' % (METHODS,))
+
+
+def shear_capacity(diameter, grade='A325', threads_excluded=False,
+                   shear_planes=1, method='LRFD'):
+    """Calculate the available shear strength of a bolt.
+
+    Args:
+        diameter (float or array like): nominal bolt diameter
+        grade (str): bolt grade
+        threads_excluded (bool): threads are excluded from the shear planes
+        shear_planes (int): number of shear planes
+        method (str): 'LRFD' or 'ASD'
+
+    Returns:
+        capacity (float or ndarray): phi*Rn or Rn/omega
+    """
+    fnt, fnv = _stresses(grade, threads_excluded)
+    return _resistance(method)*fnv*out_plane.calc_bolt_area(diameter)*\
+        shear_planes
+
+
+def tension_capacity(diameter, grade='A325', method='LRFD'):
+    """Calculate the available tensile strength of a bolt.
+
+    Args:
+        diameter (float or array like): nominal bolt diameter
+        grade (str): bolt grade
+        method (str): 'LRFD' or 'ASD'
+
+    Returns:
+        capacity (float or ndarray): phi*Rn or Rn/omega
+    """
+    fnt, fnv = _stresses(grade, False)
+    return _resistance(method)*fnt*out_plane.calc_bolt_area(diameter)
+
+
+def combined_tension_capacity(diameter, shear, grade='A325',
+                              threads_excluded=False, shear_planes=1,
+                              method='LRFD'):
+    """Calculate the available tensile strength of a bolt carrying shear.
+
+    F'nt = 1.3*Fnt - Fnt/(phi*Fnv)*frv <= Fnt, AISC Equation J3-3
+
+    Args:
+        diameter (float or array like): nominal bolt diameter
+        shear (float or array like): required shear strength of the bolt
+        grade (str): bolt grade
+        threads_excluded (bool): threads are excluded from the shear planes
+        shear_planes (int): number of shear planes
+        method (str): 'LRFD' or 'ASD'
+
+    Returns:
+        capacity (float or ndarray): available tensile strength, zero where the
+                                     shear alone exceeds the shear strength
+    """
+    fnt, fnv = _stresses(grade, threads_excluded)
+    resistance = _resistance(method)
+    area = out_plane.calc_bolt_area(diameter)
+
+    frv = np.abs(shear)/(area*shear_planes)
+    fnt_prime = np.clip(1.3*fnt - fnt/(resistance*fnv)*frv, 0.0, fnt)
+    return resistance*fnt_prime*area
+
+
+def calc_ratios(reactions, diameter, grade='A325', threads_excluded=False,
+                shear_planes=1, method='LRFD', interaction='aisc'):
+    """Calculate the demand to capacity ratio of every bolt and load case.
+
+    Args:
+        reactions (array like): (..., num_bolts, 2) or (..., num_bolts, 3)
+                                bolt reactions, see the module docstring
+        diameter (float or array like): bolt diameter, a single value or one
+                                        per bolt
+        grade (str): bolt grade
+        threads_excluded (bool): threads are excluded from the shear planes
+        shear_planes (int): number of shear planes
+        method (str): 'LRFD' or 'ASD'
+        interaction (str): 'aisc' for Equation J3-3 or 'elliptical' for
+                           (frt/Ft)^2 + (frv/Fv)^2 <= 1
+
+    Returns:
+        ratios (Ratios): (..., num_bolts) shear, tension and combined ratios,
+                         a ratio above 1 fails
+
+    Notes:
+        A compressive axial reaction is bearing of the connected parts and
+        does not load the bolt.
+    """
+    reactions = np.asarray(reactions, dtype=float)
+    if reactions.shape[-1] not in (2, 3):
+        raise ValueError('reactions must have 2 or 3 components per bolt')
+    if interaction not in INTERACTIONS:
+        raise ValueError('interaction must be one of %s' % (INTERACTIONS,))
+
+    shear = np.hypot(reactions[..., 0], reactions[..., 1])
+    if reactions.shape[-1] == 3:
+        tension = np.maximum(-1*reactions[..., 2], 0.0)
+    else:
+        tension = np.zeros(shear.shape)
+
+    v_cap = shear_capacity(diameter, grade, threads_excluded, shear_planes,
+                           method)
+    t_cap = tension_capacity(diameter, grade, method)
+    shear_ratio = shear/v_cap
+    tension_ratio = tension/t_cap
+
+    if interaction == 'aisc':
+        combined_cap = combined_tension_capacity(diameter, shear, grade,
+                                                 threads_excluded,
+                                                 shear_planes, method)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            combined = np.where(tension > 0.0, tension/combined_cap, 0.0)
+        combined = np.maximum(combined, shear_ratio)
+    else:
+        combined = np.hypot(shear_ratio, tension_ratio)
+
+    return Ratios(shear_ratio, tension_ratio, combined)
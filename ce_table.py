@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""The ce_table module builds, stores and interpolates tables of the
+instantaneous center coefficient C for rectangular bolt patterns.
+
+The tables follow the layout of the eccentric bolt group tables of the AISC
+Manual. The pattern has rows of bolts at a vertical pitch and columns of bolts
+at a horizontal gauge. The load acts at an angle measured from the vertical
+with its line of action passing a horizontal distance ex from the centroid of
+the pattern. C is the ratio of the applied load to the ultimate strength of a
+single bolt, P = C*Rult, which for the ICResult of a unit load is 1/|cu|.
+
+Tables are generated once with the batched IC solver, saved to a NumPy .npz
+file, and looked up with bilinear interpolation in angle and eccentricity.
+
+Example:
+    tables = build_tables([(3, 1, 3.0, 0.0), (3, 2, 3.0, 6.0)],
+                          angles=[0, 15, 30, 45, 60, 75],
+                          eccentricities=[0, 2, 4, 6, 8, 10, 12])
+    save_tables('ce_tables.npz', tables)
+    tables = load_tables('ce_tables.npz')
+    c = lookup(tables, 3, 2, 3.0, 6.0, angle=20.0, ex=5.0)
+
+Notes:
+    C depends on the bolt load deformation model, so each table records the
+    name of the active model of the models module it was built with and a
+    lookup under another model raises ValueError.
+"""
+import numpy as np
+
+import bolt_group
+import ic_solver
+import models
+
+
+def rectangular_pattern(rows, cols, pitch, gauge, diameter=None):
+    """Build a rectangular bolt pattern centered on the origin.
+
+    Args:
+        rows (int): number of rows of bolts
+        cols (int): number of columns of bolts
+        pitch (float): vertical spacing between rows
+        gauge (float): horizontal spacing between columns
+        diameter (float): diameter of the bolts
+
+    Returns:
+        group (BoltGroup): bolt group numbered column by column
+    """
+    x = (np.arange(cols) - (cols - 1)/2.0)*gauge
+    y = (np.arange(rows) - (rows - 1)/2.0)*pitch
+    xx, yy = np.meshgrid(x, y, indexing='ij')
+
+    return bolt_group.BoltGroup(xx.ravel(), yy.ravel(), diameter)
+
+
+def calc_c(group, angles, eccentricities, **kwargs):
+    """Calculate the coefficient C over a grid of load angles and eccentricities.
+
+    Args:
+        group (BoltGroup): bolt group
+        angles (array like): load angles from the vertical in degrees
+        eccentricities (array like): horizontal distance from the centroid to
+                                     the line of action of the load
+        **kwargs: passed on to ic_solver.solve_ic_batch
+
+    Returns:
+        c (ndarray): (len(angles), len(eccentricities)) coefficients, the
+                     number of bolts where the load passes through the
+                     centroid and nan where the solver did not converge
+    """
+    angles = np.asarray(angles, dtype=float)
+    eccentricities = np.asarray(eccentricities, dtype=float)
+    theta, ex = np.meshgrid(np.radians(angles), eccentricities, indexing='ij')
+
+    x_cent, y_cent = group.centroid
+    points = np.column_stack([ex.ravel() + x_cent,
+                              np.full(ex.size, y_cent),
+                              np.zeros(ex.size)])
+    loads = np.column_stack([np.sin(theta.ravel()),
+                             -1*np.cos(theta.ravel()),
+                             np.zeros(ex.size)])
+
+    result = ic_solver.solve_ic_batch(group, points, loads, **kwargs)
+
+    c = np.abs(1.0/result.cu)
+    c[result.concentric] = len(group)
+    c[~result.converged & ~result.concentric] = np.nan
+
+    return c.reshape(theta.shape)
+
+
+class CeTable(object):
+    """Coefficient C of one rectangular bolt pattern.
+
+    Args:
+        rows (int): number of rows of bolts
+        cols (int): number of columns of bolts
+        pitch (float): vertical spacing between rows
+        gauge (float): horizontal spacing between columns
+        angles (array like): increasing load angles from the vertical in
+                             degrees
+        eccentricities (array like): increasing horizontal eccentricities
+        c (array like): (len(angles), len(eccentricities)) coefficients
+        model (str): name of the model the coefficients were calculated with,
+                     defaults to the active model
+    """
+
+    def __init__(self, rows, cols, pitch, gauge, angles, eccentricities, c,
+                 model=None):
+        self.rows = int(rows)
+        self.cols = int(cols)
+        self.pitch = float(pitch)
+        self.gauge = float(gauge)
+        self.angles = np.asarray(angles, dtype=float)
+        self.eccentricities = np.asarray(eccentricities, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.model = models.active.name if model is None else str(model)
+
+        if self.c.shape != (self.angles.size, self.eccentricities.size):
+            raise ValueError('c must have shape (len(angles), '
+                             'len(eccentricities))')
+
+    @property
+    def key(self):
+        """(rows, cols, pitch, gauge) identifying the pattern."""
+        return pattern_key(self.rows, self.cols, self.pitch, self.gauge)
+
+    def lookup(self, angle, ex):
+        """Interpolate the coefficient C.
+
+        Args:
+            angle (float or array like): load angle from the vertical in degrees
+            ex (float or array like): horizontal eccentricity of the load
+
+        Returns:
+            c (float or ndarray): bilinear interpolation of the table
+
+        Raises:
+            ValueError: a point lies outside the range of the table, or the
+                        active model is not the model of the table
+        """
+        if models.active.name != self.model:
+            raise ValueError('the table was built with the %r model but the '
+                             '%r model is active' % (self.model,
+                                                     models.active.name))
+        angle = np.asarray(angle, dtype=float)
+        ex = np.asarray(ex, dtype=float)
+
+        i, ti = _bracket(self.angles, angle, 'angle')
+        j, tj = _bracket(self.eccentricities, ex, 'eccentricity')
+
+        c = ((1 - ti)*(1 - tj)*self.c[i, j] + ti*(1 - tj)*self.c[i + 1, j] +
+             (1 - ti)*tj*self.c[i, j + 1] + ti*tj*self.c[i + 1, j + 1])
+
+        if c.ndim == 0:
+            return c.item()
+        return c
+
+
+def _bracket(grid, values, name):
+    """Return the lower grid index and interpolation weight of each value."""
+    if np.any(values < grid[0]) or np.any(values > grid[-1]):
+        raise ValueError('%s outside the range of the table' % name)
+    if grid.size == 1:
+        return np.zeros(values.shape, dtype=int), np.zeros(values.shape)
+
+    i = np.clip(np.searchsorted(grid, values, side='right') - 1, 0,
+                grid.size - 2)
+    t = (values - grid[i])/(grid[i + 1] - grid[i])
+
+    return i, t
+
+
+def pattern_key(rows, cols, pitch, gauge):
+    """Return the dictionary key of a rectangular pattern."""
+    return int(rows), int(cols), float(pitch), float(gauge)
+
+
+def build_table(rows, cols, pitch, gauge, angles, eccentricities, **kwargs):
+    """Build the C table of one rectangular bolt pattern.
+
+    Args:
+        rows (int): number of rows of bolts
+        cols (int): number of columns of bolts
+        pitch (float): vertical spacing between rows
+        gauge (float): horizontal spacing between columns
+        angles (array like): increasing load angles from the vertical in
+                             degrees
+        eccentricities (array like): increasing horizontal eccentricities
+        **kwargs: passed on to ic_solver.solve_ic_batch
+
+    Returns:
+        table (CeTable): coefficient table of the pattern, calculated with
+                         the active model
+    """
+    group = rectangular_pattern(rows, cols, pitch, gauge)
+    c = calc_c(group, angles, eccentricities, **kwargs)
+
+    return CeTable(rows, cols, pitch, gauge, angles, eccentricities, c,
+                   models.active.name)
+
+
+def build_tables(patterns, angles, eccentricities, **kwargs):
+    """Build the C tables of several rectangular bolt patterns.
+
+    Args:
+        patterns (list): (rows, cols, pitch, gauge) of each pattern
+        angles (array like): increasing load angles from the vertical in
+                             degrees
+        eccentricities (array like): increasing horizontal eccentricities
+        **kwargs: passed on to ic_solver.solve_ic_batch
+
+    Returns:
+        tables (dict): CeTable of each pattern keyed by pattern_key
+    """
+    tables = {}
+    for rows, cols, pitch, gauge in patterns:
+        table = build_table(rows, cols, pitch, gauge, angles, eccentricities,
+                            **kwargs)
+        tables[table.key] = table
+
+    return tables
+
+
+def save_tables(path, tables):
+    """Save C tables to a NumPy .npz file.
+
+    Args:
+        path (str): file name
+        tables (dict): CeTable of each pattern keyed by pattern_key
+
+    Returns:
+        None
+    """
+    arrays = {}
+    keys = sorted(tables)
+    arrays['patterns'] = np.array(keys, dtype=float).reshape(-1, 4)
+    arrays['models'] = np.array([tables[key].model for key in keys], dtype=str)
+    for i, key in enumerate(keys):
+        table = tables[key]
+        arrays['angles_%d' % i] = table.angles
+        arrays['eccentricities_%d' % i] = table.eccentricities
+        arrays['c_%d' % i] = table.c
+
+    np.savez_compressed(path, **arrays)
+
+
+def load_tables(path):
+    """Load C tables saved with save_tables.
+
+    Args:
+        path (str): file name
+
+    Returns:
+        tables (dict): CeTable of each pattern keyed by pattern_key
+    """
+    tables = {}
+    with np.load(path) as data:
+        patterns = data['patterns']
+        if 'models' in data:
+            names = data['models'].tolist()
+        else:
+            # saved before tables recorded their model, taken as built with
+            # the default Crawford-Kulak model
+            names = ['crawford_kulak']*len(patterns)
+        for i, (rows, cols, pitch, gauge) in enumerate(patterns):
+            table = CeTable(rows, cols, pitch, gauge, data['angles_%d' % i],
+                            data['eccentricities_%d' % i], data['c_%d' % i],
+                            names[i])
+            tables[table.key] = table
+
+    return tables
+
+
+def lookup(tables, rows, cols, pitch, gauge, angle, ex):
+    """Interpolate the coefficient C of a rectangular bolt pattern.
+
+    Args:
+        tables (dict): CeTable of each pattern keyed by pattern_key
+        rows (int): number of rows of bolts
+        cols (int): number of columns of bolts
+        pitch (float): vertical spacing between rows
+        gauge (float): horizontal spacing between columns
+        angle (float or array like): load angle from the vertical in degrees
+        ex (float or array like): horizontal eccentricity of the load
+
+    Returns:
+        c (float or ndarray): interpolated coefficient
+
+    Raises:
+        KeyError: there is no table for the pattern
+        ValueError: a point lies outside the range of the table, or the table
+                    was built with another model than the active one
+    """
+    return tables[pattern_key(rows, cols, pitch, gauge)].lookup(angle, ex)
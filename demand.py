@@ -77,6 +77,12 @@ Notes:
     bolt pattern to keep track of the properties of the bolt pattern but at this
     time it does not seem necessary.
 
+    Importing the module only needs the standard library, and so do the
+    elastic functions. The models and out_plane modules need numpy and are
+    imported by the functions that use them, so the plastic functions that
+    reach calc_moment_about_ic, such as iterate_to_ic, and
+    ecc_out_plane_find_na need numpy when they are called.
+
 TODO:
     There is also consideration to use an object oriented approach for the
     bolts, forces, and bolt pattern. This would require a major refactoring of
@@ -88,6 +94,14 @@ TODO:
 """
 import math
 
+import instrument
+import records
+
+def _is_records(bolts):
+    """Return True for a list of records.Bolt, whose loops run in records."""
+    return bool(bolts) and isinstance(bolts[0], records.Bolt)
+
+
 def shear(bolts, force):
     """Calculate the direct shear force in each direction on each bolt.
 
@@ -109,6 +123,8 @@ def shear(bolts, force):
         Populates the direct shear reactions Rsx and Rsy in the bolt data
         structure
     """
+    if _is_records(bolts):
+        return records.shear(bolts, force)
     num_bolts = len(bolts)
     for bolt in bolts:
         px = force[1][0]
@@ -122,7 +138,27 @@ def shear(bolts, force):
 
 
 def tension(bolts, force):
-    pass
+    """Calculate the direct tension force on each bolt.
+
+    The force in the z-direction is divided by the total number of bolts.
+
+    rz = -pz/num_bolts
+
+    Args:
+        bolts (data struct): list of the bolt data structure
+        force (data struct): single force data structure
+
+    Returns:
+        rz (list): axial reaction on each bolt, the negative of the tension
+
+    Notes:
+        The bolt data structure has no slot for the axial reactions, they are
+        returned instead.
+    """
+    num_bolts = len(bolts)
+    pz = force[1][2]
+
+    return [-pz/num_bolts for bolt in bolts]
 
 
 def ecc_in_plane_elastic(bolts, force):
@@ -149,6 +185,8 @@ def ecc_in_plane_elastic(bolts, force):
         Populates the elastic eccentric force in the plane reations Rex and Rey
         in the bolt data structure
     """
+    if _is_records(bolts):
+        return records.ecc_in_plane_elastic(bolts, force)
     mz = force[2][2]
 
     j = calc_j(bolts)
@@ -213,6 +251,8 @@ def calc_centroid(bolts):
         This coordinate pair is returned as a tuple, as follows:
         (x_centroid, y_centroid)
     """
+    if _is_records(bolts):
+        return records.calc_centroid(bolts)
     sum_x = 0.0
     sum_y = 0.0
     num_bolts = len(bolts)
@@ -241,6 +281,8 @@ def calc_bolt_coords_wrt_centroid(bolts):
         Populates the x and y coordinate location of each bolt data structure
         with respect to the centroid of the bolt group
     """
+    if _is_records(bolts):
+        return records.calc_bolt_coords_wrt_centroid(bolts)
     x_cent, y_cent = calc_centroid(bolts)
 
     for bolt in bolts:
@@ -325,6 +367,8 @@ def calc_ixx(bolts):
         respect to the centroid in the bolt data structure before calling this
         function.
     """
+    if _is_records(bolts):
+        return records.calc_ixx(bolts)
     sum_ixx = 0.0
     for bolt in bolts:
         y = bolt[3][1]
@@ -350,6 +394,8 @@ def calc_iyy(bolts):
         respect to the centroid in the bolt data structure before calling this
         function.
     """
+    if _is_records(bolts):
+        return records.calc_iyy(bolts)
     sum_iyy = 0.0
     for bolt in bolts:
         x = bolt[3][0]
@@ -373,6 +419,8 @@ def calc_j(bolts):
         with respect to the centroid in the bolt data structure before calling
         this function.
     """
+    if _is_records(bolts):
+        return records.calc_j(bolts)
     ixx = calc_ixx(bolts)
     iyy = calc_iyy(bolts)
     j = ixx + iyy
@@ -429,6 +477,7 @@ def iterate_to_ic(bolts, force):
     fx = px
     fy = py
     count = 0
+    history = instrument.start_solve('demand.iterate_to_ic')
 
     while True:
         x_ic, y_ic = calc_instanteous_center(bolts, fx, fy, mo, x0, y0)
@@ -449,10 +498,16 @@ def iterate_to_ic(bolts, force):
         fy = py + sum_ruy
 
         error = max(abs(fx), abs(fy))
+        if history is not None:
+            history.append(error)
 
         if error < 0.01:
+            if history is not None:
+                history.finish(count + 1, True)
             break
         elif count == 50:
+            if history is not None:
+                history.finish(count + 1, False)
             raise 
         else:
             x0 = x_ic
@@ -476,18 +531,22 @@ def calc_bolt_reactions(bolts, rult):
     using the equation below.
 
     ri = rult*(1 - e^(-10*delta))^(0.55)
-    rux = ri*dy/d_max
-    ruy = ri*dx/d_max
+    rux = -ri*dy/d
+    ruy = ri*dx/d
 
     Defintions of variables:
         ri - total shear reaction on bolt
         delta - deformation of bolt
+        d - distance from the IC to the bolt
         rux - x-component of shear reaction on bolt
         ruy - y-component of shear reaction on bolt
 
     Args:
         bolts (data struct): list of the bolt data structure
-        rult (float): ultimate capacity of a single bolt
+        rult (float): ultimate capacity of a single bolt, for example
+                      capacity.shear_capacity of the bolt diameter. The sign
+                      of rult sets the direction of rotation, as -mp/sum_m
+                      in calc_bolt_fraction_reactions.
 
     Returns:
         None
@@ -498,22 +557,31 @@ def calc_bolt_reactions(bolts, rult):
 
         Populates the Rux and Ruy in the bolt data structure.
     """
-    d_max = calc_d_max(bolts)
+    if _is_records(bolts):
+        return records.calc_bolt_reactions(bolts, rult)
     for bolt in bolts:
-        delta = bolt[9]
-        dx = bolt[6]
-        dy = bolt[6]
-        ri = rult*math.pow((1 - math.exp(-10*delta)),0.55)
-        rux = ri*dy/d_max
-        ruy = ri*dx/d_max
+        d = bolt[7]
+        delta = bolt[8]
+        dx = bolt[6][0]
+        dy = bolt[6][1]
+        if d == 0.0:
+            # a bolt at the IC does not deform and carries no shear
+            rux = 0.0
+            ruy = 0.0
+        else:
+            ri = rult*math.pow((1 - math.exp(-10*delta)),0.55)
+            rux = -1*ri*dy/d
+            ruy = ri*dx/d
 
-        bolt[11][0] = rux
-        bolt[11][1] = ruy
+        bolt[10][0] = rux
+        bolt[10][1] = ruy
 
 
 def calc_bolt_fraction_reactions(bolts, mp):
     """Calculate the resisting bolt force fraction."""
     sum_m = calc_moment_about_ic(bolts)
+    if _is_records(bolts):
+        return records.calc_bolt_fraction_reactions(bolts, mp, sum_m)
 
     sum_rux = 0.0
     sum_ruy = 0.0
@@ -550,14 +618,23 @@ def calc_moment_about_ic(bolts):
     Notes:
         The function also populates the bolt data structure with the calculated
         bolt deflection, delta, and the bolt force fraction, ri_rult_ratio.
+
+        The force fraction follows the active model of the models module,
+        the Crawford-Kulak curve unless another model is selected.
     """
+    import models
+    model = models.active
+    if _is_records(bolts):
+        return records.calc_moment_about_ic(bolts, model)
+
     sum_m = 0.0
     d_max = calc_d_max(bolts)
-    for bolt in bolts:
+    deltas = [model.delta_max*bolt[7]/d_max for bolt in bolts]
+    # one call of the model for the whole bolt group
+    fractions = model.fraction(deltas).tolist() #ri/rult
+    for bolt, delta, ri_rult_ratio in zip(bolts, deltas, fractions):
         d = bolt[7]
 
-        delta = 0.34*d/d_max
-        ri_rult_ratio = math.pow((1 - math.exp(-10*delta)),0.55) #ri/rult
         m = ri_rult_ratio*d
 
         sum_m = sum_m + m
@@ -581,6 +658,8 @@ def calc_bolt_location_wrt_ic(bolts, x_ic, y_ic):
     Notes:
         Populates the dx, dy, and d in the bolt data structure
     """
+    if _is_records(bolts):
+        return records.calc_bolt_location_wrt_ic(bolts, x_ic, y_ic)
     for bolt in bolts:
         dx = bolt[3][0] - x_ic
         dy = bolt[3][1] - y_ic
@@ -720,6 +799,8 @@ def calc_d_max(bolts):
     Notes:
         Must execute 
     """
+    if _is_records(bolts):
+        return records.calc_d_max(bolts)
     d_max = 0.0
     for bolt in bolts:
         d = bolt[7]
@@ -730,6 +811,8 @@ def calc_d_max(bolts):
 
 def calc_sum_d_squared(bolts):
     """Return the sum of the squared bolt distances."""
+    if _is_records(bolts):
+        return records.calc_sum_d_squared(bolts)
     sum_d_squared = 0.0
     for bolt in bolts:
         d = bolt[7]
@@ -737,6 +820,155 @@ def calc_sum_d_squared(bolts):
 
     return sum_d_squared
 
-def calc_neutral_axis(bolts):
-    pass
+def ecc_out_plane_assume_na(bolts, force):
+    """Calc the bolt tension in an out of plane eccentric connection with the
+    neutral axis at the centroid of the bolt group.
+
+    The bolt pattern is treated as a linear elastic section. The moments about
+    the x and y axes are proportioned based on the distance from the centroid
+    of the group to the center of the bolt. Bolts on the compression side get
+    a negative tension which stands for bearing of the connected parts. See the
+    AISC Manual Part 7 for further details.
+
+    rz = -1*(pz/num_bolts + mx*local_yb/ixx - my*local_xb/iyy)
+
+    Args:
+        bolts (data struct): list of the bolt data structure
+        force (data struct): single force data structure
+
+    Returns:
+        rz (list): axial reaction on each bolt, the negative of the tension
+
+    Raises:
+        ValueError: a moment about an axis the bolt pattern has no depth in,
+                    ixx or iyy of 0, see out_plane.divide_moment
+
+    Notes:
+        Must call calc_moments_about_centroid to populate the moments in the
+        force data structure before calling this function.
+    """
+    num_bolts = len(bolts)
+    pz = force[1][2]
+    mx = force[2][0]
+    my = force[2][1]
+
+    ixx = calc_ixx(bolts)
+    iyy = calc_iyy(bolts)
+    for moment, prop, name in ((mx, ixx, 'ixx'), (my, iyy, 'iyy')):
+        if prop <= 0.0 and moment != 0.0:
+            raise ValueError('the bolt group has %s = 0 and can not resist a '
+                             'moment about that axis' % (name,))
+
+    rz = []
+    for bolt in bolts:
+        local_xb = bolt[3][0]
+        local_yb = bolt[3][1]
+
+        ten = pz/num_bolts
+        if ixx > 0.0:
+            ten = ten + mx*local_yb/ixx
+        if iyy > 0.0:
+            ten = ten - my*local_xb/iyy
+
+        rz.append(-1*ten)
+
+    return rz
+
+
+def ecc_out_plane_init_ten(bolts, force, pretension):
+    """Calc the bolt tension in an out of plane eccentric connection with
+    pretensioned bolts.
+
+    The pretension keeps the connected parts in contact so the neutral axis is
+    at the centroid of the bolt group. The tension in a bolt stays at the
+    pretension until the applied tension from ecc_out_plane_assume_na exceeds
+    it.
+
+    rz = -1*max(tb, pz/num_bolts + mx*local_yb/ixx - my*local_xb/iyy)
+
+    Args:
+        bolts (data struct): list of the bolt data structure
+        force (data struct): single force data structure
+        pretension (float): pretension tb of each bolt
+
+    Returns:
+        rz (list): axial reaction on each bolt including the pretension
+
+    Notes:
+        Must call calc_moments_about_centroid to populate the moments in the
+        force data structure before calling this function.
+    """
+    return [-1*max(pretension, -1*r)
+            for r in ecc_out_plane_assume_na(bolts, force)]
+
+
+def ecc_out_plane_find_na(bolts, force, width, y_top, y_bottom):
+    """Calc the bolt tension in an out of plane eccentric connection with the
+    neutral axis found from equilibrium.
+
+    The connected parts bear on each other over a rectangle of the given width
+    between y_bottom and y_top. The neutral axis is located so that the
+    tension in the bolts and the triangular compression block balance pz and
+    mx. Only bolts on the tension side of the neutral axis take load. See
+    out_plane.solve_neutral_axis_batch for the solution method.
+
+    Args:
+        bolts (data struct): list of the bolt data structure
+        force (data struct): single force data structure
+        width (float): width of the compression block
+        y_top (float): user y-coordinate of the top edge of the bearing area
+        y_bottom (float): user y-coordinate of the bottom edge of the bearing
+                          area
+
+    Returns:
+        y_na (float): user y-coordinate of the neutral axis, nan if no bolt is
+                      in tension or the tension is uniform
+        rz (list): axial reaction on each bolt, the negative of the tension
+
+    Notes:
+        Must call calc_moments_about_centroid to populate the moments in the
+        force data structure before calling this function. My is not
+        considered.
+    """
+    import out_plane
+
+    user_y = [bolt[1][1] for bolt in bolts]
+    if y_bottom > min(user_y) or y_top < max(user_y):
+        raise ValueError('the bolts must be between y_bottom and y_top')
+
+    y_cent = calc_centroid(bolts)[1]
+    pz = force[1][2]
+    mx = force[2][0]
+
+    sign = -1.0 if mx < 0.0 else 1.0
+    if sign > 0.0:
+        s_edge = y_bottom - y_cent
+    else:
+        s_edge = y_cent - y_top
+    s = [[sign*bolt[3][1] for bolt in bolts]]
+    area = [out_plane.calc_bolt_area(bolt[2]) for bolt in bolts]
+
+    a, ten = out_plane.solve_neutral_axis_batch(s, area, width, [s_edge],
+                                                [pz], [abs(mx)])
+
+    return y_cent + sign*a[0].item(), [-1*t for t in ten[0].tolist()]
+
+
+def calc_neutral_axis(bolts, force, width, y_top, y_bottom):
+    """Calculate the location of the neutral axis of an out of plane eccentric
+    connection.
+
+    Args:
+        bolts (data struct): list of the bolt data structure
+        force (data struct): single force data structure
+        width (float): width of the compression block
+        y_top (float): user y-coordinate of the top edge of the bearing area
+        y_bottom (float): user y-coordinate of the bottom edge of the bearing
+                          area
+
+    Returns:
+        y_na (float): user y-coordinate of the neutral axis, see
+                      ecc_out_plane_find_na
+    """
+    return ecc_out_plane_find_na(bolts, force, width, y_top, y_bottom)[0]
 
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""The design module searches rectangular bolt patterns for the smallest one
+that carries a set of load cases.
+
+Each candidate pattern is a combination of rows, columns, pitch, gauge and bolt
+diameter from the ranges given to search. The demand on a candidate is checked
+in order of increasing cost:
+
+    prune: the load is larger than every bolt of the pattern at full
+           strength, n*strength < |P|, so no method can pass the candidate
+    elastic: the largest elastic bolt force, direct plus eccentric shear, is
+             not more than the bolt strength. The elastic method is
+             conservative with respect to the IC method so the candidate
+             passes without an IC solve.
+    plastic: the bolt strength needed by the IC method, |cu| of the IC
+             solution, is compared with the bolt strength
+
+Only the candidates that are neither pruned nor passed by the elastic method
+are solved with the IC method. The candidates are evaluated in a pool of
+processes.
+
+Definitions:
+    points, loads: (N, 3) load cases as in the analysis module, with the user
+                   coordinates measured from the centroid of the pattern
+    strength: available shear strength of one bolt, a number for every
+              diameter or a mapping of diameter to strength
+"""
+import collections
+import collections.abc
+import concurrent.futures
+import itertools
+
+import numpy as np
+
+import analysis
+import ce_table
+import ic_solver
+import models
+
+
+class Candidate(collections.namedtuple('Candidate', ['rows', 'cols', 'pitch',
+                                                     'gauge', 'diameter'])):
+    """Rectangular bolt pattern, see ce_table.rectangular_pattern."""
+    __slots__ = ()
+
+    @property
+    def num_bolts(self):
+        return self.rows*self.cols
+
+    @property
+    def size(self):
+        """Height plus width of the pattern."""
+        return (self.rows - 1)*self.pitch + (self.cols - 1)*self.gauge
+
+
+class DesignResult(collections.namedtuple('DesignResult',
+                                          ['candidate', 'method', 'passes',
+                                           'demand', 'strength'])):
+    """Check of one candidate.
+
+    candidate (Candidate): bolt pattern
+    method (str): 'prune', 'elastic' or 'plastic', the last check made
+    passes (bool): the pattern carries every load case
+    demand (float): required bolt strength found by the method, a lower bound
+                    for 'prune' and an upper bound for 'elastic'
+    strength (float): available strength of one bolt
+    """
+    __slots__ = ()
+
+    @property
+    def ratio(self):
+        """Demand to strength ratio."""
+        return self.demand/self.strength
+
+
+def candidates(rows, cols, pitches, gauges, diameters):
+    """Generate the distinct candidates of the search ranges.
+
+    The pitch of a single row and the gauge of a single column do not change
+    the pattern, so those candidates are generated once with a spacing of 0.
+
+    Returns:
+        candidates (list): Candidate of each distinct pattern
+    """
+    seen = set()
+    result = []
+    for r, c, p, g, d in itertools.product(rows, cols, pitches, gauges,
+                                           diameters):
+        candidate = Candidate(r, c, p if r > 1 else 0.0, g if c > 1 else 0.0,
+                              d)
+        if candidate not in seen:
+            seen.add(candidate)
+            result.append(candidate)
+    return result
+
+
+def _strength(strength, diameter):
+    if isinstance(strength, collections.abc.Mapping):
+        return float(strength[diameter])
+    return float(strength)
+
+
+def check_candidate(candidate, points, loads, strength):
+    """Check one candidate pattern against every load case.
+
+    Args:
+        candidate (Candidate): bolt pattern
+        points (array like): (N, 3) load application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+        strength (float or mapping): bolt strength, see the module docstring
+
+    Returns:
+        result (DesignResult): outcome of the cheapest conclusive check
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    rn = _strength(strength, candidate.diameter)
+    n = candidate.num_bolts
+
+    p = np.hypot(loads[:, 0], loads[:, 1])
+    lower = p.max()/n
+    if lower > rn:
+        return DesignResult(candidate, 'prune', False, lower, rn)
+
+    group = ce_table.rectangular_pattern(*candidate)
+    elastic = analysis.calc_elastic_reactions(group, points, loads)
+    upper = np.hypot(elastic[:, :, 0], elastic[:, :, 1]).max()
+    if upper <= rn:
+        return DesignResult(candidate, 'elastic', True, upper, rn)
+
+    result = ic_solver.solve_ic_batch(group, points, loads)
+    # a load case that does not converge fails the candidate
+    required = np.where(result.converged, np.abs(result.cu), np.inf)
+    demand = np.where(result.concentric, p/n, required).max()
+    return DesignResult(candidate, 'plastic', bool(demand <= rn), demand, rn)
+
+
+def _check_task(task):
+    """Check one candidate in a worker."""
+    return check_candidate(*task)
+
+
+def search(points, loads, strength, rows=range(1, 11), cols=(1, 2),
+           pitches=(3.0,), gauges=(3.0,), diameters=(0.75,), max_workers=None,
+           tasks_per_submit=4):
+    """Check every candidate pattern of the search ranges.
+
+    Args:
+        points (array like): (N, 3) load application points with respect to
+                             the centroid of the pattern
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+        strength (float or mapping): bolt strength, see the module docstring
+        rows, cols (sequence): numbers of rows and columns
+        pitches, gauges (sequence): spacings between rows and columns
+        diameters (sequence): bolt diameters
+        max_workers (int): number of worker processes, 0 or 1 runs in the
+                           calling process, None uses one per CPU
+        tasks_per_submit (int): number of candidates sent to a worker at a time
+
+    Returns:
+        results (list): DesignResult of every candidate, the passing ones
+                        first, each group ordered by number of bolts, bolt
+                        diameter and size of the pattern
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    tasks = [(candidate, points, loads, strength)
+             for candidate in candidates(rows, cols, pitches, gauges,
+                                         diameters)]
+
+    if max_workers is not None and max_workers <= 1:
+        results = [_check_task(task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers, initializer=models.init_worker,
+                initargs=(models.active,)) as executor:
+            results = list(executor.map(_check_task, tasks,
+                                        chunksize=tasks_per_submit))
+
+    results.sort(key=lambda r: (not r.passes, r.candidate.num_bolts,
+                                r.candidate.diameter, r.candidate.size,
+                                r.ratio))
+    return results
+
+
+def design(points, loads, strength, **kwargs):
+    """Return the smallest passing pattern, see search.
+
+    Returns:
+        result (DesignResult): passing candidate with the fewest bolts, None
+                               if no candidate passes
+    """
+    results = search(points, loads, strength, **kwargs)
+    if results and results[0].passes:
+        return results[0]
+    return None
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""The functional module is a non-mutating version of the demand calculations.
+
+The functions of the demand and bolt_group modules write their results into
+the bolt and force data structures passed to them, so one bolt group can not
+be used by two threads at once or reused for another load case without
+copying it. The functions in this module read their inputs and return their
+results as new arrays and tuples instead; nothing passed to them is modified.
+
+Inputs:
+    group (BoltGroup): bolt group, only the read-only user coordinates and the
+                       memoized section properties are used; the result
+                       columns are neither read nor written
+    force (sequence): ((user_x, user_y, user_z), (Px, Py, Pz)), only the first
+                      two slots are used so a force data structure of the
+                      demand module or a records.Force may be passed
+
+Notes:
+    Every result depends only on the arguments, so the functions can run
+    concurrently on a shared bolt group, for example in a thread pool, and
+    their results can be memoized by the caller.
+"""
+import collections
+import math
+
+import numpy as np
+
+import demand
+import ic_solver
+
+
+class ForceLocation(collections.namedtuple('ForceLocation',
+                                           ['cx', 'cy', 'cz', 'ec'])):
+    """Location of a force with respect to the centroid of the bolt group.
+
+    cx, cy, cz (float): coordinates of the force application point
+    ec (float): eccentricity of the line of action of the force
+    """
+    __slots__ = ()
+
+
+class Moments(collections.namedtuple('Moments', ['mx', 'my', 'mz'])):
+    """Moments of a force about the centroid of the bolt group."""
+    __slots__ = ()
+
+
+class Reactions(collections.namedtuple('Reactions', ['rx', 'ry'])):
+    """Reaction components on each bolt, one array entry per bolt."""
+    __slots__ = ()
+
+
+class ICLocation(collections.namedtuple('ICLocation', ['dx', 'dy', 'd'])):
+    """Bolt coordinates with respect to the IC and distance to the IC."""
+    __slots__ = ()
+
+
+class ICReactions(collections.namedtuple('ICReactions',
+                                         ['x_ic', 'y_ic', 'ce', 'cu', 'dx',
+                                          'dy', 'd', 'r', 'rux', 'ruy'])):
+    """Plastic solution of an eccentric shear connection.
+
+    x_ic, y_ic (float): coordinates of the IC with respect to the centroid
+    ce, cu (float): coefficients, see demand.iterate_to_ic
+    dx, dy, d (ndarray): bolt location with respect to the IC
+    r (ndarray): Ri/Rult ratio of each bolt
+    rux, ruy (ndarray): plastic shear reactions on each bolt
+    """
+    __slots__ = ()
+
+
+def calc_force_coords_wrt_centroid(group, force):
+    """Calculate force coords with respect to the centroid of the bolt group.
+
+    Args:
+        group (BoltGroup): bolt group
+        force (sequence): force application point and components
+
+    Returns:
+        location (ForceLocation): cx, cy, cz and eccentricity ec of the force
+    """
+    x_cent, y_cent = group.centroid
+
+    cx = force[0][0] - x_cent
+    cy = force[0][1] - y_cent
+    cz = force[0][2]
+
+    delta_angle = demand.calc_delta_angle(force[1][0], force[1][1])
+    ec = abs(cx*math.cos(delta_angle) + cy*math.sin(delta_angle))
+
+    return ForceLocation(cx, cy, cz, ec)
+
+
+def calc_moments_about_centroid(group, force):
+    """Calculate the x, y, and z moments about the centroid of the bolt group.
+
+    mx = pz(y) - py(z)
+    my = px(z) - pz(x)
+    mz = py(x) - px(y)
+
+    Args:
+        group (BoltGroup): bolt group
+        force (sequence): force application point and components
+
+    Returns:
+        moments (Moments): mx, my and mz
+    """
+    cx, cy, cz, _ = calc_force_coords_wrt_centroid(group, force)
+    px, py, pz = force[1][0], force[1][1], force[1][2]
+
+    return Moments(pz*cy - py*cz, px*cz - pz*cx, py*cx - px*cy)
+
+
+def shear(group, force):
+    """Calculate the direct shear force in each direction on each bolt.
+
+    rx = -px/num_bolts
+    ry = -py/num_bolts
+
+    Args:
+        group (BoltGroup): bolt group
+        force (sequence): force application point and components
+
+    Returns:
+        reactions (Reactions): direct shear reactions Rsx and Rsy
+    """
+    num_bolts = len(group)
+
+    return Reactions(np.full(num_bolts, -force[1][0]/num_bolts),
+                     np.full(num_bolts, -force[1][1]/num_bolts))
+
+
+def ecc_in_plane_elastic(group, force):
+    """Calc the bolt reactions in an elastic in plane eccentric shear connection.
+
+    rx = mz*local_yb/j
+    ry = -1*mz*local_xb/j
+
+    Args:
+        group (BoltGroup): bolt group
+        force (sequence): force application point and components
+
+    Returns:
+        reactions (Reactions): elastic eccentric reactions Rex and Rey
+    """
+    mz = calc_moments_about_centroid(group, force).mz
+    xc, yc = group.local_coords
+    j = group.j
+
+    return Reactions(mz*yc/j, -1*mz*xc/j)
+
+
+def calc_bolt_location_wrt_ic(group, x_ic, y_ic):
+    """Calculate the location of each bolt with respect to the IC.
+
+    Args:
+        group (BoltGroup): bolt group
+        x_ic (float): x-coordinate of the IC with respect to the centroid
+        y_ic (float): y-coordinate of the IC with respect to the centroid
+
+    Returns:
+        location (ICLocation): dx, dy and d of each bolt
+    """
+    xc, yc = group.local_coords
+    dx = xc - x_ic
+    dy = yc - y_ic
+
+    return ICLocation(dx, dy, np.hypot(dx, dy))
+
+
+def iterate_to_ic(group, force, tol=1e-10, max_iter=50):
+    """Solve for the instantaneous center and the plastic bolt reactions.
+
+    The IC is found with ic_solver.solve_ic_batch, which does not modify the
+    bolt group, and the bolt reactions are scaled so their moment about the IC
+    balances the force, as in demand.calc_bolt_fraction_reactions.
+
+    Args:
+        group (BoltGroup): bolt group
+        force (sequence): force application point and components
+        tol (float): convergence tolerance, see ic_solver.solve_ic
+        max_iter (int): maximum number of Newton iterations
+
+    Returns:
+        result (ICReactions): IC, coefficients and bolt reactions
+
+    Raises:
+        ValueError: the force has no eccentricity about the centroid
+        ic_solver.ConvergenceError: the iteration did not converge
+    """
+    point = [force[0][0], force[0][1], force[0][2]]
+    load = [force[1][0], force[1][1], force[1][2]]
+    solution = ic_solver.solve_ic_batch(group, [point], [load], tol=tol,
+                                        max_iter=max_iter)
+
+    if solution.concentric[0]:
+        raise ValueError('the force has no eccentricity about the centroid')
+
+    result = ic_solver.ICResult(*[column[0].item()
+                                  for column in solution[:6]])
+    if not solution.converged[0]:
+        raise ic_solver.ConvergenceError('IC solver did not converge in %d '
+                                         'iterations' % max_iter, result)
+
+    x_ic, y_ic = result.x_ic, result.y_ic
+    dx, dy, d = calc_bolt_location_wrt_ic(group, x_ic, y_ic)
+    r = ic_solver.calc_force_fraction(d, d.max())
+
+    cx, cy, _, _ = calc_force_coords_wrt_centroid(group, force)
+    mp = load[1]*(cx - x_ic) - load[0]*(cy - y_ic)
+    rult = -1*mp/np.dot(r, d)
+    r_d = np.divide(r, d, out=np.zeros_like(d), where=d > 0.0)
+
+    return ICReactions(x_ic, y_ic, result.ce, result.cu, dx, dy, d, r,
+                       -1*rult*dy*r_d, rult*dx*r_d)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""The ic_cache module memoizes IC solutions across scaled copies of a force.
+
+The location of the IC depends only on the bolt pattern and the line of action
+of the force, not on the magnitude of the force. Factored load combinations
+that scale one force by different load factors therefore share one IC. The
+ICCache stores the solution of each bolt pattern and line of action and
+returns it for every later force with the same line of action.
+
+Definitions:
+    key: (model, geometry key, ux, uy, e) where model is the name of the
+         active load deformation model, the geometry key is
+         BoltGroup.geometry_key, (ux, uy) is the unit vector of the force and
+         e = uy*cx - ux*cy is the signed eccentricity of the line of action
+         about the centroid, all rounded to a number of decimals
+    unit solution: x_ic, y_ic, ce*|P| and cu/|P|, the solution for |P| = 1
+
+Notes:
+    ce = sum_d^2/(d_max*mp) and cu = mp/sum_m with mp proportional to |P|, so
+    the cached unit coefficients are rescaled with the magnitude of each force.
+    The cache holds at most maxsize solutions and evicts the least recently
+    used one first.
+"""
+import collections
+import math
+
+import numpy as np
+
+import ic_solver
+import models
+
+
+class ICCache(object):
+    """Size bounded LRU cache of IC solutions.
+
+    Args:
+        maxsize (int): maximum number of cached solutions
+        decimals (int): number of decimals of the key components
+
+    Attributes:
+        hits (int): number of forces answered without running the IC solver
+        misses (int): number of forces the IC solver was run for
+    """
+
+    def __init__(self, maxsize=4096, decimals=9):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._solutions = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def clear(self):
+        """Remove every cached solution and reset the counters."""
+        self._solutions.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, group, point, load):
+        """Return the cache key of a force acting on a bolt group.
+
+        Args:
+            group (BoltGroup): bolt group
+            point (sequence): user coordinates of the application point
+            load (sequence): force components (Px, Py, Pz)
+
+        Returns:
+            key (tuple): see the module docstring
+            p (float): magnitude of the in plane force
+        """
+        x_cent, y_cent = group.centroid
+        p = math.hypot(load[0], load[1])
+        if p == 0.0:
+            return None, p
+        ux = load[0]/p
+        uy = load[1]/p
+        e = uy*(point[0] - x_cent) - ux*(point[1] - y_cent)
+
+        key = tuple(round(v, self.decimals) + 0.0 for v in (ux, uy, e))
+        return (models.active.name, group.geometry_key(self.decimals)) + key, p
+
+    def _get(self, key):
+        unit = self._solutions.get(key)
+        if unit is not None:
+            self._solutions.move_to_end(key)
+        return unit
+
+    def _put(self, key, unit):
+        self._solutions[key] = unit
+        self._solutions.move_to_end(key)
+        while len(self._solutions) > self.maxsize:
+            self._solutions.popitem(last=False)
+
+    def solve_ic(self, group, force, **kwargs):
+        """Solve for the IC of a single force, using the cache if possible.
+
+        Args:
+            group (BoltGroup): bolt group
+            force (data struct): single force data structure, only the user
+                                 coordinates and the force components are used
+            **kwargs: passed on to ic_solver.solve_ic on a miss
+
+        Returns:
+            result (ICResult): solution for the force, iterations is 0 when the
+                               solution came from the cache
+
+        Raises:
+            ValueError: the force has no eccentricity about the centroid
+            ic_solver.ConvergenceError: the IC solver did not converge
+
+        Notes:
+            The bolt group columns are populated on a miss only, as
+            ic_solver.solve_ic does.
+        """
+        key, p = self.key(group, force[0], force[1])
+        unit = self._get(key) if key is not None else None
+        if unit is not None:
+            self.hits += 1
+            x_ic, y_ic, ce, cu, residual = unit
+            return ic_solver.ICResult(x_ic, y_ic, ce/p, cu*p, 0, residual)
+
+        self.misses += 1
+        result = ic_solver.solve_ic(group, force, **kwargs)
+        self._put(key, (result.x_ic, result.y_ic, result.ce*p, result.cu/p,
+                        result.residual))
+        return result
+
+    def solve_ic_batch(self, group, points, loads, **kwargs):
+        """Solve for the IC of many forces, running the solver on misses only.
+
+        The forces that are not in the cache are reduced to their distinct
+        keys and solved together with ic_solver.solve_ic_batch.
+
+        Args:
+            group (BoltGroup): bolt group
+            points (array like): (N, 3) user coordinates of the application
+                                 points
+            loads (array like): (N, 3) force components (Px, Py, Pz)
+            **kwargs: passed on to ic_solver.solve_ic_batch
+
+        Returns:
+            result (ICBatchResult): solution of every force, iterations is 0
+                                    for the forces answered from the cache
+
+        Notes:
+            Concentric forces and forces that do not converge are not cached.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+        if points.shape[0] != loads.shape[0]:
+            raise ValueError('points and loads must have the same number of '
+                             'rows')
+
+        num_cases = points.shape[0]
+        p = np.hypot(loads[:, 0], loads[:, 1])
+        keys = [self.key(group, point, load)[0]
+                for point, load in zip(points.tolist(), loads.tolist())]
+
+        unit = np.full((num_cases, 5), np.nan)
+        hit = np.zeros(num_cases, dtype=bool)
+        first = collections.OrderedDict()
+        for i, key in enumerate(keys):
+            cached = self._get(key) if key is not None else None
+            if cached is not None:
+                unit[i] = cached
+                hit[i] = True
+            elif key is not None:
+                first.setdefault(key, i)
+            # forces with no in plane component are left to the solver
+            else:
+                first[(None, i)] = i
+
+        # repeats of a key within the batch are answered by its first solve
+        self.misses += len(first)
+        self.hits += num_cases - len(first)
+
+        result = ic_solver.ICBatchResult(
+            *[np.full(num_cases, np.nan) for _ in range(6)] +
+            [np.zeros(num_cases, dtype=bool), np.zeros(num_cases, dtype=bool)])
+        result = result._replace(iterations=np.zeros(num_cases, dtype=int))
+
+        if first:
+            index = np.array(list(first.values()))
+            solved = ic_solver.solve_ic_batch(group, points[index],
+                                              loads[index], **kwargs)
+            position = {}
+            for j, (key, i) in enumerate(first.items()):
+                position[key] = j
+                if key[0] is None:
+                    continue
+                if solved.converged[j]:
+                    self._put(key, (solved.x_ic[j], solved.y_ic[j],
+                                    solved.ce[j]*p[i], solved.cu[j]/p[i],
+                                    solved.residual[j]))
+
+            for i, key in enumerate(keys):
+                if hit[i]:
+                    continue
+                j = position[key if key is not None else (None, i)]
+                scale = p[i]/p[index[j]] if p[index[j]] > 0.0 else np.nan
+                result.x_ic[i] = solved.x_ic[j]
+                result.y_ic[i] = solved.y_ic[j]
+                result.ce[i] = solved.ce[j]/scale
+                result.cu[i] = solved.cu[j]*scale
+                result.residual[i] = solved.residual[j]
+                result.converged[i] = solved.converged[j]
+                result.concentric[i] = solved.concentric[j]
+                if index[j] == i:
+                    result.iterations[i] = solved.iterations[j]
+
+        result.x_ic[hit] = unit[hit, 0]
+        result.y_ic[hit] = unit[hit, 1]
+        result.ce[hit] = unit[hit, 2]/p[hit]
+        result.cu[hit] = unit[hit, 3]*p[hit]
+        result.residual[hit] = unit[hit, 4]
+        result.converged[hit] = True
+
+        return result
@@ -0,0 +1,791 @@
+# -*- coding: utf-8 -*-
+"""The ic_solver module locates the instantaneous center (IC) of a bolt group
+with a damped Newton-Raphson iteration.
+
+demand.iterate_to_ic and bolt_group.iterate_to_ic move the IC with a fixed
+point update and stop when the force residual is below 0.01. That update
+converges linearly and slowly for loads close to the centroid. This module
+solves the same equilibrium equations, force and moment equilibrium of the
+bolt reactions about the IC, with a finite difference Jacobian and a
+backtracking line search. It converges quadratically near the solution and
+reports the number of iterations it took.
+
+Far from the solution the Newton step can head for the root of the residual
+at infinity. Steps are capped to the size of the bolt group seen from the
+trial IC and must reduce the residual. When the line search can not find such
+a step the IC is restarted from the fixed point iteration of iterate_to_ic,
+which is slow but robust, and Newton finishes from there.
+
+The solver starts at the elastic IC, the same first approximation
+iterate_to_ic uses, unless a starting point is given.
+"""
+import collections
+import math
+
+import numpy as np
+
+import bolt_group
+import instrument
+import models
+
+
+class ICResult(collections.namedtuple('ICResult', ['x_ic', 'y_ic', 'ce', 'cu',
+                                                   'iterations', 'residual'])):
+    """Result of an IC solve.
+
+    x_ic (float): x-coordinate of the IC with respect to the centroid
+    y_ic (float): y-coordinate of the IC with respect to the centroid
+    ce (float): elastic coefficient at the elastic IC, see iterate_to_ic
+    cu (float): ultimate coefficient at the IC, see iterate_to_ic
+    iterations (int): number of Newton iterations, including the steps of a
+                      fixed point fallback
+    residual (float): max(|g1|, |g2|) at the IC, see calc_equilibrium_residual
+    """
+    __slots__ = ()
+
+
+#: eccentricity, as a fraction of the radius of gyration of the bolt group,
+#: below which a force is treated as concentric
+CONCENTRIC_TOL = 1e-4
+
+#: smallest fraction of the Newton step tried by the line search
+MIN_STEP = 1.0/64
+
+#: fraction of the decrease predicted by the Newton step that the line search
+#: requires, a smaller decrease is taken as the iteration stalling
+DECREASE = 0.1
+
+#: largest Newton step as a multiple of the distance from the trial IC to the
+#: farthest bolt
+MAX_STEP = 1.0
+
+#: force unbalance, as a fraction of the applied force, at which the fixed
+#: point fallback hands the IC back to the Newton iteration
+FIXED_POINT_TOL = 0.01
+
+
+class ConvergenceError(RuntimeError):
+    """The IC solver did not converge.
+
+    Args:
+        message (str): description of the failure
+        result (ICResult): last approximation of the IC
+    """
+
+    def __init__(self, message, result=None):
+        RuntimeError.__init__(self, message)
+        self.result = result
+
+
+def calc_force_fraction(d, d_max):
+    """Calculate the bolt force fraction Ri/Rult from the distance to the IC.
+
+    delta = 0.34*d/d_max
+    ri/rult = (1 - e^(-10*delta))^0.55
+
+    Args:
+        d (ndarray): distance from the IC to each bolt
+        d_max (float or ndarray): maximum distance from the IC to a bolt,
+                                  broadcastable against d
+
+    Returns:
+        r (ndarray): Ri/Rult ratio of each bolt
+
+    Notes:
+        Evaluated with the active model of the models module, the
+        Crawford-Kulak curve shown above unless another model is selected.
+    """
+    return models.active.force_fraction(d, d_max)
+
+
+def calc_equilibrium_residual(xc, yc, px, py, cx, cy, x_ic, y_ic, size):
+    """Calculate the equilibrium residual of the bolt group about a trial IC.
+
+    The bolt force fractions follow the load deformation relationship used in
+    demand.calc_moment_about_ic and act perpendicular to the line from the
+    trial IC to each bolt. The bolt strength rult is chosen so the bolt
+    reactions balance the applied force in the direction of the applied force.
+    The residuals are the unbalanced force perpendicular to the applied force
+    and the unbalanced moment about the trial IC.
+
+    g1 = (P x S)/(|S|*|P|)
+    g2 = (mp + rult*sum_m)/(|P|*size)
+
+    where S is the sum of the bolt force fractions. Eliminating rult this way,
+    instead of with the moment about the IC as iterate_to_ic does, keeps the
+    residual away from zero as the IC moves off to infinity.
+
+    Args:
+        xc (ndarray): bolt x-coordinates with respect to the centroid
+        yc (ndarray): bolt y-coordinates with respect to the centroid
+        px (float): x-component of the applied force
+        py (float): y-component of the applied force
+        cx (float): x-coordinate of the force with respect to the centroid
+        cy (float): y-coordinate of the force with respect to the centroid
+        x_ic (float): x-coordinate of the trial IC
+        y_ic (float): y-coordinate of the trial IC
+        size (float): length used to make the moment residual dimensionless
+
+    Returns:
+        g1 (float): dimensionless force residual perpendicular to the force
+        g2 (float): dimensionless moment residual about the trial IC
+    """
+    dx = xc - x_ic
+    dy = yc - y_ic
+    d = np.hypot(dx, dy)
+    d_max = d.max()
+
+    r = calc_force_fraction(d, d_max)
+    sum_m = np.dot(r, d)
+
+    # r/d is finite where the trial IC falls on a bolt, r ~ d**0.55 there
+    r_d = np.divide(r, d, out=np.zeros_like(d), where=d > 0.0)
+    sx = -1*np.dot(r_d, dy)
+    sy = np.dot(r_d, dx)
+    s = math.hypot(sx, sy)
+    p = math.hypot(px, py)
+
+    mp = py*(cx - x_ic) - px*(cy - y_ic)
+    rult = -1*(px*sx + py*sy)/(s*s)
+
+    g1 = (px*sy - py*sx)/(s*p)
+    g2 = (mp + rult*sum_m)/(p*size)
+
+    return g1, g2
+
+
+def calc_fixed_point_step(xc, yc, px, py, cx, cy, x_ic, y_ic, j):
+    """Take one step of the fixed point iteration of iterate_to_ic.
+
+    The bolt strength is chosen so the bolt reactions balance the moment of
+    the applied force about the trial IC. The unbalanced force moves the IC
+    the same way calc_instanteous_center does.
+
+    Args:
+        xc (ndarray): bolt x-coordinates with respect to the centroid
+        yc (ndarray): bolt y-coordinates with respect to the centroid
+        px (float): x-component of the applied force
+        py (float): y-component of the applied force
+        cx (float): x-coordinate of the force with respect to the centroid
+        cy (float): y-coordinate of the force with respect to the centroid
+        x_ic (float): x-coordinate of the trial IC
+        y_ic (float): y-coordinate of the trial IC
+        j (float): polar moment of inertia of the bolt group
+
+    Returns:
+        x_new (float): x-coordinate of the next trial IC
+        y_new (float): y-coordinate of the next trial IC
+        error (float): max(|fx|, |fy|)/|P| of the unbalanced force at the
+                       trial IC
+    """
+    dx = xc - x_ic
+    dy = yc - y_ic
+    d = np.hypot(dx, dy)
+
+    r = calc_force_fraction(d, d.max())
+    r_d = np.divide(r, d, out=np.zeros_like(d), where=d > 0.0)
+    mp = py*(cx - x_ic) - px*(cy - y_ic)
+    rult = -1*mp/np.dot(r, d)
+
+    fx = px - rult*np.dot(r_d, dy)
+    fy = py + rult*np.dot(r_d, dx)
+
+    mo = py*cx - px*cy
+    scale = j/(len(xc)*mo)
+    error = max(abs(fx), abs(fy))/math.hypot(px, py)
+
+    return x_ic - fy*scale, y_ic + fx*scale, error
+
+
+def solve_ic(group, force, x0=None, y0=None, tol=1e-10, max_iter=50,
+             line_search=True):
+    """Solve for the instantaneous center with a damped Newton iteration.
+
+    Args:
+        group (BoltGroup): bolt group
+        force (data struct): single force data structure, only the user
+                             coordinates and the force components are used
+        x0 (float): x-coordinate of the starting point with respect to the
+                    centroid, defaults to the elastic IC
+        y0 (float): y-coordinate of the starting point with respect to the
+                    centroid, defaults to the elastic IC
+        tol (float): convergence tolerance on max(|g1|, |g2|), see
+                     calc_equilibrium_residual
+        max_iter (int): maximum number of Newton iterations
+        line_search (bool): halve the Newton step until the residual decreases
+                            and fall back to the fixed point iteration when
+                            it does not
+
+    Returns:
+        result (ICResult): location of the IC, coefficients, iteration count
+                           and final residual
+
+    Raises:
+        ValueError: the line of action of the force passes so close to the
+                    centroid that the IC is effectively at infinity
+        ConvergenceError: the iteration did not converge in max_iter
+                          iterations, or stalled again after the fixed point
+                          fallback
+
+    Notes:
+        Populates dx, dy, d, delta, r, rux, and ruy of the bolt group at the
+        converged IC, as bolt_group.iterate_to_ic does.
+    """
+    px = force[1][0]
+    py = force[1][1]
+    x_cent, y_cent = group.centroid
+    cx = force[0][0] - x_cent
+    cy = force[0][1] - y_cent
+    xc, yc = group.local_coords
+
+    # radius of gyration of the bolt group
+    size = math.sqrt(group.j/len(group))
+    p = math.hypot(px, py)
+    mo = py*cx - px*cy
+    if p == 0.0 or abs(mo) <= CONCENTRIC_TOL*p*size:
+        raise ValueError('the force has no eccentricity about the centroid')
+
+    x_el, y_el = bolt_group.calc_instanteous_center(group, px, py, mo, 0.0, 0.0)
+    if x0 is None or y0 is None:
+        x0, y0 = x_el, y_el
+
+    x, y = x0, y0
+    g1, g2 = calc_equilibrium_residual(xc, yc, px, py, cx, cy, x, y, size)
+    norm = max(abs(g1), abs(g2))
+    count = 0
+    fallback = False
+    history = instrument.start_solve('ic_solver.solve_ic')
+    if history is not None:
+        history.append(norm)
+
+    while norm >= tol:
+        if count >= max_iter:
+            if history is not None:
+                history.finish(count, False)
+            raise ConvergenceError('IC solver did not converge in %d '
+                                   'iterations' % max_iter,
+                                   _result(group, px, py, cx, cy, x_el, y_el,
+                                           x, y, count, norm))
+        count += 1
+
+        # finite difference step scaled to the size of the bolt group and the
+        # distance to the IC, which is large for nearly concentric loads
+        h = 1e-7*max(size, math.hypot(x, y))
+        g1_x, g2_x = calc_equilibrium_residual(xc, yc, px, py, cx, cy,
+                                               x + h, y, size)
+        g1_y, g2_y = calc_equilibrium_residual(xc, yc, px, py, cx, cy,
+                                               x, y + h, size)
+        a = (g1_x - g1)/h
+        b = (g1_y - g1)/h
+        c = (g2_x - g2)/h
+        d = (g2_y - g2)/h
+        det = a*d - b*c
+
+        stalled = det == 0.0
+        if not stalled:
+            step_x = -(d*g1 - b*g2)/det
+            step_y = -(a*g2 - c*g1)/det
+
+            # a step longer than the bolt group seen from the trial IC heads
+            # for the root at infinity rather than the IC
+            step = math.hypot(step_x, step_y)
+            step_max = MAX_STEP*np.hypot(xc - x, yc - y).max()
+            if step > step_max:
+                step_x = step_x*step_max/step
+                step_y = step_y*step_max/step
+
+            alpha = 1.0
+            while True:
+                x_new = x + alpha*step_x
+                y_new = y + alpha*step_y
+                g1_new, g2_new = calc_equilibrium_residual(xc, yc, px, py, cx,
+                                                           cy, x_new, y_new,
+                                                           size)
+                norm_new = max(abs(g1_new), abs(g2_new))
+                if (not line_search or
+                        norm_new <= (1.0 - DECREASE*alpha)*norm):
+                    break
+                if alpha < MIN_STEP:
+                    stalled = True
+                    break
+                alpha = alpha/2
+
+        if stalled:
+            if fallback:
+                if history is not None:
+                    history.finish(count, False)
+                raise ConvergenceError('IC solver stalled',
+                                       _result(group, px, py, cx, cy, x_el,
+                                               y_el, x, y, count, norm))
+            # restart Newton from the fixed point iteration of iterate_to_ic,
+            # which converges where Newton does not, see _iterate_fixed_point
+            fallback = True
+            x_new, y_new, steps = _iterate_fixed_point(
+                xc, yc, px, py, cx, cy, x_el, y_el, group.j,
+                max_iter - count + 1)
+            count += steps - 1
+            g1_new, g2_new = calc_equilibrium_residual(xc, yc, px, py, cx, cy,
+                                                       x_new, y_new, size)
+            norm_new = max(abs(g1_new), abs(g2_new))
+
+        x, y, g1, g2, norm = x_new, y_new, g1_new, g2_new, norm_new
+        if history is not None:
+            history.append(norm)
+
+    if history is not None:
+        history.finish(count, True)
+    return _result(group, px, py, cx, cy, x_el, y_el, x, y, count, norm)
+
+
+def _iterate_fixed_point(xc, yc, px, py, cx, cy, x_ic, y_ic, j, max_iter):
+    """Run the fixed point iteration until the force is within FIXED_POINT_TOL.
+
+    Returns the last trial IC and the number of steps taken.
+    """
+    count = 0
+    while count < max_iter:
+        count += 1
+        x_new, y_new, error = calc_fixed_point_step(xc, yc, px, py, cx, cy,
+                                                    x_ic, y_ic, j)
+        if error < FIXED_POINT_TOL:
+            break
+        x_ic, y_ic = x_new, y_new
+
+    return x_ic, y_ic, count
+
+
+def _iterate_fixed_point_batch(xc, yc, px, py, cx, cy, x_ic, y_ic, j,
+                               max_iter):
+    """Array version of _iterate_fixed_point, steps is the count per case."""
+    x_ic = x_ic.copy()
+    y_ic = y_ic.copy()
+    steps = np.zeros(x_ic.shape[0])
+    pending = np.arange(x_ic.shape[0])
+    count = 0
+    while pending.size and count < max_iter:
+        count += 1
+        steps[pending] += 1
+        x_new, y_new, error = calc_fixed_point_step_batch(
+            xc, yc, px[pending], py[pending], cx[pending], cy[pending],
+            x_ic[pending], y_ic[pending], j)
+        moving = ~(error < FIXED_POINT_TOL)
+        pending = pending[moving]
+        x_ic[pending], y_ic[pending] = x_new[moving], y_new[moving]
+
+    return x_ic, y_ic, steps
+
+
+def _result(group, px, py, cx, cy, x_el, y_el, x_ic, y_ic, count, norm):
+    """Populate the bolt group at the IC and package the ICResult."""
+    bolt_group.calc_bolt_location_wrt_ic(group, x_el, y_el)
+    mp_el = py*(cx - x_el) - px*(cy - y_el)
+    ce = bolt_group.calc_sum_d_squared(group)/(bolt_group.calc_d_max(group)*
+                                               mp_el)
+
+    bolt_group.calc_bolt_location_wrt_ic(group, x_ic, y_ic)
+    mp = py*(cx - x_ic) - px*(cy - y_ic)
+    sum_m = bolt_group.calc_bolt_fraction_reactions(group, mp)[2]
+    cu = mp/sum_m
+
+    return ICResult(float(x_ic), float(y_ic), float(ce), float(cu), count,
+                    float(norm))
+
+
+class ICBatchResult(collections.namedtuple('ICBatchResult',
+                                           ['x_ic', 'y_ic', 'ce', 'cu',
+                                            'iterations', 'residual',
+                                            'converged', 'concentric'])):
+    """Result of a batch of IC solves, one entry per load case.
+
+    x_ic (ndarray): x-coordinate of the IC with respect to the centroid
+    y_ic (ndarray): y-coordinate of the IC with respect to the centroid
+    ce (ndarray): elastic coefficient at the elastic IC, see iterate_to_ic
+    cu (ndarray): ultimate coefficient at the IC, see iterate_to_ic
+    iterations (ndarray): number of Newton iterations of each load case,
+                          including the steps of a fixed point fallback
+    residual (ndarray): max(|g1|, |g2|) at the IC
+    converged (ndarray): True where the residual is below the tolerance
+    concentric (ndarray): True where the load passes through the centroid,
+                          the IC and coefficients of those cases are nan
+    """
+    __slots__ = ()
+
+
+def calc_equilibrium_residual_batch(xc, yc, px, py, cx, cy, x_ic, y_ic, size):
+    """Calculate the equilibrium residual about a trial IC for many load cases.
+
+    Array version of calc_equilibrium_residual. All of the load case arguments
+    are 1-d arrays of the same length; xc and yc are shared by every case.
+
+    Returns:
+        g1 (ndarray): dimensionless force residual perpendicular to the force
+        g2 (ndarray): dimensionless moment residual about the trial IC
+    """
+    dx = xc - x_ic[:, np.newaxis]
+    dy = yc - y_ic[:, np.newaxis]
+    d = np.hypot(dx, dy)
+    d_max = d.max(axis=1)
+
+    r = calc_force_fraction(d, d_max[:, np.newaxis])
+    sum_m = np.einsum('ij,ij->i', r, d)
+
+    r_d = np.divide(r, d, out=np.zeros_like(d), where=d > 0.0)
+    sx = -1*np.einsum('ij,ij->i', r_d, dy)
+    sy = np.einsum('ij,ij->i', r_d, dx)
+    s = np.hypot(sx, sy)
+    p = np.hypot(px, py)
+
+    mp = py*(cx - x_ic) - px*(cy - y_ic)
+    rult = -1*(px*sx + py*sy)/(s*s)
+
+    g1 = (px*sy - py*sx)/(s*p)
+    g2 = (mp + rult*sum_m)/(p*size)
+
+    return g1, g2
+
+
+def calc_fixed_point_step_batch(xc, yc, px, py, cx, cy, x_ic, y_ic, j):
+    """Take one step of the fixed point iteration for many load cases.
+
+    Array version of calc_fixed_point_step. All of the load case arguments
+    are 1-d arrays of the same length; xc and yc are shared by every case.
+
+    Returns:
+        x_new (ndarray): x-coordinate of the next trial IC
+        y_new (ndarray): y-coordinate of the next trial IC
+        error (ndarray): max(|fx|, |fy|)/|P| of the unbalanced force at the
+                         trial IC
+    """
+    dx = xc - x_ic[:, np.newaxis]
+    dy = yc - y_ic[:, np.newaxis]
+    d = np.hypot(dx, dy)
+
+    r = calc_force_fraction(d, d.max(axis=1)[:, np.newaxis])
+    r_d = np.divide(r, d, out=np.zeros_like(d), where=d > 0.0)
+    mp = py*(cx - x_ic) - px*(cy - y_ic)
+    rult = -1*mp/np.einsum('ij,ij->i', r, d)
+
+    fx = px - rult*np.einsum('ij,ij->i', r_d, dy)
+    fy = py + rult*np.einsum('ij,ij->i', r_d, dx)
+
+    mo = py*cx - px*cy
+    scale = j/(len(xc)*mo)
+    error = np.maximum(np.abs(fx), np.abs(fy))/np.hypot(px, py)
+
+    return x_ic - fy*scale, y_ic + fx*scale, error
+
+
+def solve_ic_batch(group, points, loads, tol=1e-10, max_iter=50,
+                   chunk_size=4096):
+    """Solve for the instantaneous center of many load cases in lock-step.
+
+    Every load case of a chunk takes its Newton step at the same time as one
+    set of array operations. A load case is masked out of the iteration as
+    soon as it converges so the remaining work shrinks with each iteration.
+    The bolt group is not modified, so the same group can be shared between
+    threads.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates (user_x, user_y, user_z)
+                             of the application point of each force
+        loads (array like): (N, 3) force components (Px, Py, Pz) of each force
+        tol (float): convergence tolerance on max(|g1|, |g2|), see
+                     calc_equilibrium_residual
+        max_iter (int): maximum number of Newton iterations
+        chunk_size (int): number of load cases solved together, bounds the
+                          memory used to chunk_size*num_bolts per array
+
+    Returns:
+        result (ICBatchResult): location of the IC, coefficients, iteration
+                                count, residual and convergence flag of every
+                                load case
+
+    Notes:
+        Unlike solve_ic a load case that does not converge does not raise, it
+        is reported through the converged flag.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    if points.shape[0] != loads.shape[0]:
+        raise ValueError('points and loads must have the same number of rows')
+
+    num_cases = points.shape[0]
+    x_cent, y_cent = group.centroid
+    xc, yc = group.local_coords
+    num_bolts = len(group)
+    size = math.sqrt(group.j/num_bolts)
+
+    result = ICBatchResult(*[np.full(num_cases, np.nan) for _ in range(6)] +
+                           [np.zeros(num_cases, dtype=bool),
+                            np.zeros(num_cases, dtype=bool)])
+    result.iterations[:] = 0
+
+    for start in range(0, num_cases, chunk_size):
+        chunk = slice(start, min(start + chunk_size, num_cases))
+        # concentric and zero loads are carried through the arithmetic as nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _solve_chunk(xc, yc, size, group.j, num_bolts,
+                         loads[chunk, 0], loads[chunk, 1],
+                         points[chunk, 0] - x_cent, points[chunk, 1] - y_cent,
+                         tol, max_iter, [column[chunk] for column in result])
+
+    result = result._replace(iterations=result.iterations.astype(int))
+    return result
+
+
+def _solve_chunk(xc, yc, size, j, num_bolts, px, py, cx, cy, tol, max_iter,
+                 out):
+    """Run the lock-step Newton iteration for one chunk of load cases."""
+    x_out, y_out, ce_out, cu_out, it_out, res_out, conv_out, conc_out = out
+
+    p = np.hypot(px, py)
+    mo = py*cx - px*cy
+    concentric = (p == 0.0) | (np.abs(mo) <= CONCENTRIC_TOL*p*size)
+    conc_out[:] = concentric
+    mo = np.where(concentric, 1.0, mo)
+
+    # elastic IC, see calc_instanteous_center
+    x_el = -py/num_bolts*j/mo
+    y_el = px/num_bolts*j/mo
+    x = x_el.copy()
+    y = y_el.copy()
+
+    g1, g2 = calc_equilibrium_residual_batch(xc, yc, px, py, cx, cy, x, y, size)
+    norm = np.maximum(np.abs(g1), np.abs(g2))
+    norm[concentric] = np.nan
+    iterations = np.zeros(px.shape[0])
+    fallback = np.zeros(px.shape[0], dtype=bool)
+
+    active = np.flatnonzero(norm >= tol)
+    count = 0
+    # one history per chunk, the residual is the largest of the chunk
+    history = instrument.start_solve('ic_solver.solve_ic_batch')
+    if history is not None:
+        history.append(np.nanmax(norm) if active.size else 0.0)
+    while active.size and count < max_iter:
+        count += 1
+        a_px, a_py, a_cx, a_cy = px[active], py[active], cx[active], cy[active]
+        a_x, a_y = x[active], y[active]
+        a_g1, a_g2, a_norm = g1[active], g2[active], norm[active]
+
+        h = 1e-7*np.maximum(size, np.hypot(a_x, a_y))
+        g1_x, g2_x = calc_equilibrium_residual_batch(xc, yc, a_px, a_py, a_cx,
+                                                     a_cy, a_x + h, a_y, size)
+        g1_y, g2_y = calc_equilibrium_residual_batch(xc, yc, a_px, a_py, a_cx,
+                                                     a_cy, a_x, a_y + h, size)
+        a = (g1_x - a_g1)/h
+        b = (g1_y - a_g1)/h
+        c = (g2_x - a_g2)/h
+        d = (g2_y - a_g2)/h
+        det = a*d - b*c
+        stalled = det == 0.0
+        det[stalled] = 1.0
+        step_x = -(d*a_g1 - b*a_g2)/det
+        step_y = -(a*a_g2 - c*a_g1)/det
+
+        # cap the step to the bolt group seen from the trial IC, see solve_ic
+        step = np.hypot(step_x, step_y)
+        step_max = MAX_STEP*np.hypot(xc - a_x[:, np.newaxis],
+                                     yc - a_y[:, np.newaxis]).max(axis=1)
+        scale = np.where(step > step_max, step_max/step, 1.0)
+        step_x = step_x*scale
+        step_y = step_y*scale
+
+        # backtracking line search, each case halves its own step
+        alpha = np.ones(active.size)
+        pending = np.flatnonzero(~stalled)
+        while pending.size:
+            t_x = a_x[pending] + alpha[pending]*step_x[pending]
+            t_y = a_y[pending] + alpha[pending]*step_y[pending]
+            t_g1, t_g2 = calc_equilibrium_residual_batch(
+                xc, yc, a_px[pending], a_py[pending], a_cx[pending],
+                a_cy[pending], t_x, t_y, size)
+            t_norm = np.maximum(np.abs(t_g1), np.abs(t_g2))
+            accept = t_norm <= (1.0 - DECREASE*alpha[pending])*a_norm[pending]
+
+            done = pending[accept]
+            a_x[done], a_y[done] = t_x[accept], t_y[accept]
+            a_g1[done], a_g2[done] = t_g1[accept], t_g2[accept]
+            a_norm[done] = t_norm[accept]
+
+            pending = pending[~accept]
+            give_up = alpha[pending] < MIN_STEP
+            stalled[pending[give_up]] = True
+            pending = pending[~give_up]
+            alpha[pending] = alpha[pending]/2
+
+        # restart stalled cases once from the fixed point iteration
+        restart = np.flatnonzero(stalled & ~fallback[active])
+        if restart.size:
+            cases = active[restart]
+            f_x, f_y, steps = _iterate_fixed_point_batch(
+                xc, yc, px[cases], py[cases], cx[cases], cy[cases],
+                x_el[cases], y_el[cases], j, max_iter - count + 1)
+            f_g1, f_g2 = calc_equilibrium_residual_batch(
+                xc, yc, px[cases], py[cases], cx[cases], cy[cases], f_x, f_y,
+                size)
+            a_x[restart], a_y[restart] = f_x, f_y
+            a_g1[restart], a_g2[restart] = f_g1, f_g2
+            a_norm[restart] = np.maximum(np.abs(f_g1), np.abs(f_g2))
+            iterations[cases] += steps - 1
+            fallback[cases] = True
+            stalled[restart] = False
+
+        x[active], y[active] = a_x, a_y
+        g1[active], g2[active], norm[active] = a_g1, a_g2, a_norm
+        iterations[active] += 1
+
+        # cases that stall after the fallback can not make progress, drop
+        # them unconverged
+        active = active[~stalled & (a_norm >= tol) &
+                        (iterations[active] < max_iter)]
+        if history is not None:
+            history.append(a_norm.max())
+
+    converged = norm < tol
+    solved = ~concentric
+    if history is not None:
+        history.finish(count, bool(converged[solved].all()))
+
+    x_out[solved], y_out[solved] = x[solved], y[solved]
+    it_out[:] = iterations
+    res_out[:] = norm
+    conv_out[:] = converged
+
+    for ic_x, ic_y, name in ((x_el, y_el, 'ce'), (x, y, 'cu')):
+        dx = xc - ic_x[:, np.newaxis]
+        dy = yc - ic_y[:, np.newaxis]
+        dist = np.hypot(dx, dy)
+        mp = py*(cx - ic_x) - px*(cy - ic_y)
+        d_max = dist.max(axis=1)
+        if name == 'ce':
+            coefficient = np.einsum('ij,ij->i', dist, dist)/(d_max*mp)
+            ce_out[solved] = coefficient[solved]
+        else:
+            r = calc_force_fraction(dist, d_max[:, np.newaxis])
+            coefficient = mp/np.einsum('ij,ij->i', r, dist)
+            cu_out[solved] = coefficient[solved]
+
+
+class ICSweepResult(collections.namedtuple('ICSweepResult',
+                                           ['x_ic', 'y_ic', 'ce', 'cu',
+                                            'iterations', 'residual',
+                                            'converged', 'concentric',
+                                            'warm_started',
+                                            'cold_iterations'])):
+    """Result of a warm-started sweep, one entry per load case.
+
+    The first eight fields are the same as ICBatchResult; iterations includes
+    the iterations of a warm start that was abandoned.
+
+    warm_started (ndarray): True where the solve started from the IC of the
+                            previous load case and converged
+    cold_iterations (ndarray): iterations the same solves take from the
+                               elastic IC, None unless the sweep was run with
+                               compare=True
+    """
+    __slots__ = ()
+
+    @property
+    def iterations_saved(self):
+        """Cold start iterations minus sweep iterations, None if unknown."""
+        if self.cold_iterations is None:
+            return None
+        solved = ~self.concentric
+        return int(self.cold_iterations[solved].sum() -
+                   self.iterations[solved].sum())
+
+
+def sweep_ic(group, points, loads, x0=None, y0=None, tol=1e-10, max_iter=50,
+             compare=False):
+    """Solve an ordered sequence of load cases, warm-starting each IC solve.
+
+    When the load angle or eccentricity changes in small steps the IC of one
+    load case is a good starting point for the next. Each solve starts from
+    the IC of the previous converged load case. If that solve does not
+    converge the load case is solved again from the elastic IC, the default
+    start of solve_ic.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates (user_x, user_y, user_z)
+                             of the application point of each force
+        loads (array like): (N, 3) force components (Px, Py, Pz) of each force
+        x0 (float): x-coordinate of the starting point of the first load case,
+                    defaults to its elastic IC
+        y0 (float): y-coordinate of the starting point of the first load case,
+                    defaults to its elastic IC
+        tol (float): convergence tolerance, see solve_ic
+        max_iter (int): maximum number of Newton iterations of each solve
+        compare (bool): also solve every load case from the elastic IC to
+                        count the iterations saved
+
+    Returns:
+        result (ICSweepResult): IC, coefficients and iteration counts of every
+                                load case
+
+    Notes:
+        Concentric load cases are reported as in solve_ic_batch and do not
+        interrupt the warm start. The bolt group columns hold the solution of
+        the last load case solved, as with solve_ic.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    if points.shape[0] != loads.shape[0]:
+        raise ValueError('points and loads must have the same number of rows')
+
+    num_cases = points.shape[0]
+    columns = [np.full(num_cases, np.nan) for _ in range(4)]
+    iterations = np.zeros(num_cases, dtype=int)
+    residual = np.full(num_cases, np.nan)
+    converged = np.zeros(num_cases, dtype=bool)
+    concentric = np.zeros(num_cases, dtype=bool)
+    warm_started = np.zeros(num_cases, dtype=bool)
+    cold_iterations = np.zeros(num_cases, dtype=int) if compare else None
+
+    start = (x0, y0) if x0 is not None and y0 is not None else None
+    for i in range(num_cases):
+        force = (points[i], loads[i])
+        result = None
+
+        if start is not None:
+            try:
+                result = solve_ic(group, force, start[0], start[1], tol,
+                                  max_iter)
+                warm_started[i] = True
+            except ValueError:
+                concentric[i] = True
+                continue
+            except ConvergenceError as e:
+                iterations[i] = e.result.iterations if e.result else max_iter
+
+        if result is None:
+            try:
+                result = solve_ic(group, force, tol=tol, max_iter=max_iter)
+                converged[i] = True
+            except ValueError:
+                concentric[i] = True
+                continue
+            except ConvergenceError as e:
+                result = e.result
+        else:
+            converged[i] = True
+
+        if result is not None:
+            for column, value in zip(columns, result[:4]):
+                column[i] = value
+            iterations[i] += result.iterations
+            residual[i] = result.residual
+        if compare:
+            try:
+                cold_iterations[i] = solve_ic(group, force, tol=tol,
+                                              max_iter=max_iter).iterations
+            except ConvergenceError:
+                cold_iterations[i] = max_iter
+
+        start = (result.x_ic, result.y_ic) if converged[i] else None
+
+    return ICSweepResult(*columns + [iterations, residual, converged,
+                                     concentric, warm_started,
+                                     cold_iterations])
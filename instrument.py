@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""The instrument module records where the time of an analysis goes.
+
+Instrumentation is off unless a record block is active:
+
+    with instrument.record() as report:
+        demand.iterate_to_ic(bolts, force)
+    print(report.format())
+
+While the block is active every function of the recorded modules (demand,
+bolt_group and ic_solver by default) is replaced with a wrapper that counts
+its calls and adds up its wall time, and the IC solvers store the residual of
+each iteration. The original functions are put back when the block exits, so
+there is no cost when instrumentation is off apart from one check per IC
+solve.
+
+Definitions:
+    calls (dict): number of calls of each function, keyed by
+                  'module.function'
+    time (dict): wall time in seconds spent in each function, including the
+                 functions it calls
+    solves (list): SolveHistory of each IC solve
+
+Notes:
+    The wrappers are installed on the modules, so only one record block should
+    be active at a time and the functions are instrumented in every thread.
+"""
+import collections
+import contextlib
+import functools
+import inspect
+import time
+
+
+#: Report of the active record block, None when instrumentation is off
+recorder = None
+
+
+class SolveHistory(object):
+    """Residual history of one IC solve.
+
+    Args:
+        solver (str): name of the solver
+
+    Attributes:
+        residuals (list): convergence residual of each approximation of the IC
+                          in the solver's own measure
+        iterations (int): number of iterations of the solve
+        converged (bool): the solve converged
+    """
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.residuals = []
+        self.iterations = 0
+        self.converged = False
+
+    def append(self, residual):
+        self.residuals.append(float(residual))
+
+    def finish(self, iterations, converged):
+        self.iterations = iterations
+        self.converged = converged
+
+
+class Report(object):
+    """Counters and solve histories of a record block."""
+
+    def __init__(self):
+        self.calls = collections.defaultdict(int)
+        self.time = collections.defaultdict(float)
+        self.solves = []
+
+    def add_call(self, name, elapsed):
+        self.calls[name] += 1
+        self.time[name] += elapsed
+
+    def start_solve(self, solver):
+        history = SolveHistory(solver)
+        self.solves.append(history)
+        return history
+
+    def iterations(self, solver=None):
+        """Total number of IC iterations, optionally of one solver only."""
+        return sum(s.iterations for s in self.solves
+                   if solver is None or s.solver == solver)
+
+    def as_dict(self):
+        """Return the report as a dictionary of plain Python types."""
+        return {'calls': dict(self.calls),
+                'time': dict(self.time),
+                'solves': [{'solver': s.solver,
+                            'iterations': s.iterations,
+                            'converged': s.converged,
+                            'residuals': list(s.residuals)}
+                           for s in self.solves]}
+
+    def format(self):
+        """Return a table of the functions sorted by time and a solve summary."""
+        lines = ['%-48s %10s %12s' % ('function', 'calls', 'time [s]')]
+        for name in sorted(self.time, key=self.time.get, reverse=True):
+            lines.append('%-48s %10d %12.6f' % (name, self.calls[name],
+                                                self.time[name]))
+        solvers = sorted(set(s.solver for s in self.solves))
+        for solver in solvers:
+            solves = [s for s in self.solves if s.solver == solver]
+            lines.append('%s: %d solves, %d iterations, %d not converged' %
+                         (solver, len(solves), self.iterations(solver),
+                          sum(not s.converged for s in solves)))
+        return '\n'.join(lines)
+
+
+def start_solve(solver):
+    """Start the residual history of an IC solve.
+
+    Args:
+        solver (str): name of the solver
+
+    Returns:
+        history (SolveHistory): history to append the residuals to, None when
+                                instrumentation is off
+    """
+    if recorder is None:
+        return None
+    return recorder.start_solve(solver)
+
+
+def _wrap(func, name, report):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            report.add_call(name, time.perf_counter() - start)
+    return wrapper
+
+
+def _default_modules():
+    import bolt_group
+    import demand
+    import ic_solver
+    return demand, bolt_group, ic_solver
+
+
+@contextlib.contextmanager
+def record(modules=None):
+    """Record call counts, wall times and IC residuals inside a with block.
+
+    Args:
+        modules (sequence): modules whose functions are timed, defaults to
+                            demand, bolt_group and ic_solver
+
+    Yields:
+        report (Report): counters of the block, complete once the block exits
+    """
+    global recorder
+    if recorder is not None:
+        raise RuntimeError('instrument.record blocks can not be nested')
+    if modules is None:
+        modules = _default_modules()
+
+    report = Report()
+    originals = []
+    for module in modules:
+        for attr, func in list(vars(module).items()):
+            if inspect.isfunction(func) and func.__module__ == module.__name__:
+                originals.append((module, attr, func))
+                setattr(module, attr,
+                        _wrap(func, '%s.%s' % (module.__name__, attr), report))
+
+    recorder = report
+    try:
+        yield report
+    finally:
+        recorder = None
+        for module, attr, func in originals:
+            setattr(module, attr, func)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""The kernels module evaluates the Crawford-Kulak load deformation curve of
+the IC method for whole arrays of bolts.
+
+    delta = 0.34*d/d_max
+    ri/rult = (1 - e^(-10*delta))^0.55
+    sum_m = sum(ri/rult*d)
+
+Two backends are provided:
+
+    numba: compiled loops that compute delta, ri/rult and sum_m of each load
+           case in a single pass over the bolts, used when Numba is installed
+    numpy: whole-array NumPy expressions, always available
+
+Both backends follow the floating point rules of NumPy, a d_max of 0 gives a
+deformation of nan or inf rather than raising ZeroDivisionError.
+
+The best available backend is selected at import time. set_backend changes
+it, for example to compare the two.
+
+Definitions:
+    d (ndarray): (..., num_bolts) distance from the IC to each bolt
+    d_max (float or ndarray): (...) distance from the IC to the farthest bolt
+                              of each load case
+"""
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+BACKENDS = ('numba', 'numpy')
+
+#: deformation of the farthest bolt from the IC at the ultimate load, inches
+DELTA_MAX = 0.34
+
+#: coefficient of d/d_max in the exponent of ri/rult, 10*DELTA_MAX
+RATE = 3.4
+
+
+def _force_fraction_numpy(d, d_max):
+    return np.power(1 - np.exp(-RATE*d/d_max), 0.55)
+
+
+def _crawford_kulak_numpy(d, d_max):
+    delta = DELTA_MAX*d/d_max[..., np.newaxis]
+    r = np.power(1 - np.exp(-10*delta), 0.55)
+    sum_m = np.einsum('...j,...j->...', r, d)
+    return delta, r, sum_m
+
+
+def _force_fraction_scalar(d, d_max):
+    return math.pow(1.0 - math.exp(-RATE*d/d_max), 0.55)
+
+
+def _crawford_kulak_loop(d, d_max, delta, r, sum_m):
+    for i in range(d.shape[0]):
+        total = 0.0
+        for j in range(d.shape[1]):
+            delta_j = DELTA_MAX*d[i, j]/d_max[i]
+            r_j = math.pow(1.0 - math.exp(-10.0*delta_j), 0.55)
+            delta[i, j] = delta_j
+            r[i, j] = r_j
+            total += r_j*d[i, j]
+        sum_m[i] = total
+
+
+if numba is not None:
+    _force_fraction_numba = numba.vectorize(
+        ['float64(float64, float64)'])(_force_fraction_scalar)
+    # numpy error model: a zero d_max gives nan and inf like the numpy
+    # backend instead of raising ZeroDivisionError
+    _crawford_kulak_compiled = numba.njit(error_model='numpy')(
+        _crawford_kulak_loop)
+
+    def _crawford_kulak_numba(d, d_max):
+        shape = d.shape
+        d2 = np.ascontiguousarray(d.reshape(-1, shape[-1]))
+        d_max1 = np.ascontiguousarray(np.broadcast_to(d_max,
+                                                      shape[:-1]).ravel())
+        delta = np.empty(d2.shape)
+        r = np.empty(d2.shape)
+        sum_m = np.empty(d2.shape[0])
+        _crawford_kulak_compiled(d2, d_max1, delta, r, sum_m)
+        return delta.reshape(shape), r.reshape(shape), \
+            sum_m.reshape(shape[:-1])
+
+
+_IMPLEMENTATIONS = {'numpy': (_force_fraction_numpy, _crawford_kulak_numpy)}
+if numba is not None:
+    _IMPLEMENTATIONS['numba'] = (_force_fraction_numba, _crawford_kulak_numba)
+
+backend = None
+_force_fraction = None
+_crawford_kulak = None
+
+
+def available_backends():
+    """Return the names of the backends that can be used, best first."""
+    return [name for name in BACKENDS if name in _IMPLEMENTATIONS]
+
+
+def set_backend(name=None):
+    """Select the backend of the kernels.
+
+    Args:
+        name (str): 'numba' or 'numpy', None selects the best available
+
+    Returns:
+        previous (str): name of the backend in use before the call
+
+    Raises:
+        ValueError: the name is not a backend
+        ImportError: the backend needs a package that is not installed
+    """
+    global backend, _force_fraction, _crawford_kulak
+
+    if name is None:
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError('backend must be one of %s' % (BACKENDS,))
+    if name not in _IMPLEMENTATIONS:
+        raise ImportError('the %s backend requires %s' % (name, name))
+
+    previous = backend
+    backend = name
+    _force_fraction, _crawford_kulak = _IMPLEMENTATIONS[name]
+    return previous
+
+
+def force_fraction(d, d_max):
+    """Calculate the bolt force fraction Ri/Rult from the distance to the IC.
+
+    Args:
+        d (ndarray): distance from the IC to each bolt
+        d_max (float or ndarray): maximum distance from the IC to a bolt,
+                                  broadcastable against d
+
+    Returns:
+        r (ndarray): Ri/Rult ratio of each bolt
+    """
+    return _force_fraction(np.asarray(d, dtype=float),
+                           np.asarray(d_max, dtype=float))
+
+
+def crawford_kulak(d, d_max=None):
+    """Calculate the deformation, force fraction and resisting moment.
+
+    Args:
+        d (array like): (..., num_bolts) distance from the IC to each bolt
+        d_max (float or array like): (...) distance to the farthest bolt,
+                                     defaults to the maximum of d over the bolts
+
+    Returns:
+        delta (ndarray): (..., num_bolts) deformation of each bolt
+        r (ndarray): (..., num_bolts) Ri/Rult ratio of each bolt
+        sum_m (float or ndarray): (...) moment of the force fractions about
+                                  the IC, sum(r*d), a float for a single
+                                  load case whatever the backend
+    """
+    d = np.asarray(d, dtype=float)
+    if d_max is None:
+        d_max = d.max(axis=-1)
+    delta, r, sum_m = _crawford_kulak(d, np.asarray(d_max, dtype=float))
+    if sum_m.ndim == 0:
+        sum_m = float(sum_m)
+    return delta, r, sum_m
+
+
+set_backend()
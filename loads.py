@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""The loads module streams load cases from files in fixed size chunks.
+
+Load cases exported from analysis software can be far larger than memory.
+The readers in this module are generators that yield one chunk of load cases
+at a time as a pair of (N, 3) arrays, the same (points, loads) layout used by
+the batched functions of the bolt_group, ic_solver and analysis modules. Only
+one chunk is held in memory at a time.
+
+File layout:
+    One row per load case with the columns
+
+        x, y, z, px, py, pz
+
+    where x, y, z are the user coordinates of the point of application of the
+    force and px, py, pz are the force components. CSV files have a header
+    row naming the columns, in any order and case; extra columns are ignored.
+    A different set of column names can be given with the columns argument.
+
+Notes:
+    Parquet files are read with pyarrow, which is optional and only needed for
+    read_load_parquet.
+"""
+import csv
+import itertools
+import os.path
+
+import numpy as np
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+COLUMNS = ('x', 'y', 'z', 'px', 'py', 'pz')
+
+
+def read_load_csv(path, chunk_size=65536, columns=COLUMNS, delimiter=','):
+    """Stream the load cases of a CSV file in chunks.
+
+    Args:
+        path (str): file name
+        chunk_size (int): maximum number of load cases per chunk
+        columns (sequence): names of the x, y, z, px, py, pz columns
+        delimiter (str): field delimiter
+
+    Yields:
+        points (ndarray): (N, 3) user coordinates of the application points
+        loads (ndarray): (N, 3) force components (Px, Py, Pz)
+
+    Raises:
+        ValueError: the file is empty or a column is missing from the header
+    """
+    with open(path) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        try:
+            header = [name.strip().lower() for name in next(reader)]
+        except StopIteration:
+            raise ValueError('%s is empty, expected a header with the columns '
+                             '%s' % (path, ', '.join(columns)))
+        index = _column_index(header, columns)
+
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            chunk = np.array([[row[i] for i in index] for row in rows if row],
+                             dtype=float).reshape(-1, 6)
+            yield chunk[:, :3], chunk[:, 3:]
+
+
+def read_load_parquet(path, chunk_size=65536, columns=COLUMNS):
+    """Stream the load cases of a Parquet file in chunks.
+
+    Args:
+        path (str): file name
+        chunk_size (int): maximum number of load cases per chunk
+        columns (sequence): names of the x, y, z, px, py, pz columns
+
+    Yields:
+        points (ndarray): (N, 3) user coordinates of the application points
+        loads (ndarray): (N, 3) force components (Px, Py, Pz)
+
+    Raises:
+        ImportError: pyarrow is not installed
+    """
+    if pq is None:
+        raise ImportError('reading Parquet files requires pyarrow')
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size,
+                                           columns=list(columns)):
+        chunk = np.column_stack([batch.column(name).to_numpy(zero_copy_only=
+                                                             False)
+                                 for name in columns]).astype(float)
+        yield chunk[:, :3], chunk[:, 3:]
+
+
+def read_loads(path, chunk_size=65536, columns=COLUMNS):
+    """Stream the load cases of a CSV or Parquet file in chunks.
+
+    The reader is chosen from the file extension, .parquet and .pq files are
+    read as Parquet and everything else as CSV.
+
+    Args:
+        path (str): file name
+        chunk_size (int): maximum number of load cases per chunk
+        columns (sequence): names of the x, y, z, px, py, pz columns
+
+    Yields:
+        points (ndarray): (N, 3) user coordinates of the application points
+        loads (ndarray): (N, 3) force components (Px, Py, Pz)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return read_load_parquet(path, chunk_size, columns)
+    return read_load_csv(path, chunk_size, columns)
+
+
+def _column_index(header, columns):
+    """Return the position of each of the named columns in the header."""
+    index = []
+    for name in columns:
+        try:
+            index.append(header.index(name.lower()))
+        except ValueError:
+            raise ValueError('column %s is missing from the header' % name)
+    return index
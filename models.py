@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""The models module holds the bolt load deformation models used by the IC
+method.
+
+A load deformation model gives the force fraction ri/rult of a bolt from its
+deformation delta. The deformation of the bolt farthest from the IC is the
+ultimate deformation delta_max of the model and the other bolts deform in
+proportion to their distance from the IC:
+
+    delta = delta_max*d/d_max
+    ri/rult = fraction(delta)
+
+The IC solvers of the ic_solver and bolt_group modules use the active model,
+Crawford-Kulak unless another registered model is selected with set_model or
+use_model. Three kinds of model are provided:
+
+    CrawfordKulak: (1 - e^(-10*delta))^0.55 with delta_max = 0.34 in,
+                   evaluated by the kernels module
+    CurveModel: any Python callable of delta, evaluated one value at a time
+    TabulatedModel: (delta, ri/rult) points, for example from load tests of
+                    slip-critical, high-strength or stainless fasteners,
+                    evaluated with linear interpolation
+
+CurveModel.tabulate samples a curve into a TabulatedModel, which is evaluated
+with a single np.interp call per array of bolts.
+
+Notes:
+    The IC depends on the model, so ic_cache.ICCache keys include the name of
+    the active model.
+
+    The active model is process state. Process pools send it to their workers
+    with init_worker.
+"""
+import contextlib
+
+import numpy as np
+
+import kernels
+
+
+class Model(object):
+    """Bolt load deformation model.
+
+    Args:
+        name (str): name of the model in the registry
+        delta_max (float): deformation of the bolt farthest from the IC
+    """
+
+    def __init__(self, name, delta_max):
+        if delta_max <= 0.0:
+            raise ValueError('delta_max must be positive')
+        self.name = name
+        self.delta_max = float(delta_max)
+
+    def __repr__(self):
+        return '%s(%r, delta_max=%r)' % (type(self).__name__, self.name,
+                                         self.delta_max)
+
+    def fraction(self, delta):
+        """Return ri/rult of each deformation in the array delta."""
+        raise NotImplementedError
+
+    def force_fraction(self, d, d_max):
+        """Calculate ri/rult from the distance to the IC.
+
+        Args:
+            d (ndarray): distance from the IC to each bolt
+            d_max (float or ndarray): maximum distance from the IC to a bolt,
+                                      broadcastable against d
+
+        Returns:
+            r (ndarray): Ri/Rult ratio of each bolt
+        """
+        return self.fraction(self.delta_max*np.asarray(d, dtype=float)/d_max)
+
+    def evaluate(self, d, d_max=None):
+        """Calculate the deformation, force fraction and resisting moment.
+
+        Args:
+            d (array like): (..., num_bolts) distance from the IC to each bolt
+            d_max (float or array like): (...) distance to the farthest bolt,
+                                         defaults to the maximum of d
+
+        Returns:
+            delta, r, sum_m: see kernels.crawford_kulak
+        """
+        d = np.asarray(d, dtype=float)
+        if d_max is None:
+            d_max = d.max(axis=-1)
+        delta = self.delta_max*d/np.asarray(d_max)[..., np.newaxis]
+        r = self.fraction(delta)
+        return delta, r, np.einsum('...j,...j->...', r, d)
+
+
+class CrawfordKulak(Model):
+    """Crawford-Kulak curve, see the kernels module."""
+
+    def __init__(self, name='crawford_kulak'):
+        Model.__init__(self, name, kernels.DELTA_MAX)
+
+    def fraction(self, delta):
+        return np.power(1 - np.exp(-10*np.asarray(delta, dtype=float)), 0.55)
+
+    def force_fraction(self, d, d_max):
+        return kernels.force_fraction(d, d_max)
+
+    def evaluate(self, d, d_max=None):
+        return kernels.crawford_kulak(d, d_max)
+
+
+class CurveModel(Model):
+    """Model defined by a Python callable.
+
+    Args:
+        name (str): name of the model in the registry
+        curve (callable): function of one deformation returning ri/rult
+        delta_max (float): deformation of the bolt farthest from the IC
+
+    Notes:
+        The curve is called once per bolt, use tabulate for a model that
+        runs at array speed.
+    """
+
+    def __init__(self, name, curve, delta_max):
+        Model.__init__(self, name, delta_max)
+        self.curve = curve
+        self._ufunc = np.frompyfunc(curve, 1, 1)
+
+    def fraction(self, delta):
+        return np.asarray(self._ufunc(delta), dtype=float)
+
+    def __getstate__(self):
+        # the ufunc wrapper can not be pickled, it is rebuilt from the curve
+        state = self.__dict__.copy()
+        del state['_ufunc']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._ufunc = np.frompyfunc(self.curve, 1, 1)
+
+    def tabulate(self, num_points=1025, name=None):
+        """Sample the curve into a TabulatedModel.
+
+        Args:
+            num_points (int): number of evenly spaced deformations from 0 to
+                              delta_max
+            name (str): name of the tabulated model, defaults to the name of
+                        this model
+
+        Returns:
+            model (TabulatedModel): linear interpolation of the curve
+        """
+        delta = np.linspace(0.0, self.delta_max, num_points)
+        return TabulatedModel(self.name if name is None else name, delta,
+                              self.fraction(delta))
+
+
+class TabulatedModel(Model):
+    """Model defined by (delta, ri/rult) points.
+
+    Args:
+        name (str): name of the model in the registry
+        delta (array like): increasing deformations, the last one is
+                            delta_max
+        fraction (array like): ri/rult at each deformation
+
+    Notes:
+        Deformations beyond the table are given the fraction of the nearest
+        end of the table.
+    """
+
+    def __init__(self, name, delta, fraction):
+        delta = np.array(delta, dtype=float)
+        fraction = np.array(fraction, dtype=float)
+        if delta.ndim != 1 or delta.shape != fraction.shape:
+            raise ValueError('delta and fraction must be 1-d arrays of the '
+                             'same length')
+        if delta.shape[0] < 2 or np.any(np.diff(delta) <= 0.0):
+            raise ValueError('delta must have at least 2 increasing values')
+        Model.__init__(self, name, delta[-1])
+        self.delta = delta
+        self.table = fraction
+
+    def fraction(self, delta):
+        return np.interp(delta, self.delta, self.table)
+
+
+_registry = {}
+active = None
+
+
+def register(model, replace=False):
+    """Add a model to the registry.
+
+    Args:
+        model (Model): model, registered under model.name
+        replace (bool): replace a registered model of the same name
+
+    Returns:
+        model (Model): the registered model
+
+    Raises:
+        ValueError: a model of the same name is registered and replace is
+                    False
+    """
+    if model.name in _registry and not replace:
+        raise ValueError('a model named %r is already registered' %
+                         (model.name,))
+    _registry[model.name] = model
+    return model
+
+
+def get_model(name):
+    """Return the registered model of the name, a Model is returned as is."""
+    if isinstance(name, Model):
+        return name
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError('no model named %r, registered models are %s' %
+                         (name, sorted(_registry)))
+
+
+def available_models():
+    """Return the names of the registered models."""
+    return sorted(_registry)
+
+
+def set_model(name):
+    """Select the model used by the IC solvers.
+
+    Args:
+        name (str or Model): name of a registered model or a model
+
+    Returns:
+        previous (Model): model in use before the call
+    """
+    global active
+    previous = active
+    active = get_model(name)
+    return previous
+
+
+def init_worker(model):
+    """Select the model of the parent process in a pool worker.
+
+    Worker processes that are spawned rather than forked start with the
+    default model, so the pools of the analysis, design, sbc and workbook
+    modules pass the active model with
+
+        ProcessPoolExecutor(max_workers, initializer=models.init_worker,
+                            initargs=(models.active,))
+
+    Args:
+        model (Model): model of the parent process, it must be picklable
+
+    Returns:
+        None
+    """
+    set_model(model)
+
+
+@contextlib.contextmanager
+def use_model(name):
+    """Select the model used by the IC solvers inside a with block.
+
+    Yields:
+        model (Model): the selected model
+    """
+    previous = set_model(name)
+    try:
+        yield active
+    finally:
+        set_model(previous)
+
+
+set_model(register(CrawfordKulak()))
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""The out_plane module calculates the bolt tension of connections loaded
+eccentrically normal to the plane of the faying surface, for many load cases
+at once.
+
+The force component Pz and the moments Mx and My about the centroid of the bolt
+group put the bolts in tension. Three methods are provided, see Salmon and
+Johnson 5th Edition and the AISC Manual Part 7:
+
+    assume_na: the neutral axis is at the centroid of the bolt group and the
+               bolt pattern acts as a linear elastic section in both bending
+               directions. Bolts on the compression side get a negative
+               tension, which stands for bearing of the connected parts.
+    find_na: the neutral axis is found from equilibrium of the tension in the
+             bolts and a triangular compression block of the connected parts
+             bearing on each other. Bending about the x-axis only.
+    init_ten: the bolts are pretensioned, the connected parts stay in contact
+              and the neutral axis is at the centroid of the bolt group. A bolt
+              keeps its pretension until the applied tension exceeds it.
+
+Definitions:
+    rz (ndarray): axial reaction on each bolt, the negative of the bolt
+                  tension like the shear reactions of the demand module
+    s: bolt coordinate perpendicular to the neutral axis measured from the
+       centroid of the bolt group, positive toward the bolts in tension
+    a: location of the neutral axis on the s-axis
+
+Notes:
+    The neutral axis of the find_na method depends on the ratio of Pz to Mx so
+    it is solved for each load case. solve_neutral_axis_batch brackets the
+    neutral axis of every load case and bisects them in lock-step, see its
+    docstring.
+"""
+import math
+
+import numpy as np
+
+
+def calc_bolt_area(diameter):
+    """Calculate the nominal area of the bolts, pi*d^2/4."""
+    return math.pi/4*np.square(np.asarray(diameter, dtype=float))
+
+
+def _moments(group, points, loads):
+    """Moments about the centroid of the bolt group, see demand.calc_moments."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    if points.shape[0] != loads.shape[0]:
+        raise ValueError('points and loads must have the same number of rows')
+
+    x_cent, y_cent = group.centroid
+    cx = points[:, 0] - x_cent
+    cy = points[:, 1] - y_cent
+    cz = points[:, 2]
+    px, py, pz = loads[:, 0], loads[:, 1], loads[:, 2]
+
+    mx = pz*cy - py*cz
+    my = px*cz - pz*cx
+
+    return pz, mx, my
+
+
+def divide_moment(moment, prop, name):
+    """Divide moments by a section property of the bolt group.
+
+    Args:
+        moment (ndarray): moments about an axis through the centroid
+        prop (float): ixx, iyy or j of the bolt group
+        name (str): name of the property for the error message
+
+    Returns:
+        ratio (ndarray): moment/prop, 0 when prop and the moments are 0
+
+    Raises:
+        ValueError: prop is 0, the bolt pattern has no depth about the axis,
+                    and a moment is not 0
+    """
+    if prop > 0.0:
+        return moment/prop
+    if np.any(moment != 0.0):
+        raise ValueError('the bolt group has %s = 0 and can not resist a '
+                         'moment about that axis' % (name,))
+    return np.zeros_like(moment)
+
+
+def ecc_out_plane_assume_na_batch(group, points, loads):
+    """Calc the bolt tension with the neutral axis at the centroid.
+
+    rz = -1*(pz/num_bolts + mx*local_yb/ixx - my*local_xb/iyy)
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+
+    Returns:
+        rz (ndarray): (N, num_bolts) axial reaction on each bolt
+
+    Raises:
+        ValueError: see ecc_out_plane_assume_na_resultants
+    """
+    return ecc_out_plane_assume_na_resultants(group,
+                                              *_moments(group, points, loads))
+
+
+def ecc_out_plane_assume_na_resultants(group, pz, mx, my):
+    """Calc the bolt tension with the neutral axis at the centroid from the
+    resultants about the centroid, see ecc_out_plane_assume_na_batch.
+
+    Args:
+        group (BoltGroup): bolt group
+        pz (array like): (N,) force normal to the faying surface
+        mx (array like): (N,) moment about the x-axis through the centroid
+        my (array like): (N,) moment about the y-axis through the centroid
+
+    Returns:
+        rz (ndarray): (N, num_bolts) axial reaction on each bolt
+
+    Raises:
+        ValueError: a moment about an axis the bolt pattern has no depth in,
+                    a single row or column, see divide_moment
+    """
+    pz = np.atleast_1d(np.asarray(pz, dtype=float))
+    mx = np.atleast_1d(np.asarray(mx, dtype=float))
+    my = np.atleast_1d(np.asarray(my, dtype=float))
+    xc, yc = group.local_coords
+
+    tension = ((pz/len(group))[:, np.newaxis]
+               + np.multiply.outer(divide_moment(mx, group.ixx, 'ixx'), yc)
+               - np.multiply.outer(divide_moment(my, group.iyy, 'iyy'), xc))
+
+    return -1*tension
+
+
+def ecc_out_plane_init_ten_batch(group, points, loads, pretension):
+    """Calc the bolt tension of pretensioned bolts.
+
+    rz = -1*max(tb, pz/num_bolts + mx*local_yb/ixx - my*local_xb/iyy)
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+        pretension (float or array like): pretension tb of each bolt
+
+    Returns:
+        rz (ndarray): (N, num_bolts) axial reaction on each bolt, includes
+                      the pretension
+    """
+    tension = -1*ecc_out_plane_assume_na_batch(group, points, loads)
+
+    return -1*np.maximum(tension, pretension)
+
+
+def ecc_out_plane_find_na_batch(group, points, loads, width, y_top, y_bottom,
+                                tol=1e-10, max_iter=100):
+    """Calc the bolt tension with the neutral axis found from equilibrium.
+
+    The connected parts bear on each other over a rectangle of the given width
+    between y_bottom and y_top. A positive mx compresses the bottom edge, a
+    negative mx the top edge. My is not considered.
+
+    Args:
+        group (BoltGroup): bolt group, the diameter column must be populated
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+        width (float): width of the compression block
+        y_top (float): user y-coordinate of the top edge of the bearing area
+        y_bottom (float): user y-coordinate of the bottom edge of the bearing
+                          area
+        tol (float): tolerance on the neutral axis as a fraction of the depth
+                     of the bearing area
+        max_iter (int): maximum number of bisection steps
+
+    Returns:
+        y_na (ndarray): (N,) user y-coordinate of the neutral axis, nan where
+                        no bolt is in tension or the stress is uniform
+        rz (ndarray): (N, num_bolts) axial reaction on each bolt
+
+    Raises:
+        ValueError: a bolt is outside of the bearing area
+    """
+    if y_bottom > group.y.min() or y_top < group.y.max():
+        raise ValueError('the bolts must be between y_bottom and y_top')
+
+    pz, mx, _ = _moments(group, points, loads)
+    _, y_cent = group.centroid
+    _, yc = group.local_coords
+    area = calc_bolt_area(group.diameter)
+
+    sign = np.where(mx < 0.0, -1.0, 1.0)
+    s = np.multiply.outer(sign, yc)
+    s_edge = np.where(sign > 0.0, y_bottom - y_cent, y_cent - y_top)
+
+    a, tension = solve_neutral_axis_batch(s, area, width, s_edge, pz,
+                                          np.abs(mx), tol, max_iter)
+
+    return y_cent + sign*a, -1*tension
+
+
+def calc_section_resultants(s, area, width, s_edge, a):
+    """Calculate the resultants of the stress distribution for a trial NA.
+
+    The stress is k*(s - a) in the bolts with s > a and in the compression
+    block between s_edge and a, and zero elsewhere. The resultants are given
+    per unit k.
+
+    n = sum(area*(s - a)) - width*t^2/2
+    m = sum(area*(s - a)*s) + width*(t^3/3 - a*t^2/2)
+
+    where t = a - s_edge is the depth of the compression block.
+
+    Args:
+        s (ndarray): (N, num_bolts) bolt coordinates of each load case
+        area (ndarray): area of each bolt
+        width (float): width of the compression block
+        s_edge (ndarray): (N,) compression edge of each load case
+        a (ndarray): (N,) trial neutral axis of each load case
+
+    Returns:
+        n (ndarray): (N,) axial resultant, tension positive
+        m (ndarray): (N,) moment resultant about the centroid
+    """
+    ten = np.maximum(s - a[:, np.newaxis], 0.0)*area
+    t = np.maximum(a - s_edge, 0.0)
+    t2 = t*t
+
+    n = ten.sum(axis=1) - width*t2/2
+    m = np.einsum('ij,ij->i', ten, s) + width*(t2*t/3 - a*t2/2)
+
+    return n, m
+
+
+def _bisect(func, lo, hi, xtol, max_iter):
+    """Bisect func(a, index) < 0 at lo and > 0 at hi for every load case."""
+    lo = lo.copy()
+    hi = hi.copy()
+    active = np.flatnonzero(hi - lo > xtol)
+    count = 0
+    while active.size and count < max_iter:
+        count += 1
+        mid = (lo[active] + hi[active])/2
+        below = func(mid, active) < 0.0
+        lo[active[below]] = mid[below]
+        hi[active[~below]] = mid[~below]
+        active = active[hi[active] - lo[active] > xtol[active]]
+
+    return (lo + hi)/2
+
+
+def solve_neutral_axis_batch(s, area, width, s_edge, n_force, moment,
+                             tol=1e-10, max_iter=100):
+    """Solve for the neutral axis and bolt tension of many load cases.
+
+    Every load case falls into one of three states:
+
+        elastic: the axial force is tension and large enough that the
+                 connected parts separate, all of the bolts take a linear
+                 stress distribution and there is no compression block
+        slack: no bolt is in tension
+        cracked: the neutral axis is between the compression edge and the
+                 last bolt
+
+    The neutral axis of a cracked case puts the resultant of the stresses on
+    the line of action of the load, h(a) = n_force*m(a) - moment*n(a) = 0,
+    with n(a) and m(a) from calc_section_resultants. The root a0 of n(a) = 0,
+    the neutral axis under pure moment, splits the search range: the root is
+    between s_edge and a0 for an axial tension and between a0 and the last
+    bolt for an axial compression. Both roots are found by bisection, which
+    needs only the signs of n and h and takes the same number of steps for
+    every load case.
+
+    Args:
+        s (ndarray): (N, num_bolts) bolt coordinates of each load case
+        area (ndarray): area of each bolt
+        width (float): width of the compression block
+        s_edge (ndarray): (N,) compression edge of each load case
+        n_force (ndarray): (N,) axial force, tension positive
+        moment (ndarray): (N,) moment, not negative
+        tol (float): tolerance on the neutral axis as a fraction of the depth
+                     s_max - s_edge
+        max_iter (int): maximum number of bisection steps
+
+    Returns:
+        a (ndarray): (N,) neutral axis, nan for slack and uniform stress cases
+        tension (ndarray): (N, num_bolts) tension in each bolt
+    """
+    s = np.asarray(s, dtype=float)
+    area = np.broadcast_to(np.asarray(area, dtype=float), s.shape[1:])
+    n_force = np.asarray(n_force, dtype=float)
+    moment = np.asarray(moment, dtype=float)
+    s_edge = np.broadcast_to(np.asarray(s_edge, dtype=float), n_force.shape)
+
+    a = np.full(n_force.shape, np.nan)
+    tension = np.zeros(s.shape)
+
+    # elastic, stress k*s - c over the bolts only
+    s0 = area.sum()
+    s1 = np.dot(s, area)
+    s2 = np.dot(s*s, area)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        det = s0*s2 - s1*s1
+        k = (moment*s0 - n_force*s1)/det
+        c = (s1*moment - s2*n_force)/det
+        elastic = (n_force > 0.0) & (k*s_edge - c >= 0.0)
+        uniform = elastic & (moment == 0.0)
+        k[uniform] = 0.0
+        c[uniform] = -1*n_force[uniform]/s0
+        tension[elastic] = area*(k[elastic, np.newaxis]*s[elastic] -
+                                 c[elastic, np.newaxis])
+        a[elastic & ~uniform] = (c/k)[elastic & ~uniform]
+
+    cracked = np.flatnonzero(~elastic & (moment > 0.0))
+    if not cracked.size:
+        return a, tension
+
+    c_s = s[cracked]
+    c_edge = s_edge[cracked]
+    c_n = n_force[cracked]
+    c_m = moment[cracked]
+    s_max = c_s.max(axis=1)
+    xtol = tol*(s_max - c_edge)
+
+    def n_res(trial, index):
+        return -1*calc_section_resultants(c_s[index], area, width,
+                                          c_edge[index], trial)[0]
+
+    def h_res(trial, index):
+        n, m = calc_section_resultants(c_s[index], area, width, c_edge[index],
+                                       trial)
+        return c_n[index]*m - c_m[index]*n
+
+    a0 = _bisect(n_res, c_edge, s_max, xtol, max_iter)
+
+    everything = np.arange(cracked.size)
+    compression = c_n < 0.0
+    slack = compression & (h_res(s_max, everything) <= 0.0)
+
+    lo = np.where(compression, a0, c_edge)
+    hi = np.where(compression, s_max, a0)
+    c_a = np.where(c_n == 0.0, a0, _bisect(h_res, lo, hi, xtol, max_iter))
+
+    _, m = calc_section_resultants(c_s, area, width, c_edge, c_a)
+    c_k = c_m/m
+    c_tension = area*c_k[:, np.newaxis]*np.maximum(c_s - c_a[:, np.newaxis],
+                                                   0.0)
+    c_a[slack] = np.nan
+    c_tension[slack] = 0.0
+
+    a[cracked] = c_a
+    tension[cracked] = c_tension
+
+    return a, tension
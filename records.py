@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""The records module provides compact Bolt and Force records that can be used
+in place of the bolt and force data structures of the demand module.
+
+The list based data structures hold each pair or triple of results in a nested
+list, roughly eight Python objects per bolt. Bolt and Force store every value
+in a __slots__ attribute of a single object instead and are accessed by name,
+for example bolt.dx instead of bolt[6][0].
+
+Both records also implement the index protocol of the data structure they
+replace, so they can be passed to the functions of the demand module without
+changes. Indexing a nested slot, for example bolt[6], returns a small view
+whose items read and write the attributes of the record; the view is created
+on access and is not stored.
+
+Going through the index protocol costs a view for every nested access, so the
+demand functions that loop over the bolts hand lists of Bolt records to the
+functions at the end of this module instead. They do the same arithmetic on
+the named attributes.
+
+Example:
+    bolts = bolts_from_legacy(legacy_bolts)
+    demand.calc_bolt_coords_wrt_centroid(bolts)
+    bolts[0].xc
+"""
+import math
+
+
+class _SlotView(object):
+    """Indexable view of a group of attributes of a record."""
+
+    __slots__ = ('_record', '_names')
+
+    def __init__(self, record, names):
+        self._record = record
+        self._names = names
+
+    def __getitem__(self, index):
+        return getattr(self._record, self._names[index])
+
+    def __setitem__(self, index, value):
+        setattr(self._record, self._names[index], value)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        for name in self._names:
+            yield getattr(self._record, name)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _Record(object):
+    """Base class mapping the legacy index protocol onto attributes.
+
+    Subclasses define _layout, one entry per index of the legacy data
+    structure. An entry is either an attribute name, for a scalar slot, or a
+    tuple of attribute names, for a nested slot. Nested slots listed in
+    _fixed are read as tuples, like the user input of the data structures,
+    the others are read as writable views.
+    """
+
+    __slots__ = ()
+    _layout = ()
+    _fixed = ()
+
+    def __getitem__(self, index):
+        names = self._layout[index]
+        if isinstance(names, tuple):
+            if index in self._fixed:
+                return tuple(getattr(self, name) for name in names)
+            return _SlotView(self, names)
+        return getattr(self, names)
+
+    def __setitem__(self, index, value):
+        names = self._layout[index]
+        if isinstance(names, tuple):
+            for name, item in zip(names, value):
+                setattr(self, name, item)
+        else:
+            setattr(self, names, value)
+
+    def __len__(self):
+        return len(self._layout)
+
+    def __iter__(self):
+        for index in range(len(self._layout)):
+            yield self[index]
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__,
+                           ', '.join('%s=%r' % (name, getattr(self, name))
+                                     for name in self.__slots__))
+
+    def to_legacy(self):
+        """Return a copy of the record as a legacy nested list."""
+        legacy = []
+        for index, names in enumerate(self._layout):
+            if isinstance(names, tuple):
+                values = [getattr(self, name) for name in names]
+                legacy.append(tuple(values) if index in self._fixed else values)
+            else:
+                legacy.append(getattr(self, names))
+        return legacy
+
+    @classmethod
+    def from_legacy(cls, legacy):
+        """Build a record from a legacy nested list.
+
+        Missing trailing slots, for example the result slots of a force that
+        were never allocated, are set to None.
+        """
+        record = cls.__new__(cls)
+        for name in record.__slots__:
+            setattr(record, name, None)
+        for index, value in enumerate(legacy):
+            record[index] = value
+        return record
+
+
+class Bolt(_Record):
+    """Bolt record equivalent to the bolt data structure of the demand module.
+
+    Args:
+        bolt_num (int): bolt number for user identification purposes
+        user_x (float): user entered x-coordinate of the bolt
+        user_y (float): user entered y-coordinate of the bolt
+        diameter (float): diameter of bolt
+
+    Notes:
+        The result attributes xc, yc, rsx, rsy, rex, rey, dx, dy, d, delta, r,
+        rux, and ruy start as None, see the demand module for definitions.
+    """
+
+    __slots__ = ('bolt_num', 'user_x', 'user_y', 'diameter', 'xc', 'yc', 'rsx',
+                 'rsy', 'rex', 'rey', 'dx', 'dy', 'd', 'delta', 'r', 'rux',
+                 'ruy')
+    _layout = ('bolt_num', ('user_x', 'user_y'), 'diameter', ('xc', 'yc'),
+               ('rsx', 'rsy'), ('rex', 'rey'), ('dx', 'dy'), 'd', 'delta', 'r',
+               ('rux', 'ruy'))
+    _fixed = (1,)
+
+    def __init__(self, bolt_num, user_x, user_y, diameter):
+        self.bolt_num = bolt_num
+        self.user_x = user_x
+        self.user_y = user_y
+        self.diameter = diameter
+        self.xc = self.yc = None
+        self.rsx = self.rsy = None
+        self.rex = self.rey = None
+        self.dx = self.dy = self.d = None
+        self.delta = self.r = None
+        self.rux = self.ruy = None
+
+
+class Force(_Record):
+    """Force record equivalent to the force data structure of the demand module.
+
+    Args:
+        user_x (float): user entered x-coordinate of the application point
+        user_y (float): user entered y-coordinate of the application point
+        user_z (float): user entered z-coordinate of the application point
+        px (float): force in the x-direction
+        py (float): force in the y-direction
+        pz (float): force in the z-direction
+
+    Notes:
+        The result attributes mx, my, mz, cx, cy, cz, ec, dx_f, dy_f, and r
+        start as None, see the demand module for definitions.
+    """
+
+    __slots__ = ('user_x', 'user_y', 'user_z', 'px', 'py', 'pz', 'mx', 'my',
+                 'mz', 'cx', 'cy', 'cz', 'ec', 'dx_f', 'dy_f', 'r')
+    _layout = (('user_x', 'user_y', 'user_z'), ('px', 'py', 'pz'),
+               ('mx', 'my', 'mz'), ('cx', 'cy', 'cz'), 'ec', ('dx_f', 'dy_f'),
+               'r')
+    _fixed = (0, 1)
+
+    def __init__(self, user_x, user_y, user_z, px, py, pz):
+        self.user_x = user_x
+        self.user_y = user_y
+        self.user_z = user_z
+        self.px = px
+        self.py = py
+        self.pz = pz
+        self.mx = self.my = self.mz = None
+        self.cx = self.cy = self.cz = None
+        self.ec = None
+        self.dx_f = self.dy_f = None
+        self.r = None
+
+
+def bolts_from_legacy(bolts):
+    """Convert a list of bolt data structures to a list of Bolt records."""
+    return [Bolt.from_legacy(bolt) for bolt in bolts]
+
+
+def bolts_to_legacy(bolts):
+    """Convert a list of Bolt records to a list of bolt data structures."""
+    return [bolt.to_legacy() for bolt in bolts]
+
+
+def shear(bolts, force):
+    """See demand.shear."""
+    num_bolts = len(bolts)
+    px, py = force[1][:2]
+    for bolt in bolts:
+        bolt.rsx = -px/num_bolts
+        bolt.rsy = -py/num_bolts
+
+
+def ecc_in_plane_elastic(bolts, force):
+    """See demand.ecc_in_plane_elastic."""
+    mz = force[2][2]
+    j = calc_j(bolts)
+    for bolt in bolts:
+        bolt.rex = mz*bolt.yc/j
+        bolt.rey = -1*mz*bolt.xc/j
+
+
+def calc_centroid(bolts):
+    """See demand.calc_centroid."""
+    sum_x = 0.0
+    sum_y = 0.0
+    for bolt in bolts:
+        sum_x = sum_x + bolt.user_x
+        sum_y = sum_y + bolt.user_y
+    return sum_x/len(bolts), sum_y/len(bolts)
+
+
+def calc_bolt_coords_wrt_centroid(bolts):
+    """See demand.calc_bolt_coords_wrt_centroid."""
+    x_cent, y_cent = calc_centroid(bolts)
+    for bolt in bolts:
+        bolt.xc = bolt.user_x - x_cent
+        bolt.yc = bolt.user_y - y_cent
+
+
+def calc_ixx(bolts):
+    """See demand.calc_ixx."""
+    sum_ixx = 0.0
+    for bolt in bolts:
+        sum_ixx = sum_ixx + math.pow(bolt.yc, 2)
+    return sum_ixx
+
+
+def calc_iyy(bolts):
+    """See demand.calc_iyy."""
+    sum_iyy = 0.0
+    for bolt in bolts:
+        sum_iyy = sum_iyy + math.pow(bolt.xc, 2)
+    return sum_iyy
+
+
+def calc_j(bolts):
+    """See demand.calc_j."""
+    return calc_ixx(bolts) + calc_iyy(bolts)
+
+
+def calc_bolt_reactions(bolts, rult):
+    """See demand.calc_bolt_reactions."""
+    for bolt in bolts:
+        d = bolt.d
+        if d == 0.0:
+            bolt.rux = 0.0
+            bolt.ruy = 0.0
+        else:
+            ri = rult*math.pow((1 - math.exp(-10*bolt.delta)), 0.55)
+            bolt.rux = -1*ri*bolt.dy/d
+            bolt.ruy = ri*bolt.dx/d
+
+
+def calc_bolt_fraction_reactions(bolts, mp, sum_m):
+    """See demand.calc_bolt_fraction_reactions, sum_m is the resisting moment
+    from demand.calc_moment_about_ic."""
+    sum_rux = 0.0
+    sum_ruy = 0.0
+    for bolt in bolts:
+        d = bolt.d
+        r = bolt.r
+        rult = -1*mp/sum_m
+        sum_rux = sum_rux + -1*bolt.dy/d*r*rult
+        sum_ruy = sum_ruy + bolt.dx/d*r*rult
+    return sum_rux, sum_ruy, sum_m
+
+
+def calc_moment_about_ic(bolts, model):
+    """See demand.calc_moment_about_ic, model is the active bolt model."""
+    sum_m = 0.0
+    d_max = calc_d_max(bolts)
+    deltas = [model.delta_max*bolt.d/d_max for bolt in bolts]
+    fractions = model.fraction(deltas).tolist()
+    for bolt, delta, ri_rult_ratio in zip(bolts, deltas, fractions):
+        sum_m = sum_m + ri_rult_ratio*bolt.d
+        bolt.delta = delta
+        bolt.r = ri_rult_ratio
+    return sum_m
+
+
+def calc_bolt_location_wrt_ic(bolts, x_ic, y_ic):
+    """See demand.calc_bolt_location_wrt_ic."""
+    for bolt in bolts:
+        dx = bolt.xc - x_ic
+        dy = bolt.yc - y_ic
+        bolt.dx = dx
+        bolt.dy = dy
+        bolt.d = math.sqrt(math.pow(dx, 2) + math.pow(dy, 2))
+
+
+def calc_d_max(bolts):
+    """See demand.calc_d_max."""
+    d_max = 0.0
+    for bolt in bolts:
+        if bolt.d > d_max:
+            d_max = bolt.d
+    return d_max
+
+
+def calc_sum_d_squared(bolts):
+    """See demand.calc_sum_d_squared."""
+    sum_d_squared = 0.0
+    for bolt in bolts:
+        sum_d_squared = sum_d_squared + math.pow(bolt.d, 2)
+    return sum_d_squared
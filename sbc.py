@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""cnxn command line interface, runs the connections of a job file.
+
+A job file lists connections, each a bolt group and a set of load cases. The
+bolt reactions of every connection are enveloped with the analysis module
+over a pool of worker processes and the envelope of each connection is
+written as soon as it is done, to stdout or to a file.
+
+Usage:
+    python -m cnxn run JOB [-o OUTPUT] [--format jsonl|csv] [--jobs N]
+    python -m cnxn workbooks XLSM [XLSM ...] -o SUMMARY [--jobs N]
+
+    or python sbc.py from the cnxn directory. Progress is reported on stderr
+    unless --quiet is given.
+
+Job files:
+    JSON: {"connections": [connection, ...]} or a list of connections where
+          each connection is an object with the keys
+
+              name: name of the connection, defaults to its position
+              bolts: [[x, y], ...] bolt coordinates or the name of a CSV
+                     file with x and y columns
+              diameter: bolt diameter, optional
+              loads: [[x, y, z, px, py, pz], ...] load cases or the name of
+                     a load file read with loads.read_loads
+              method: 'elastic' (default) or 'plastic'
+
+    CSV: one connection per row with the columns name, bolts, loads,
+         diameter and method, where bolts and loads are file names
+
+    File names are relative to the directory of the job file.
+
+Output:
+    jsonl: one JSON object per connection with the envelope of each bolt
+    csv: one row per bolt of each connection
+"""
+import argparse
+import collections
+import concurrent.futures
+import csv
+import json
+import os.path
+import sys
+import time
+
+import numpy as np
+
+import analysis
+import bolt_group
+import loads as loads_io
+import models
+import workbook
+
+
+CSV_COLUMNS = ('connection', 'bolt_num', 'max_rx', 'min_rx', 'max_ry',
+               'min_ry', 'max_r', 'max_r_case')
+
+
+class Job(collections.namedtuple('Job', ['name', 'group', 'loads',
+                                         'method'])):
+    """Connection of a job file.
+
+    name (str): name of the connection
+    group (BoltGroup): bolt group
+    loads (str or ndarray): name of a load file or (N, 6) load cases
+                            (x, y, z, px, py, pz)
+    method (str): 'elastic' or 'plastic'
+    """
+    __slots__ = ()
+
+
+def _path(base, name):
+    return name if os.path.isabs(name) else os.path.join(base, name)
+
+
+def read_bolts(path):
+    """Read bolt coordinates from a CSV file with x and y columns.
+
+    Args:
+        path (str): file name, an optional bolt_num column numbers the bolts
+
+    Returns:
+        x, y (list): bolt coordinates
+        bolt_num (list): bolt numbers, None if the file has no bolt_num column
+    """
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [name.strip().lower()
+                             for name in reader.fieldnames]
+        rows = list(reader)
+    try:
+        x = [float(row['x']) for row in rows]
+        y = [float(row['y']) for row in rows]
+    except KeyError as e:
+        raise ValueError('%s has no %s column' % (path, e.args[0]))
+    bolt_num = None
+    if rows and 'bolt_num' in rows[0]:
+        bolt_num = [int(row['bolt_num']) for row in rows]
+    return x, y, bolt_num
+
+
+def _job(entry, index, base):
+    """Build the Job of one connection of a job file."""
+    name = entry.get('name') or str(index)
+    bolts = entry.get('bolts')
+    if not bolts:
+        raise ValueError('connection %s has no bolts' % (name,))
+    if isinstance(bolts, str):
+        x, y, bolt_num = read_bolts(_path(base, bolts))
+    else:
+        x, y = zip(*[bolt[:2] for bolt in bolts])
+        bolt_num = None
+    diameter = entry.get('diameter') or None
+    group = bolt_group.BoltGroup(x, y, None if diameter is None else
+                                 float(diameter), bolt_num)
+
+    load_cases = entry.get('loads')
+    if not load_cases:
+        raise ValueError('connection %s has no loads' % (name,))
+    if isinstance(load_cases, str):
+        load_cases = _path(base, load_cases)
+    else:
+        load_cases = np.asarray(load_cases, dtype=float).reshape(-1, 6)
+
+    method = entry.get('method') or 'elastic'
+    if method not in analysis.METHODS:
+        raise ValueError('connection %s: method must be one of %s' %
+                         (name, analysis.METHODS))
+    return Job(name, group, load_cases, method)
+
+
+def read_job(path):
+    """Read the connections of a JSON or CSV job file.
+
+    Args:
+        path (str): file name, .json files are read as JSON and everything else
+                    as CSV
+
+    Returns:
+        jobs (list): Job of each connection in file order
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path) as f:
+            entries = json.load(f)
+        if isinstance(entries, dict):
+            entries = entries.get('connections', [])
+    else:
+        with open(path, newline='') as f:
+            reader = csv.DictReader(f)
+            reader.fieldnames = [name.strip().lower()
+                                 for name in reader.fieldnames]
+            entries = list(reader)
+
+    return [_job(entry, i, base) for i, entry in enumerate(entries)]
+
+
+def run_job(job, chunk_size=65536):
+    """Envelope the bolt reactions of one connection.
+
+    Args:
+        job (Job): connection
+        chunk_size (int): maximum number of load cases held in memory
+
+    Returns:
+        name (str): name of the connection
+        envelope (Envelope): envelope of the bolt reactions
+    """
+    if isinstance(job.loads, str):
+        chunks = loads_io.read_loads(job.loads, chunk_size)
+    else:
+        chunks = ((job.loads[i:i + chunk_size, :3],
+                   job.loads[i:i + chunk_size, 3:])
+                  for i in range(0, job.loads.shape[0], chunk_size))
+    return job.name, analysis.envelope_stream(job.group, chunks, job.method)
+
+
+def _run_task(task):
+    """Run one connection in a worker."""
+    return run_job(*task)
+
+
+def run(jobs, max_workers=None, chunk_size=65536):
+    """Run many connections over a pool of processes.
+
+    Args:
+        jobs (sequence): Job of each connection
+        max_workers (int): number of worker processes, 0 or 1 runs in the
+                           calling process, None uses one per CPU
+        chunk_size (int): maximum number of load cases held in memory by each
+                          worker
+
+    Yields:
+        job (Job): connection
+        envelope (Envelope): envelope of the connection, in job order
+    """
+    tasks = [(job, chunk_size) for job in jobs]
+    if max_workers is not None and max_workers <= 1:
+        for job, task in zip(jobs, tasks):
+            yield job, _run_task(task)[1]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers, initializer=models.init_worker,
+                initargs=(models.active,)) as executor:
+            for job, (_, envelope) in zip(jobs, executor.map(_run_task,
+                                                             tasks)):
+                yield job, envelope
+
+
+def envelope_rows(job, envelope):
+    """Return the CSV rows of the envelope of a connection, see CSV_COLUMNS."""
+    return [(job.name, job.group.bolt_num[i].item(),
+             envelope.max_rx[i].item(), envelope.min_rx[i].item(),
+             envelope.max_ry[i].item(), envelope.min_ry[i].item(),
+             envelope.max_r[i].item(), envelope.max_r_case[i].item())
+            for i in range(len(job.group))]
+
+
+def envelope_record(job, envelope):
+    """Return the JSON object of the envelope of a connection.
+
+    Extremes that are not finite, a bolt none of whose load cases converged,
+    are written as null so the output stays valid JSON.
+    """
+    record = collections.OrderedDict()
+    record['connection'] = job.name
+    record['method'] = job.method
+    record['num_cases'] = envelope.num_cases
+    record['num_failed'] = envelope.num_failed
+    record['bolt_num'] = job.group.bolt_num.tolist()
+    for name in CSV_COLUMNS[2:]:
+        values = getattr(envelope, name)
+        record[name] = [value if np.isfinite(value) else None
+                        for value in values.tolist()]
+    return record
+
+
+class Progress(object):
+    """Report the number of finished connections on a stream.
+
+    Args:
+        total (int): number of connections
+        stream (file): stream the progress is written to, None is silent
+    """
+
+    def __init__(self, total, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.done = 0
+        self.start = time.time()
+
+    def update(self, job, envelope):
+        self.done += 1
+        if self.stream is not None:
+            failed = ''
+            if envelope.num_failed:
+                failed = ' (%d did not converge)' % envelope.num_failed
+            self.stream.write('[%d/%d] %s: %d load cases%s, %.1fs\n' %
+                              (self.done, self.total, job.name,
+                               envelope.num_cases, failed,
+                               time.time() - self.start))
+            self.stream.flush()
+
+
+def write_results(results, stream, fmt='jsonl', progress=None):
+    """Write the envelopes of the connections as they are finished.
+
+    Args:
+        results (iterable): (job, envelope) of each connection, see run
+        stream (file): output stream
+        fmt (str): 'jsonl' or 'csv'
+        progress (Progress): progress report, optional
+
+    Returns:
+        count (int): number of connections written
+    """
+    writer = None
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(CSV_COLUMNS)
+
+    count = 0
+    for job, envelope in results:
+        if writer is not None:
+            writer.writerows(envelope_rows(job, envelope))
+        else:
+            stream.write(json.dumps(envelope_record(job, envelope)) + '\n')
+        stream.flush()
+        count += 1
+        if progress is not None:
+            progress.update(job, envelope)
+    return count
+
+
+def _run_command(args):
+    jobs = read_job(args.job)
+    progress = Progress(len(jobs), None if args.quiet else sys.stderr)
+    results = run(jobs, args.jobs, args.chunk_size)
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            write_results(results, f, args.format, progress)
+    else:
+        write_results(results, sys.stdout, args.format, progress)
+    return 0
+
+
+def _workbooks_command(args):
+    progress = None if args.quiet else sys.stderr
+    count = workbook.write_summary(
+        workbook.check_workbooks(args.workbooks, args.jobs), args.output)
+    if progress is not None:
+        progress.write('%d workbooks written to %s\n' % (count, args.output))
+    return 0
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--jobs', '-j', type=int, default=None,
+                        help='number of worker processes, 1 runs serially, '
+                             'defaults to one per CPU')
+    common.add_argument('--quiet', '-q', action='store_true',
+                        help='do not report progress on stderr')
+
+    parser = argparse.ArgumentParser(prog='cnxn',
+                                     description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', parents=[common],
+                                     help='run the connections of a job file')
+    run_parser.add_argument('job', help='JSON or CSV job file')
+    run_parser.add_argument('-o', '--output',
+                            help='output file, defaults to stdout')
+    run_parser.add_argument('--format', choices=('jsonl', 'csv'),
+                            default='jsonl')
+    run_parser.add_argument('--chunk-size', type=int, default=65536,
+                            help='load cases held in memory per worker')
+    run_parser.set_defaults(func=_run_command)
+
+    wb_parser = commands.add_parser('workbooks', parents=[common],
+                                    help='check copies of '
+                                         'ConnectionCheck_Elastic.xlsm')
+    wb_parser.add_argument('workbooks', nargs='+', help='xlsm files')
+    wb_parser.add_argument('-o', '--output', required=True,
+                           help='CSV summary file')
+    wb_parser.set_defaults(func=_workbooks_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""The spatial module answers farthest bolt queries from the convex hull of a
+bolt group.
+
+The bolt farthest from any point, in particular from a trial IC, is a vertex of
+the convex hull of the bolt group. Large bolt fields such as splice plates and
+anchor rod groups have thousands of bolts but only a handful of hull vertices,
+four for a rectangular pattern, so d_max is found by checking the hull
+vertices instead of every bolt. The hull is built once per bolt pattern in
+O(n log n) with Andrew's monotone chain algorithm.
+
+Notes:
+    BoltGroup.index holds the BoltIndex of a bolt group, built on first use
+    and memoized with the other section properties.
+
+    The hull only saves work when the distances to the other bolts are not
+    needed. The IC iterations compute the distance to every bolt for the
+    force fractions anyway, so bolt_group.calc_d_max takes the maximum of
+    those distances instead of querying the hull.
+"""
+import math
+
+import numpy as np
+
+
+def convex_hull(x, y):
+    """Return the indices of the vertices of the convex hull of the points.
+
+    Args:
+        x (array like): x-coordinate of each point
+        y (array like): y-coordinate of each point
+
+    Returns:
+        hull (ndarray): indices of the hull vertices in counterclockwise order,
+                        points on the edges of the hull are left out
+
+    Notes:
+        Duplicate points are reported once. Two points are returned when every
+        point is on a line and one when every point is the same.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    order = np.lexsort((y, x))
+    points = list(zip(x[order].tolist(), y[order].tolist(), order.tolist()))
+
+    unique = []
+    for point in points:
+        if not unique or point[:2] != unique[-1][:2]:
+            unique.append(point)
+    if len(unique) < 3:
+        return np.array([p[2] for p in unique], dtype=int)
+
+    def cross(o, a, b):
+        return (a[0] - o[0])*(b[1] - o[1]) - (a[1] - o[1])*(b[0] - o[0])
+
+    lower = []
+    for point in unique:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0.0:
+            lower.pop()
+        lower.append(point)
+
+    upper = []
+    for point in reversed(unique):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0.0:
+            upper.pop()
+        upper.append(point)
+
+    return np.array([p[2] for p in lower[:-1] + upper[:-1]], dtype=int)
+
+
+class BoltIndex(object):
+    """Convex hull index of a bolt pattern for farthest bolt queries.
+
+    Args:
+        x (array like): x-coordinate of each bolt
+        y (array like): y-coordinate of each bolt
+
+    Attributes:
+        hull (ndarray): indices of the bolts on the convex hull
+        hull_x, hull_y (ndarray): coordinates of the hull vertices
+    """
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.hull = convex_hull(self.x, self.y)
+        self.hull_x = self.x[self.hull]
+        self.hull_y = self.y[self.hull]
+        self._hull_points = list(zip(self.hull.tolist(), self.hull_x.tolist(),
+                                     self.hull_y.tolist()))
+
+    def __len__(self):
+        return self.x.shape[0]
+
+    def farthest(self, x0, y0):
+        """Find the bolt farthest from a point or from each of many points.
+
+        Args:
+            x0 (float or ndarray): x-coordinate of the point(s)
+            y0 (float or ndarray): y-coordinate of the point(s)
+
+        Returns:
+            index (int or ndarray): index of the farthest bolt
+            d_max (float or ndarray): distance to the farthest bolt
+        """
+        if np.ndim(x0) == 0 and np.ndim(y0) == 0:
+            # a plain loop beats array overhead for the few hull vertices
+            x0 = float(x0)
+            y0 = float(y0)
+            index, d_max = -1, -1.0
+            for i, x, y in self._hull_points:
+                d = math.hypot(x - x0, y - y0)
+                if d > d_max:
+                    index, d_max = i, d
+            return index, d_max
+
+        x0 = np.asarray(x0, dtype=float)
+        y0 = np.asarray(y0, dtype=float)
+        d = np.hypot(self.hull_x - x0[..., np.newaxis],
+                     self.hull_y - y0[..., np.newaxis])
+        vertex = d.argmax(axis=-1)
+        d_max = np.take_along_axis(d, vertex[..., np.newaxis], axis=-1)[..., 0]
+        return self.hull[vertex], d_max
+
+    def d_max(self, x0, y0):
+        """Return the distance from a point, or many points, to the farthest
+        bolt."""
+        return self.farthest(x0, y0)[1]
+
+    def distances(self, x0, y0, out=None):
+        """Calculate the position of every bolt with respect to a point.
+
+        Args:
+            x0 (float): x-coordinate of the point
+            y0 (float): y-coordinate of the point
+            out (tuple): (dx, dy, d) arrays of length num_bolts to write the
+                         result into, so an iteration can reuse one set of
+                         arrays
+
+        Returns:
+            dx, dy, d (ndarray): bolt coordinates with respect to the point and
+                                 the distance to the point
+        """
+        if out is None:
+            out = (np.empty(len(self)), np.empty(len(self)),
+                   np.empty(len(self)))
+        dx, dy, d = out
+        np.subtract(self.x, x0, out=dx)
+        np.subtract(self.y, y0, out=dy)
+        np.hypot(dx, dy, out=d)
+        return dx, dy, d
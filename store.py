@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""The store module saves bolt reaction tensors to disk in chunks and reads
+them back through memory maps.
+
+The reactions of N load cases on n bolts are an (N, n, k) array with k = 2
+shear components or k = 3 components including the axial reaction. For 10^5
+load cases and 10^3 bolts that is more than a gigabyte, so the store is
+written one chunk of load cases at a time and read back without loading it
+into memory.
+
+Store layout:
+    A directory holding
+
+        manifest.json: number of bolts and components, dtype, bolt numbers
+                       and the file name, first load case and number of load
+                       cases of each chunk
+        chunk_00000.npy, ...: (n, Nc, k) reactions of Nc consecutive load
+                              cases, stored bolt major
+
+    Storing each chunk bolt major keeps the history of one bolt contiguous on
+    disk, so ReactionStore.bolt reads only the bytes of that bolt.
+
+Notes:
+    The manifest is written last, when the writer is closed. A directory
+    without a manifest is an incomplete store.
+"""
+import json
+import os
+import os.path
+
+import numpy as np
+
+import analysis
+
+
+FORMAT = 'cnxn-reactions'
+VERSION = 1
+MANIFEST = 'manifest.json'
+
+
+class ReactionWriter(object):
+    """Write bolt reactions to a store one block of load cases at a time.
+
+    Args:
+        path (str): directory of the store, created if missing
+        num_bolts (int): number of bolts
+        components (int): number of reaction components, 2 or 3
+        chunk_size (int): number of load cases per chunk file
+        dtype (str): dtype of the stored reactions
+        bolt_num (array like): bolt number of each bolt, defaults to 1..n
+        overwrite (bool): replace an existing store in the directory
+
+    Raises:
+        ValueError: the directory holds a store and overwrite is False
+
+    Notes:
+        Use the writer as a context manager or call close to write the
+        manifest.
+    """
+
+    def __init__(self, path, num_bolts, components=2, chunk_size=65536,
+                 dtype='float64', bolt_num=None, overwrite=False):
+        if components not in (2, 3):
+            raise ValueError('components must be 2 or 3')
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            if not overwrite:
+                raise ValueError('%s already holds a reaction store' % (path,))
+            _remove_store(path)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        if bolt_num is None:
+            bolt_num = np.arange(1, num_bolts + 1)
+
+        self.path = path
+        self.num_bolts = num_bolts
+        self.components = components
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype)
+        self.bolt_num = np.asarray(bolt_num).tolist()
+        self.num_cases = 0
+        self.chunks = []
+        self._buffer = []
+        self._buffered = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def append(self, reactions):
+        """Add the reactions of a block of load cases.
+
+        Args:
+            reactions (array like): (N, num_bolts, components) reactions
+
+        Returns:
+            None
+        """
+        if self.closed:
+            raise ValueError('the writer is closed')
+        reactions = np.asarray(reactions, dtype=self.dtype)
+        if reactions.shape[1:] != (self.num_bolts, self.components):
+            raise ValueError('reactions must have the shape (N, %d, %d)' %
+                             (self.num_bolts, self.components))
+
+        self._buffer.append(reactions)
+        self._buffered += reactions.shape[0]
+        while self._buffered >= self.chunk_size:
+            self._flush(self.chunk_size)
+
+    def _flush(self, count):
+        """Write the first count buffered load cases to a chunk file."""
+        block = np.concatenate(self._buffer) if len(self._buffer) > 1 \
+            else self._buffer[0]
+        self._buffer = [block[count:]] if block.shape[0] > count else []
+        self._buffered = block.shape[0] - count
+
+        name = 'chunk_%05d.npy' % len(self.chunks)
+        np.save(os.path.join(self.path, name),
+                np.ascontiguousarray(block[:count].transpose(1, 0, 2)))
+        self.chunks.append({'file': name, 'first_case': self.num_cases,
+                            'num_cases': count})
+        self.num_cases += count
+
+    def close(self):
+        """Write the remaining load cases and the manifest."""
+        if self.closed:
+            return
+        if self._buffered:
+            self._flush(self._buffered)
+
+        manifest = {'format': FORMAT, 'version': VERSION,
+                    'num_cases': self.num_cases, 'num_bolts': self.num_bolts,
+                    'components': self.components, 'dtype': self.dtype.str,
+                    'bolt_num': self.bolt_num, 'chunks': self.chunks}
+        temp = os.path.join(self.path, MANIFEST + '.tmp')
+        with open(temp, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(temp, os.path.join(self.path, MANIFEST))
+        self.closed = True
+
+
+def _remove_store(path):
+    """Remove the manifest and the chunk files of a store."""
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    os.remove(os.path.join(path, MANIFEST))
+    for chunk in manifest['chunks']:
+        chunk_path = os.path.join(path, chunk['file'])
+        if os.path.exists(chunk_path):
+            os.remove(chunk_path)
+
+
+class ReactionStore(object):
+    """Memory mapped reader of a reaction store.
+
+    Args:
+        path (str): directory of the store
+
+    Attributes:
+        num_cases (int): number of load cases
+        num_bolts (int): number of bolts
+        components (int): number of reaction components
+        bolt_num (ndarray): bolt number of each bolt
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != FORMAT:
+            raise ValueError('%s is not a reaction store' % (path,))
+        if manifest.get('version', 0) > VERSION:
+            raise ValueError('%s was written by a newer version' % (path,))
+
+        self.path = path
+        self.num_cases = manifest['num_cases']
+        self.num_bolts = manifest['num_bolts']
+        self.components = manifest['components']
+        self.dtype = np.dtype(manifest['dtype'])
+        self.bolt_num = np.array(manifest['bolt_num'])
+        self._chunks = manifest['chunks']
+        self._starts = np.array([chunk['first_case']
+                                 for chunk in self._chunks], dtype=int)
+        self._maps = [None]*len(self._chunks)
+
+    def __len__(self):
+        return self.num_cases
+
+    @property
+    def shape(self):
+        """(num_cases, num_bolts, components) of the stored reactions."""
+        return (self.num_cases, self.num_bolts, self.components)
+
+    def _map(self, i):
+        """Return the memory map of chunk i, opened on first use."""
+        if self._maps[i] is None:
+            self._maps[i] = np.load(os.path.join(self.path,
+                                                 self._chunks[i]['file']),
+                                    mmap_mode='r')
+        return self._maps[i]
+
+    def bolt(self, index):
+        """Read the reactions of one bolt for every load case.
+
+        Args:
+            index (int): position of the bolt, see bolt_num
+
+        Returns:
+            reactions (ndarray): (num_cases, components) reactions of the bolt
+        """
+        out = np.empty((self.num_cases, self.components), dtype=self.dtype)
+        for i, chunk in enumerate(self._chunks):
+            start = chunk['first_case']
+            out[start:start + chunk['num_cases']] = self._map(i)[index]
+        return out
+
+    def cases(self, start=0, stop=None):
+        """Read the reactions of a range of load cases.
+
+        Args:
+            start (int): first load case
+            stop (int): load case after the last one, defaults to the end
+
+        Returns:
+            reactions (ndarray): (stop - start, num_bolts, components)
+        """
+        start, stop, _ = slice(start, stop).indices(self.num_cases)
+        stop = max(start, stop)
+        out = np.empty((stop - start, self.num_bolts, self.components),
+                       dtype=self.dtype)
+        first = max(int(np.searchsorted(self._starts, start, 'right')) - 1, 0)
+        for i in range(first, len(self._chunks)):
+            chunk = self._chunks[i]
+            lo = max(start, chunk['first_case'])
+            hi = min(stop, chunk['first_case'] + chunk['num_cases'])
+            if lo >= hi:
+                break
+            offset = chunk['first_case']
+            out[lo - start:hi - start] = \
+                self._map(i)[:, lo - offset:hi - offset].transpose(1, 0, 2)
+        return out
+
+    def iter_chunks(self):
+        """Iterate over the stored chunks in load case order.
+
+        Yields:
+            first_case (int): index of the first load case of the chunk
+            reactions (ndarray): (Nc, num_bolts, components) memory mapped
+                                 view of the chunk
+        """
+        for i, chunk in enumerate(self._chunks):
+            yield chunk['first_case'], self._map(i).transpose(1, 0, 2)
+
+    def envelope(self):
+        """Envelope the stored reactions one chunk at a time.
+
+        Returns:
+            envelope (analysis.Envelope): envelope of the shear reactions
+        """
+        envelope = analysis.Envelope(self.num_bolts)
+        for first_case, reactions in self.iter_chunks():
+            envelope.update(reactions, first_case)
+        return envelope
+
+
+def save_reactions(path, group, chunks, method='elastic', chunk_size=65536,
+                   overwrite=False):
+    """Calculate the bolt reactions of a stream of load cases into a store.
+
+    Args:
+        path (str): directory of the store
+        group (BoltGroup): bolt group
+        chunks (iterable): (points, loads) chunks of load cases, for example
+                           from loads.read_loads
+        method (str): 'elastic' or 'plastic', see analysis.calc_reactions
+        chunk_size (int): number of load cases per chunk file
+        overwrite (bool): replace an existing store in the directory
+
+    Returns:
+        store (ReactionStore): reader of the written store
+    """
+    with ReactionWriter(path, len(group), 2, chunk_size,
+                        bolt_num=group.bolt_num,
+                        overwrite=overwrite) as writer:
+        for points, loads in chunks:
+            writer.append(analysis.calc_reactions(group, points, loads,
+                                                  method))
+    return ReactionStore(path)
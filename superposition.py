@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""The superposition module evaluates elastic bolt reactions of load
+combinations by superposing unit load results.
+
+The elastic method is linear in the resultant (Px, Py, Mz) of a force about
+the centroid of the bolt group. The reactions of each bolt for a unit Px, a
+unit Py and a unit Mz, the influence coefficients, are calculated once per bolt
+pattern. The reactions of any force are then the resultant times the
+coefficients, and the reactions of a factored load combination are the
+combination factors times the resultants of the load cases times the
+coefficients. Every combination and every load case is evaluated with matrix
+multiplies instead of repeating the elastic calculation for each one.
+
+Definitions:
+    actions (ndarray): (N, 3) resultants (Px, Py, Mz) about the centroid of
+                       the bolt group, mz = py*cx - px*cy
+    coefficients (ndarray): (3, num_bolts, 2) reactions (Rx, Ry) of each bolt
+                            due to a unit Px, Py and Mz
+    factors (ndarray): (K, M) load factor of each of M load cases in each of K
+                       load combinations
+
+Notes:
+    Only the in plane reactions are superposed, the same reactions as
+    analysis.calc_elastic_reactions. The plastic (IC) method is not linear and
+    can not be superposed.
+
+    A bolt pattern with j = 0, a single bolt, has no Mz coefficients and
+    superpose raises ValueError for actions with a moment, like
+    bolt_group.elastic_reactions_batch.
+"""
+import numpy as np
+
+import out_plane
+
+
+def influence_coefficients(group):
+    """Calculate the elastic reactions of each bolt for unit actions.
+
+    Px = 1: rx = -1/n, ry = 0
+    Py = 1: rx = 0, ry = -1/n
+    Mz = 1: rx = local_yb/j, ry = -1*local_xb/j
+
+    Args:
+        group (BoltGroup): bolt group
+
+    Returns:
+        coefficients (ndarray): (3, num_bolts, 2) reactions due to a unit Px,
+                                Py and Mz about the centroid, the Mz
+                                coefficients are 0 when j = 0
+    """
+    num_bolts = len(group)
+    xc, yc = group.local_coords
+
+    coefficients = np.zeros((3, num_bolts, 2))
+    coefficients[0, :, 0] = -1.0/num_bolts
+    coefficients[1, :, 1] = -1.0/num_bolts
+    # j = 0 only when every bolt is at the centroid, xc = yc = 0
+    coefficients[2, :, 0] = out_plane.divide_moment(yc, group.j, 'j')
+    coefficients[2, :, 1] = -1*out_plane.divide_moment(xc, group.j, 'j')
+
+    return coefficients
+
+
+def calc_actions(group, points, loads):
+    """Reduce forces to their resultants about the centroid of the bolt group.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (N, 3) user coordinates of the application points
+        loads (array like): (N, 3) force components (Px, Py, Pz)
+
+    Returns:
+        actions (ndarray): (N, 3) resultants (Px, Py, Mz)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    loads = np.asarray(loads, dtype=float).reshape(-1, 3)
+    if points.shape[0] != loads.shape[0]:
+        raise ValueError('points and loads must have the same number of rows')
+
+    x_cent, y_cent = group.centroid
+    cx = points[:, 0] - x_cent
+    cy = points[:, 1] - y_cent
+
+    actions = np.empty((points.shape[0], 3))
+    actions[:, 0] = loads[:, 0]
+    actions[:, 1] = loads[:, 1]
+    actions[:, 2] = loads[:, 1]*cx - loads[:, 0]*cy
+
+    return actions
+
+
+def superpose(coefficients, actions):
+    """Calculate the reactions of many actions from the influence coefficients.
+
+    Args:
+        coefficients (ndarray): (3, num_bolts, 2) influence coefficients
+        actions (array like): (N, 3) resultants (Px, Py, Mz)
+
+    Returns:
+        reactions (ndarray): (N, num_bolts, 2) bolt reactions
+
+    Raises:
+        ValueError: the coefficients are of a bolt pattern with j = 0 and an
+                    action has a moment Mz, see out_plane.divide_moment
+    """
+    actions = np.asarray(actions, dtype=float).reshape(-1, 3)
+    num_bolts = coefficients.shape[1]
+    if not coefficients[2].any():
+        # no Mz coefficients, the bolt pattern has j = 0
+        out_plane.divide_moment(actions[:, 2], 0.0, 'j')
+    reactions = np.dot(actions, coefficients.reshape(3, -1))
+    return reactions.reshape(-1, num_bolts, 2)
+
+
+def combine(factors, actions):
+    """Calculate the resultants of load combinations of the load cases.
+
+    Args:
+        factors (array like): (K, M) load factors, see the module docstring
+        actions (array like): (M, 3) resultants of the load cases
+
+    Returns:
+        actions (ndarray): (K, 3) resultants of the load combinations
+    """
+    factors = np.atleast_2d(np.asarray(factors, dtype=float))
+    actions = np.asarray(actions, dtype=float).reshape(-1, 3)
+    if factors.shape[1] != actions.shape[0]:
+        raise ValueError('factors must have one column per load case')
+    return np.dot(factors, actions)
+
+
+def calc_combination_reactions(group, points, loads, factors):
+    """Calculate the elastic bolt reactions of factored load combinations.
+
+    Args:
+        group (BoltGroup): bolt group
+        points (array like): (M, 3) user coordinates of the application points
+                             of the load cases
+        loads (array like): (M, 3) force components of the load cases
+        factors (array like): (K, M) load factors
+
+    Returns:
+        reactions (ndarray): (K, num_bolts, 2) bolt reactions of each load
+                             combination
+
+    Raises:
+        ValueError: the bolt pattern has j = 0 and a combination has a moment
+                    Mz, see superpose
+    """
+    actions = combine(factors, calc_actions(group, points, loads))
+    return superpose(influence_coefficients(group), actions)
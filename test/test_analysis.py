@@ -0,0 +1,151 @@
+import demand
+import bolt_group
+import ic_solver
+import analysis
+import unittest
+import numpy as np
+
+class TestAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                          [0.0, 3.0, 6.0, 0.0, 3.0, 6.0], 1.0)
+        self.points = np.array([(23.0, 8.0, 0.0), (4.0, 0.0, 0.0),
+                                (3.0, 3.0, 0.0), (-10.0, 1.0, 0.0),
+                                (3.0, 20.0, 0.0)])
+        self.loads = np.array([(0.6, -0.8, 0.0), (0.0, -1.0, 0.0),
+                               (2.0, -1.0, 0.0), (-3.0, 4.0, 0.0),
+                               (10.0, 0.0, 0.0)])
+
+    def tearDown(self):
+        del self.group
+        del self.points
+        del self.loads
+
+    def test_calc_elastic_reactions(self):
+        reactions = analysis.calc_elastic_reactions(self.group, self.points,
+                                                    self.loads)
+
+        bolts = self.group.to_bolts()
+        demand.calc_bolt_coords_wrt_centroid(bolts)
+        for i, (point, load) in enumerate(zip(self.points, self.loads)):
+            force = [tuple(point.tolist()), tuple(load.tolist()),
+                     [None, None, None], [None, None, None], None,
+                     [None, None], None]
+            demand.calc_force_coords_wrt_centroid(bolts, force)
+            demand.calc_moments_about_centroid(force)
+            demand.shear(bolts, force)
+            demand.ecc_in_plane_elastic(bolts, force)
+            for bolt, reaction in zip(bolts, reactions[i]):
+                self.assertAlmostEqual(bolt[4][0] + bolt[5][0], reaction[0])
+                self.assertAlmostEqual(bolt[4][1] + bolt[5][1], reaction[1])
+
+    def test_calc_elastic_reactions_single_bolt(self):
+        single = bolt_group.BoltGroup([0.0], [0.0])
+        envelope = analysis.Envelope(1)
+        envelope.update(analysis.calc_elastic_reactions(
+            single, [(0.0, 0.0, 0.0)], [(0.0, -10.0, 0.0)]))
+        self.assertEqual(envelope.max_r.tolist(), [10.0])
+        self.assertEqual(envelope.num_failed, 0)
+
+        # j = 0, the moment is an error rather than a failed load case
+        with self.assertRaises(ValueError):
+            analysis.calc_elastic_reactions(single, [(5.0, 0.0, 0.0)],
+                                            [(0.0, -10.0, 0.0)])
+
+    def test_calc_plastic_reactions(self):
+        reactions = analysis.calc_plastic_reactions(self.group, self.points,
+                                                    self.loads)
+
+        for i in (0, 1, 3, 4):
+            ic_solver.solve_ic(self.group, [self.points[i], self.loads[i]])
+            for j in range(len(self.group)):
+                self.assertAlmostEqual(reactions[i, j, 0], self.group.rux[j],
+                                       places=6)
+                self.assertAlmostEqual(reactions[i, j, 1], self.group.ruy[j],
+                                       places=6)
+
+        # concentric load case shares the load equally
+        for reaction in reactions[2]:
+            self.assertAlmostEqual(reaction[0], -2.0/6)
+            self.assertAlmostEqual(reaction[1], 1.0/6)
+
+    def test_envelope(self):
+        reactions = analysis.calc_elastic_reactions(self.group, self.points,
+                                                    self.loads)
+        envelope = analysis.Envelope(6)
+        envelope.update(reactions[:2])
+        envelope.update(reactions[2:])
+
+        r = np.hypot(reactions[:, :, 0], reactions[:, :, 1])
+        self.assertEqual(envelope.num_cases, 5)
+        self.assertEqual(envelope.max_rx.tolist(),
+                         reactions[:, :, 0].max(axis=0).tolist())
+        self.assertEqual(envelope.min_ry.tolist(),
+                         reactions[:, :, 1].min(axis=0).tolist())
+        self.assertEqual(envelope.max_r.tolist(), r.max(axis=0).tolist())
+        self.assertEqual(envelope.max_r_case.tolist(),
+                         r.argmax(axis=0).tolist())
+
+    def test_envelope_failed_case(self):
+        reactions = analysis.calc_elastic_reactions(self.group, self.points,
+                                                    self.loads)
+        reactions[1] = np.nan
+        envelope = analysis.Envelope(6)
+        envelope.update(reactions[:2])
+        other = analysis.Envelope(6)
+        other.update(reactions[2:], 2)
+        envelope.merge(other)
+
+        valid = reactions[[0, 2, 3, 4]]
+        r = np.hypot(valid[:, :, 0], valid[:, :, 1])
+        self.assertEqual(envelope.num_cases, 5)
+        self.assertEqual(envelope.num_failed, 1)
+        self.assertEqual(envelope.max_rx.tolist(),
+                         valid[:, :, 0].max(axis=0).tolist())
+        self.assertEqual(envelope.min_rx.tolist(),
+                         valid[:, :, 0].min(axis=0).tolist())
+        self.assertEqual(envelope.max_r.tolist(), r.max(axis=0).tolist())
+        self.assertNotIn(1, envelope.max_r_case.tolist())
+
+    def test_calc_reactions_kwargs(self):
+        reactions = analysis.calc_reactions(self.group, self.points,
+                                            self.loads, 'plastic', max_iter=1)
+
+        # one Newton iteration does not converge the eccentric load cases
+        self.assertTrue(np.isnan(reactions[0]).all())
+        self.assertFalse(np.isnan(reactions[2]).any())
+
+    def check_envelopes(self, envelopes, connections, method):
+        self.assertEqual(len(envelopes), len(connections))
+        for envelope, (group, points, loads) in zip(envelopes, connections):
+            reactions = analysis.calc_reactions(group, points, loads, method)
+            r = np.hypot(reactions[:, :, 0], reactions[:, :, 1])
+            self.assertEqual(envelope.num_cases, len(points))
+            np.testing.assert_allclose(envelope.max_rx,
+                                       reactions[:, :, 0].max(axis=0))
+            np.testing.assert_allclose(envelope.min_rx,
+                                       reactions[:, :, 0].min(axis=0))
+            np.testing.assert_allclose(envelope.max_r, r.max(axis=0))
+            self.assertEqual(envelope.max_r_case.tolist(),
+                             r.argmax(axis=0).tolist())
+
+    def test_envelope_bolt_forces(self):
+        group2 = bolt_group.BoltGroup([0.0, 3.0, 6.0], [0.0, 0.0, 0.0])
+        connections = [(self.group, self.points, self.loads),
+                       (group2, self.points[::-1], self.loads[::-1])]
+
+        for method in analysis.METHODS:
+            serial = analysis.envelope_bolt_forces(connections, method,
+                                                   max_workers=1,
+                                                   chunk_size=2)
+            self.check_envelopes(serial, connections, method)
+
+        parallel = analysis.envelope_bolt_forces(connections, 'elastic',
+                                                 max_workers=2, chunk_size=2,
+                                                 tasks_per_submit=2)
+        self.check_envelopes(parallel, connections, 'elastic')
+
+    def test_envelope_bolt_forces_method(self):
+        with self.assertRaises(ValueError):
+            analysis.envelope_bolt_forces([], 'rigid')
@@ -2,6 +2,8 @@ import demand
 import unittest
 import pdb
 import os.path
+import subprocess
+import sys
 
 class TestDemandElasticInPlane(unittest.TestCase):
     def setUp(self):
@@ -41,3 +43,15 @@ class TestDemandElasticInPlane(unittest.TestCase):
             ry = bolt[4][1]
             self.assertEqual(crx, rx)
             self.assertEqual(cry, ry)
+
+
+class TestDemandImport(unittest.TestCase):
+    def test_demand_without_numpy(self):
+        # the elastic functions only need the standard library
+        code = ('import sys; sys.modules["numpy"] = None; import demand; '
+                'bolts = [[1, (0.0, 0.0), 1.0], [2, (0.0, 3.0), 1.0]]; '
+                'print(demand.calc_centroid(bolts))')
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=root)
+        self.assertEqual(output.decode().strip(), '(0.0, 1.5)')
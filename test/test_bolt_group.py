@@ -0,0 +1,223 @@
+import demand
+import bolt_group
+import unittest
+import copy
+
+class TestBoltGroup(unittest.TestCase):
+
+    def setUp(self):
+        diameter = 1.25
+        self.bolts = []
+        for x in range(0,10):
+            for y in range(0,10):
+                bolt_num = float(x+y+1)
+                self.bolts.append([bolt_num,
+                                   (float(x),float(y)),
+                                   diameter,
+                                   [None, None],
+                                   [None, None],
+                                   [None, None],
+                                   [None, None],
+                                   None,
+                                   None,
+                                   None,
+                                   [None, None]])
+
+        self.force = [(20.0, 25.0, 5.0),(7.54, 2.34, 4.37),[None, None, None],
+                     [None, None, None], None, [None, None], None]
+
+        self.bolts2 = [[1,(0.0, 0.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                       [2,(0.0, 3.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                       [3,(0.0, 6.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                       [4,(6.0, 0.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                       [5,(6.0, 3.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                       [6,(6.0, 6.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]]]
+        self.force2 = [(23.0, 8.0, 0.0), (0.6, -0.8, 0.0), [None, None, None],
+                        [None, None, None], None, [None, None], None]
+
+    def tearDown(self):
+        del self.force
+        del self.bolts
+        del self.force2
+        del self.bolts2
+
+    def test_from_to_bolts(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts)
+        bolts = group.to_bolts()
+
+        self.assertEqual(len(group), 100)
+        for bolt, cbolt in zip(bolts, self.bolts):
+            self.assertEqual(bolt[0], cbolt[0])
+            self.assertEqual(bolt[1], cbolt[1])
+            self.assertEqual(bolt[2], cbolt[2])
+
+    def test_section_properties(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts)
+        bolt_group.calc_bolt_coords_wrt_centroid(group)
+
+        self.assertEqual(bolt_group.calc_centroid(group), (4.5, 4.5))
+        self.assertEqual(bolt_group.calc_ixx(group), 825.0)
+        self.assertEqual(bolt_group.calc_iyy(group), 825.0)
+        self.assertEqual(bolt_group.calc_j(group), 1650.0)
+
+    def test_shear_and_elastic_match_demand(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts)
+        force = copy.deepcopy(self.force)
+
+        demand.calc_bolt_coords_wrt_centroid(self.bolts)
+        demand.calc_force_coords_wrt_centroid(self.bolts, self.force)
+        demand.calc_moments_about_centroid(self.force)
+        demand.shear(self.bolts, self.force)
+        demand.ecc_in_plane_elastic(self.bolts, self.force)
+
+        bolt_group.calc_bolt_coords_wrt_centroid(group)
+        bolt_group.calc_force_coords_wrt_centroid(group, force)
+        demand.calc_moments_about_centroid(force)
+        bolt_group.shear(group, force)
+        bolt_group.ecc_in_plane_elastic(group, force)
+
+        self.assertAlmostEqual(self.force[4], force[4], places=9)
+        for bolt, gbolt in zip(self.bolts, group.to_bolts()):
+            for slot in (3, 4, 5):
+                self.assertAlmostEqual(bolt[slot][0], gbolt[slot][0], places=9)
+                self.assertAlmostEqual(bolt[slot][1], gbolt[slot][1], places=9)
+
+    def test_iterate_to_ic_matches_demand(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts2)
+        force = copy.deepcopy(self.force2)
+
+        demand.calc_bolt_coords_wrt_centroid(self.bolts2)
+        demand.calc_force_coords_wrt_centroid(self.bolts2, self.force2)
+        demand.calc_moments_about_centroid(self.force2)
+        cresult = demand.iterate_to_ic(self.bolts2, self.force2)
+
+        bolt_group.calc_bolt_coords_wrt_centroid(group)
+        bolt_group.calc_force_coords_wrt_centroid(group, force)
+        demand.calc_moments_about_centroid(force)
+        result = bolt_group.iterate_to_ic(group, force)
+
+        for value, cvalue in zip(result, cresult):
+            self.assertAlmostEqual(value, cvalue, places=9)
+
+        for bolt, gbolt in zip(self.bolts2, group.to_bolts()):
+            for slot in (7, 8, 9):
+                self.assertAlmostEqual(bolt[slot], gbolt[slot], places=9)
+
+    def test_ecc_in_plane_elastic_batch(self):
+        points = [(20.0, 25.0, 5.0), (7.0, 6.5, 5.0), (2.0, -3.0, 0.0)]
+        loads = [(7.54, 2.34, 4.37), (-7.54, 0.0, 0.0), (0.0, 3.1, 0.0)]
+        group = bolt_group.BoltGroup.from_bolts(self.bolts)
+
+        reactions = bolt_group.ecc_in_plane_elastic_batch(group, points, loads)
+
+        self.assertEqual(reactions.shape, (3, 100, 2))
+        demand.calc_bolt_coords_wrt_centroid(self.bolts)
+        for i, (point, load) in enumerate(zip(points, loads)):
+            force = [point, load, [None, None, None], [None, None, None],
+                     None, [None, None], None]
+            demand.calc_force_coords_wrt_centroid(self.bolts, force)
+            demand.calc_moments_about_centroid(force)
+            demand.ecc_in_plane_elastic(self.bolts, force)
+            for bolt, reaction in zip(self.bolts, reactions[i]):
+                self.assertAlmostEqual(bolt[5][0], reaction[0], places=9)
+                self.assertAlmostEqual(bolt[5][1], reaction[1], places=9)
+
+        # a single bolt has j = 0, only a concentric force is resisted
+        single = bolt_group.BoltGroup([1.0], [2.0])
+        reactions = bolt_group.ecc_in_plane_elastic_batch(
+            single, [(1.0, 2.0, 0.0)], [(3.0, -4.0, 0.0)])
+        self.assertEqual(reactions.tolist(), [[[0.0, 0.0]]])
+        with self.assertRaises(ValueError):
+            bolt_group.ecc_in_plane_elastic_batch(single, [(6.0, 2.0, 0.0)],
+                                                  [(0.0, -10.0, 0.0)])
+
+    def test_elastic_reactions_batch(self):
+        points = [(20.0, 25.0, 5.0), (7.0, 6.5, -2.0), (2.0, -3.0, 0.0)]
+        loads = [(7.54, 2.34, 4.37), (-7.54, 0.0, -3.0), (0.0, 3.1, 12.0)]
+        group = bolt_group.BoltGroup.from_bolts(self.bolts)
+
+        reactions = bolt_group.elastic_reactions_batch(group, points, loads)
+
+        self.assertEqual(reactions.shape, (3, 100, 3))
+        demand.calc_bolt_coords_wrt_centroid(self.bolts)
+        for i, (point, load) in enumerate(zip(points, loads)):
+            force = [point, load, [None, None, None], [None, None, None],
+                     None, [None, None], None]
+            demand.calc_force_coords_wrt_centroid(self.bolts, force)
+            demand.calc_moments_about_centroid(force)
+            demand.shear(self.bolts, force)
+            demand.ecc_in_plane_elastic(self.bolts, force)
+            rz = demand.ecc_out_plane_assume_na(self.bolts, force)
+            for bolt, bolt_rz, reaction in zip(self.bolts, rz, reactions[i]):
+                self.assertAlmostEqual(bolt[4][0] + bolt[5][0], reaction[0],
+                                       places=9)
+                self.assertAlmostEqual(bolt[4][1] + bolt[5][1], reaction[1],
+                                       places=9)
+                self.assertAlmostEqual(bolt_rz, reaction[2], places=9)
+
+        # a single column has no depth for bending about the y-axis
+        column = bolt_group.BoltGroup([0.0, 0.0, 0.0], [0.0, 3.0, 6.0])
+        reactions = bolt_group.elastic_reactions_batch(
+            column, [(0.0, 3.0, 0.0)], [(6.0, 0.0, 3.0)])
+        for reaction in reactions[0]:
+            self.assertAlmostEqual(reaction[0], -2.0)
+            self.assertAlmostEqual(reaction[1], 0.0)
+            self.assertAlmostEqual(reaction[2], -1.0)
+        with self.assertRaises(ValueError):
+            bolt_group.elastic_reactions_batch(column, [(0.0, 3.0, 2.0)],
+                                               [(6.0, 0.0, 3.0)])
+
+        # a single bolt can not resist a moment about the z-axis
+        single = bolt_group.BoltGroup([0.0], [0.0])
+        with self.assertRaises(ValueError):
+            bolt_group.elastic_reactions_batch(single, [(0.0, 3.0, 0.0)],
+                                               [(6.0, 0.0, 0.0)])
+
+    def test_section_properties_invalidated_on_move(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts2)
+
+        self.assertEqual(group.centroid, (3.0, 3.0))
+        self.assertEqual(group.j, 90.0)
+        self.assertIs(group.local_coords, group.local_coords)
+
+        group.move_bolt(5, 12.0, 6.0)
+
+        self.assertEqual(group.centroid, (4.0, 3.0))
+        self.assertEqual(group.iyy, 120.0)
+        self.assertEqual(group.ixx, 36.0)
+        self.assertEqual(group.j, 156.0)
+
+        group.set_coords([0.0, 1.0, 2.0, 3.0, 4.0, 5.0], [0.0]*6)
+        self.assertEqual(group.centroid, (2.5, 0.0))
+        self.assertEqual(group.ixx, 0.0)
+
+    def test_coords_read_only(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts2)
+
+        with self.assertRaises(ValueError):
+            group.x[0] = 1.0
+        with self.assertRaises(ValueError):
+            group.set_coords([0.0, 1.0], [0.0, 1.0])
+
+    def test_d_max_invalidated_on_ic_move(self):
+        group = bolt_group.BoltGroup.from_bolts(self.bolts2)
+
+        bolt_group.calc_bolt_location_wrt_ic(group, 0.0, 0.0)
+        self.assertAlmostEqual(bolt_group.calc_d_max(group), 18.0**0.5)
+        self.assertAlmostEqual(bolt_group.calc_sum_d_squared(group), 90.0)
+
+        bolt_group.calc_bolt_location_wrt_ic(group, -3.0, 0.0)
+        self.assertAlmostEqual(bolt_group.calc_d_max(group), 45.0**0.5)
+        self.assertAlmostEqual(bolt_group.calc_sum_d_squared(group), 144.0)
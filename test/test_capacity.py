@@ -0,0 +1,91 @@
+import capacity
+import demand
+import unittest
+import math
+import numpy as np
+
+class TestCapacity(unittest.TestCase):
+
+    def test_available_strength(self):
+        # AISC Manual Tables 7-1 and 7-2, 3/4 in. A325 bolts
+        self.assertAlmostEqual(capacity.shear_capacity(0.75), 17.89, places=2)
+        self.assertAlmostEqual(capacity.shear_capacity(0.75, 'A325', True, 2),
+                               45.06, places=2)
+        self.assertAlmostEqual(capacity.shear_capacity(0.75, method='ASD'),
+                               11.93, places=2)
+        self.assertAlmostEqual(capacity.tension_capacity(0.75), 29.82,
+                               places=2)
+        self.assertAlmostEqual(capacity.tension_capacity(0.75, 'A490', 'ASD'),
+                               24.96, places=2)
+        with self.assertRaises(ValueError):
+            capacity.shear_capacity(0.75, 'A36')
+        with self.assertRaises(ValueError):
+            capacity.tension_capacity(0.75, method='WSD')
+
+    def test_combined_tension_capacity(self):
+        area = math.pi*0.75**2/4
+        cap = capacity.combined_tension_capacity(
+            0.75, np.array([0.0, 10.0, 17.89, 30.0]))
+
+        # no shear, F'nt is limited to Fnt
+        self.assertAlmostEqual(cap[0], capacity.tension_capacity(0.75))
+        fnt_prime = 1.3*90 - 90/(0.75*54)*10/area
+        self.assertAlmostEqual(cap[1], 0.75*fnt_prime*area)
+        # shear at the shear strength leaves 0.3*Fnt
+        self.assertAlmostEqual(cap[2], 0.75*0.3*90*area, places=2)
+        self.assertEqual(cap[3], 0.0)
+
+    def test_calc_ratios(self):
+        reactions = np.array([[[3.0, 4.0, 0.0], [0.0, 0.0, -20.0]],
+                              [[-6.0, 8.0, -10.0], [0.0, 0.0, 5.0]]])
+        ratios = capacity.calc_ratios(reactions, 0.75)
+        v_cap = capacity.shear_capacity(0.75)
+        t_cap = capacity.tension_capacity(0.75)
+
+        self.assertEqual(ratios.shear.shape, (2, 2))
+        np.testing.assert_allclose(ratios.shear, [[5/v_cap, 0.0],
+                                                  [10/v_cap, 0.0]])
+        # compression in the last bolt does not load the bolt
+        np.testing.assert_allclose(ratios.tension, [[0.0, 20/t_cap],
+                                                    [10/t_cap, 0.0]])
+        t_comb = capacity.combined_tension_capacity(0.75, 10.0)
+        np.testing.assert_allclose(ratios.combined,
+                                   [[5/v_cap, 20/t_cap],
+                                    [max(10/t_comb, 10/v_cap), 0.0]])
+
+        elliptical = capacity.calc_ratios(reactions, 0.75,
+                                          interaction='elliptical')
+        self.assertAlmostEqual(elliptical.combined[1, 0],
+                               math.hypot(10/v_cap, 10/t_cap))
+
+    def test_calc_ratios_shear_only(self):
+        reactions = np.array([[[3.0, 4.0], [6.0, 8.0]]])
+        ratios = capacity.calc_ratios(reactions, [0.75, 1.0])
+        np.testing.assert_allclose(
+            ratios.shear, [[5/capacity.shear_capacity(0.75),
+                            10/capacity.shear_capacity(1.0)]])
+        np.testing.assert_array_equal(ratios.tension, 0.0)
+        np.testing.assert_allclose(ratios.combined, ratios.shear)
+        with self.assertRaises(ValueError):
+            capacity.calc_ratios(np.zeros((1, 2, 4)), 0.75)
+
+    def test_calc_bolt_reactions(self):
+        bolts = [[1, (0.0, 3.0), 0.75, [0.0, 0.0], [0.0, 0.0], [0.0, 0.0],
+                  [0.0, 3.0], 3.0, 0.34, 0.0, [0.0, 0.0]],
+                 [2, (4.0, 0.0), 0.75, [0.0, 0.0], [0.0, 0.0], [0.0, 0.0],
+                  [4.0, 0.0], 4.0, 0.2, 0.0, [0.0, 0.0]],
+                 [3, (0.0, 0.0), 0.75, [0.0, 0.0], [0.0, 0.0], [0.0, 0.0],
+                  [0.0, 0.0], 0.0, 0.0, 0.0, [0.0, 0.0]]]
+        demand.calc_bolt_reactions(bolts, 17.9)
+
+        r1 = 17.9*math.pow(1 - math.exp(-3.4), 0.55)
+        r2 = 17.9*math.pow(1 - math.exp(-2.0), 0.55)
+        self.assertAlmostEqual(bolts[0][10][0], -r1)
+        self.assertAlmostEqual(bolts[0][10][1], 0.0)
+        self.assertAlmostEqual(bolts[1][10][0], 0.0)
+        self.assertAlmostEqual(bolts[1][10][1], r2)
+        self.assertEqual(bolts[2][10], [0.0, 0.0])
+        self.assertEqual(len(bolts[0]), 11)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import ce_table
+import ic_solver
+import models
+import unittest
+import os.path
+import shutil
+import tempfile
+import numpy as np
+
+class TestCeTable(unittest.TestCase):
+
+    def setUp(self):
+        self.angles = [0.0, 15.0, 30.0, 45.0]
+        self.eccentricities = [0.0, 2.0, 4.0, 6.0, 8.0]
+        self.tables = ce_table.build_tables([(3, 1, 3.0, 0.0),
+                                             (3, 2, 3.0, 6.0)],
+                                            self.angles, self.eccentricities)
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        del self.tables
+        shutil.rmtree(self.tmpdir)
+
+    def test_rectangular_pattern(self):
+        group = ce_table.rectangular_pattern(3, 2, 3.0, 6.0)
+
+        self.assertEqual(list(group.x), [-3.0, -3.0, -3.0, 3.0, 3.0, 3.0])
+        self.assertEqual(list(group.y), [-3.0, 0.0, 3.0, -3.0, 0.0, 3.0])
+        self.assertEqual(group.centroid, (0.0, 0.0))
+
+    def test_concentric_c(self):
+        table = self.tables[(3, 2, 3.0, 6.0)]
+
+        for c in table.c[:, 0]:
+            self.assertEqual(c, 6.0)
+
+    def test_c_matches_ic_solver(self):
+        table = self.tables[(3, 1, 3.0, 0.0)]
+        group = ce_table.rectangular_pattern(3, 1, 3.0, 0.0)
+
+        result = ic_solver.solve_ic(group, [(4.0, 0.0, 0.0), (0.0, -1.0, 0.0)])
+
+        self.assertAlmostEqual(table.c[0, 2], 1.0/abs(result.cu), places=6)
+        self.assertAlmostEqual(table.c[0, 2], 1.40, places=2)
+
+    def test_lookup(self):
+        table = self.tables[(3, 2, 3.0, 6.0)]
+
+        self.assertAlmostEqual(table.lookup(30.0, 4.0), table.c[2, 2])
+        self.assertAlmostEqual(table.lookup(22.5, 4.0),
+                               (table.c[1, 2] + table.c[2, 2])/2)
+        self.assertAlmostEqual(table.lookup(15.0, 5.0),
+                               (table.c[1, 2] + table.c[1, 3])/2)
+        self.assertAlmostEqual(table.lookup(45.0, 8.0), table.c[3, 4])
+
+        c = ce_table.lookup(self.tables, 3, 2, 3.0, 6.0, [0.0, 45.0],
+                            [2.0, 8.0])
+        self.assertAlmostEqual(c[0], table.c[0, 1])
+        self.assertAlmostEqual(c[1], table.c[3, 4])
+
+    def test_lookup_outside_table(self):
+        with self.assertRaises(ValueError):
+            ce_table.lookup(self.tables, 3, 2, 3.0, 6.0, 50.0, 2.0)
+        with self.assertRaises(ValueError):
+            ce_table.lookup(self.tables, 3, 2, 3.0, 6.0, 10.0, -1.0)
+        with self.assertRaises(KeyError):
+            ce_table.lookup(self.tables, 4, 2, 3.0, 6.0, 10.0, 2.0)
+
+    def test_save_load_tables(self):
+        path = os.path.join(self.tmpdir, 'tables.npz')
+
+        ce_table.save_tables(path, self.tables)
+        tables = ce_table.load_tables(path)
+
+        self.assertEqual(sorted(tables), sorted(self.tables))
+        for key, table in tables.items():
+            self.assertEqual(list(table.angles), self.angles)
+            self.assertEqual(list(table.eccentricities), self.eccentricities)
+            self.assertEqual(table.c.tolist(), self.tables[key].c.tolist())
+
+    def test_model_recorded(self):
+        path = os.path.join(self.tmpdir, 'tables.npz')
+        table = self.tables[(3, 2, 3.0, 6.0)]
+        linear = models.TabulatedModel('test_linear', [0.0, 0.34], [0.0, 1.0])
+
+        self.assertEqual(table.model, 'crawford_kulak')
+        with models.use_model(linear):
+            with self.assertRaises(ValueError):
+                table.lookup(30.0, 4.0)
+            with self.assertRaises(ValueError):
+                ce_table.lookup(self.tables, 3, 2, 3.0, 6.0, 30.0, 4.0)
+            tables = ce_table.build_tables([(3, 2, 3.0, 6.0)], self.angles,
+                                           self.eccentricities)
+            ce_table.save_tables(path, tables)
+            self.assertNotAlmostEqual(tables[table.key].lookup(30.0, 4.0),
+                                      table.c[2, 2])
+
+        tables = ce_table.load_tables(path)
+        self.assertEqual(tables[table.key].model, 'test_linear')
+        with self.assertRaises(ValueError):
+            tables[table.key].lookup(30.0, 4.0)
+
+        # files saved before the model was recorded
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data if name != 'models'}
+        np.savez(path, **arrays)
+        self.assertEqual(ce_table.load_tables(path)[table.key].model,
+                         'crawford_kulak')
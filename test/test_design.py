@@ -0,0 +1,66 @@
+import design
+import ce_table
+import ic_solver
+import unittest
+import numpy as np
+
+class TestDesign(unittest.TestCase):
+
+    def setUp(self):
+        self.points = np.array([(4.0, 0.0, 0.0), (4.0, 0.0, 0.0),
+                                (0.0, 0.0, 0.0)])
+        self.loads = np.array([(0.0, -20.0, 0.0), (5.0, -15.0, 0.0),
+                               (0.0, -30.0, 0.0)])
+        self.strength = {0.75: 10.0, 0.875: 13.0}
+        self.kwargs = dict(rows=range(1, 7), cols=(1, 2), pitches=(3.0,),
+                           gauges=(3.0, 6.0), diameters=(0.75, 0.875))
+
+    def tearDown(self):
+        del self.points
+        del self.loads
+
+    def test_candidates(self):
+        candidates = design.candidates([1, 2], [1, 2], [3.0, 4.0], [3.0],
+                                       [0.75])
+
+        self.assertEqual(len(candidates), 6)
+        self.assertIn(design.Candidate(1, 1, 0.0, 0.0, 0.75), candidates)
+
+    def test_check_candidate(self):
+        for candidate in design.candidates(**self.kwargs):
+            result = design.check_candidate(candidate, self.points,
+                                            self.loads, self.strength)
+            group = ce_table.rectangular_pattern(*candidate)
+            solved = ic_solver.solve_ic_batch(group, self.points, self.loads)
+            p = np.hypot(self.loads[:, 0], self.loads[:, 1])
+            required = np.where(solved.concentric, p/len(group),
+                                np.abs(solved.cu)).max()
+            # pruning and the elastic filter agree with the IC method
+            self.assertEqual(result.passes,
+                             required <= self.strength[candidate.diameter])
+            if result.method == 'elastic':
+                self.assertTrue(result.demand >= required)
+
+    def test_design(self):
+        result = design.design(self.points, self.loads, self.strength,
+                               max_workers=1, **self.kwargs)
+
+        self.assertTrue(result.passes)
+        self.assertEqual(result.candidate.num_bolts, 4)
+        self.assertTrue(result.ratio <= 1.0)
+
+    def test_search_parallel(self):
+        serial = design.search(self.points, self.loads, self.strength,
+                               max_workers=1, **self.kwargs)
+        parallel = design.search(self.points, self.loads, self.strength,
+                                 max_workers=2, **self.kwargs)
+
+        self.assertEqual([r.candidate for r in serial],
+                         [r.candidate for r in parallel])
+        self.assertEqual(set(r.method for r in serial),
+                         set(['prune', 'elastic', 'plastic']))
+
+    def test_no_design(self):
+        self.assertIsNone(design.design(self.points, 100*self.loads,
+                                        self.strength, max_workers=1,
+                                        **self.kwargs))
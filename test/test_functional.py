@@ -0,0 +1,90 @@
+import demand
+import bolt_group
+import ic_solver
+import functional
+import unittest
+import concurrent.futures
+
+class TestFunctional(unittest.TestCase):
+
+    def setUp(self):
+        self.x = [0.0, 0.0, 0.0, 6.0, 6.0, 6.0]
+        self.y = [0.0, 3.0, 6.0, 0.0, 3.0, 6.0]
+        self.group = bolt_group.BoltGroup(self.x, self.y, 1.0)
+        self.force = ((23.0, 8.0, 0.0), (0.6, -0.8, 0.0))
+
+    def tearDown(self):
+        del self.group
+        del self.force
+
+    def legacy(self, force):
+        bolts = self.group.to_bolts()
+        force = [force[0], force[1], [None, None, None], [None, None, None],
+                 None, [None, None], None]
+        demand.calc_bolt_coords_wrt_centroid(bolts)
+        demand.calc_force_coords_wrt_centroid(bolts, force)
+        demand.calc_moments_about_centroid(force)
+        demand.shear(bolts, force)
+        demand.ecc_in_plane_elastic(bolts, force)
+        return bolts, force
+
+    def test_elastic(self):
+        bolts, force = self.legacy(self.force)
+
+        location = functional.calc_force_coords_wrt_centroid(self.group,
+                                                             self.force)
+        moments = functional.calc_moments_about_centroid(self.group,
+                                                         self.force)
+        rs = functional.shear(self.group, self.force)
+        re = functional.ecc_in_plane_elastic(self.group, self.force)
+
+        self.assertEqual(list(location[:3]), force[3])
+        self.assertAlmostEqual(location.ec, force[4])
+        self.assertEqual(list(moments), force[2])
+        for i, bolt in enumerate(bolts):
+            self.assertAlmostEqual(rs.rx[i], bolt[4][0])
+            self.assertAlmostEqual(rs.ry[i], bolt[4][1])
+            self.assertAlmostEqual(re.rx[i], bolt[5][0])
+            self.assertAlmostEqual(re.ry[i], bolt[5][1])
+
+    def test_iterate_to_ic(self):
+        result = functional.iterate_to_ic(self.group, self.force)
+
+        expected = ic_solver.solve_ic(self.group, self.force)
+        self.assertAlmostEqual(result.x_ic, expected.x_ic)
+        self.assertAlmostEqual(result.y_ic, expected.y_ic)
+        self.assertAlmostEqual(result.cu, expected.cu)
+        for i in range(len(self.group)):
+            self.assertAlmostEqual(result.d[i], self.group.d[i])
+            self.assertAlmostEqual(result.rux[i], self.group.rux[i])
+            self.assertAlmostEqual(result.ruy[i], self.group.ruy[i])
+
+    def test_concentric(self):
+        with self.assertRaises(ValueError):
+            functional.iterate_to_ic(self.group, ((3.0, 3.0, 0.0),
+                                                  (0.0, -1.0, 0.0)))
+
+    def test_inputs_not_modified(self):
+        functional.shear(self.group, self.force)
+        functional.ecc_in_plane_elastic(self.group, self.force)
+        result = functional.iterate_to_ic(self.group, self.force)
+        result.rux[:] = 0.0
+
+        for name in bolt_group.BoltGroup.result_columns:
+            for value in getattr(self.group, name):
+                self.assertNotEqual(value, value)
+        self.assertNotEqual(functional.iterate_to_ic(self.group,
+                                                     self.force).rux[0], 0.0)
+
+    def test_thread_pool(self):
+        forces = [((23.0 + i, 8.0, 0.0), (0.6, -0.8, 0.0)) for i in range(8)]
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(
+                lambda force: functional.iterate_to_ic(self.group, force),
+                forces))
+
+        for force, result in zip(forces, results):
+            expected = functional.iterate_to_ic(self.group, force)
+            self.assertEqual(result.x_ic, expected.x_ic)
+            self.assertEqual(list(result.rux), list(expected.rux))
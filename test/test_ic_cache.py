@@ -0,0 +1,86 @@
+import bolt_group
+import ic_solver
+import ic_cache
+import unittest
+import numpy as np
+
+class TestICCache(unittest.TestCase):
+
+    def setUp(self):
+        self.group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                          [0.0, 3.0, 6.0, 0.0, 3.0, 6.0], 1.0)
+        self.force = [(23.0, 8.0, 0.0), (0.6, -0.8, 0.0)]
+        self.cache = ic_cache.ICCache()
+
+    def tearDown(self):
+        del self.group
+        del self.cache
+
+    def test_geometry_key(self):
+        moved = bolt_group.BoltGroup([16.0, 10.0, 10.0, 10.0, 16.0, 16.0],
+                                     [2.0, -4.0, -1.0, 2.0, -4.0, -1.0])
+        other = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                     [0.0, 3.0, 6.0, 0.0, 3.0, 7.0])
+
+        self.assertEqual(self.group.geometry_key(), moved.geometry_key())
+        self.assertNotEqual(self.group.geometry_key(), other.geometry_key())
+
+    def test_scaled_force_hits(self):
+        first = self.cache.solve_ic(self.group, self.force)
+        # 2.5 times the force, applied at another point on its line of action
+        scaled = self.cache.solve_ic(self.group, [(29.0, 0.0, 0.0),
+                                                  (1.5, -2.0, 0.0)])
+        expected = ic_solver.solve_ic(self.group, [(29.0, 0.0, 0.0),
+                                                   (1.5, -2.0, 0.0)])
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(scaled.iterations, 0)
+        self.assertEqual(scaled.x_ic, first.x_ic)
+        self.assertAlmostEqual(scaled.cu, expected.cu)
+        self.assertAlmostEqual(scaled.ce, expected.ce)
+
+    def test_opposite_force_misses(self):
+        self.cache.solve_ic(self.group, self.force)
+        self.cache.solve_ic(self.group, [(23.0, 8.0, 0.0), (-0.6, 0.8, 0.0)])
+
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_lru(self):
+        cache = ic_cache.ICCache(maxsize=2)
+        forces = [[(x, 8.0, 0.0), (0.6, -0.8, 0.0)] for x in (20.0, 23.0, 26.0)]
+
+        for force in forces:
+            cache.solve_ic(self.group, force)
+        cache.solve_ic(self.group, forces[2])
+        cache.solve_ic(self.group, forces[0])
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_solve_ic_batch(self):
+        factors = np.array([1.0, 1.2, 1.4, 0.9, 1.6])
+        points = np.array([(23.0, 8.0, 0.0)]*5 + [(3.0, 3.0, 0.0),
+                                                  (4.0, 0.0, 0.0)])
+        loads = np.vstack([np.outer(factors, (0.6, -0.8, 0.0)),
+                           [(0.0, -1.0, 0.0), (0.0, -2.0, 0.0)]])
+
+        result = self.cache.solve_ic_batch(self.group, points, loads)
+        expected = ic_solver.solve_ic_batch(self.group, points, loads)
+
+        self.assertEqual(self.cache.misses, 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertTrue(result.concentric[5])
+        self.assertEqual(result.iterations[1:5].tolist(), [0]*4)
+        np.testing.assert_allclose(result.x_ic[[0, 1, 2, 3, 4, 6]],
+                                   expected.x_ic[[0, 1, 2, 3, 4, 6]],
+                                   rtol=1e-8)
+        np.testing.assert_allclose(result.cu[[0, 1, 2, 3, 4, 6]],
+                                   expected.cu[[0, 1, 2, 3, 4, 6]],
+                                   rtol=1e-8)
+        np.testing.assert_allclose(result.ce[[0, 1, 2, 3, 4, 6]],
+                                   expected.ce[[0, 1, 2, 3, 4, 6]],
+                                   rtol=1e-8)
+
+        again = self.cache.solve_ic_batch(self.group, points[:5], 2*loads[:5])
+        self.assertEqual(self.cache.misses, 3)
+        np.testing.assert_allclose(again.cu, 2*result.cu[:5])
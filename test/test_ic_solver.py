@@ -0,0 +1,207 @@
+import demand
+import bolt_group
+import ic_solver
+import unittest
+import math
+
+class TestICSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.group1 = bolt_group.BoltGroup([0.0, 0.0, 0.0], [0.0, 3.0, 6.0],
+                                           1.0)
+        self.force1 = [(4.0, 0.0, 0.0), (0.0, -1.0, 0.0), [None, None, None],
+                        [None, None, None], None, [None, None], None]
+
+        self.group2 = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                           [0.0, 3.0, 6.0, 0.0, 3.0, 6.0],
+                                           1.0)
+        self.force2 = [(23.0, 8.0, 0.0), (0.6, -0.8, 0.0), [None, None, None],
+                        [None, None, None], None, [None, None], None]
+
+    def tearDown(self):
+        del self.group1
+        del self.force1
+        del self.group2
+        del self.force2
+
+    def legacy_ic(self, group, force):
+        bolts = group.to_bolts()
+        demand.calc_bolt_coords_wrt_centroid(bolts)
+        demand.calc_force_coords_wrt_centroid(bolts, force)
+        demand.calc_moments_about_centroid(force)
+        return demand.iterate_to_ic(bolts, force)
+
+    def test_solve_ic_1(self):
+        result = ic_solver.solve_ic(self.group1, self.force1)
+        cx_ic, cy_ic, cce, ccu = self.legacy_ic(self.group1, self.force1)
+
+        self.assertAlmostEqual(result.x_ic, cx_ic, places=1)
+        self.assertAlmostEqual(result.y_ic, cy_ic, places=3)
+        self.assertAlmostEqual(result.ce, cce, places=9)
+        self.assertAlmostEqual(result.cu, ccu, places=2)
+        self.assertLess(result.residual, 1e-10)
+        self.assertLessEqual(result.iterations, 6)
+
+    def test_solve_ic_2(self):
+        result = ic_solver.solve_ic(self.group2, self.force2)
+        cx_ic, cy_ic, cce, ccu = self.legacy_ic(self.group2, self.force2)
+
+        self.assertAlmostEqual(result.x_ic, cx_ic, places=1)
+        self.assertAlmostEqual(result.y_ic, cy_ic, places=1)
+        self.assertAlmostEqual(result.ce, cce, places=9)
+        self.assertAlmostEqual(result.cu, ccu, places=2)
+        self.assertLess(result.residual, 1e-10)
+        self.assertLessEqual(result.iterations, 6)
+
+    def test_solve_ic_equilibrium(self):
+        result = ic_solver.solve_ic(self.group2, self.force2, tol=1e-12)
+
+        self.assertLess(result.residual, 1e-12)
+        sum_rux = self.group2.rux.sum()
+        sum_ruy = self.group2.ruy.sum()
+
+        self.assertAlmostEqual(sum_rux, -0.6, places=9)
+        self.assertAlmostEqual(sum_ruy, 0.8, places=9)
+
+    def test_solve_ic_start_point(self):
+        cold = ic_solver.solve_ic(self.group2, self.force2)
+        warm = ic_solver.solve_ic(self.group2, self.force2, x0=cold.x_ic,
+                                  y0=cold.y_ic)
+
+        self.assertEqual(warm.iterations, 0)
+        self.assertAlmostEqual(warm.x_ic, cold.x_ic, places=9)
+        self.assertAlmostEqual(warm.y_ic, cold.y_ic, places=9)
+
+    def test_solve_ic_near_concentric(self):
+        for ex in [1.0, 0.1, 0.01, 0.001]:
+            force = [(3.0 + ex, 3.0, 0.0), (0.3, -1.0, 0.0), [None, None, None],
+                     [None, None, None], None, [None, None], None]
+
+            result = ic_solver.solve_ic(self.group2, force)
+
+            self.assertLess(result.residual, 1e-10)
+            self.assertLessEqual(result.iterations, 8)
+            self.assertAlmostEqual(self.group2.rux.sum(), -0.3, places=6)
+            self.assertAlmostEqual(self.group2.ruy.sum(), 1.0, places=6)
+
+    def test_solve_ic_irregular_group(self):
+        # L-shaped group, Newton alone runs off toward the root at infinity
+        # for these load angles
+        group = bolt_group.BoltGroup([0.0, 0.0, 3.0], [0.0, 3.0, 0.0], 1.0)
+        for angle in [120, 150, 300, 330]:
+            a = math.radians(angle)
+            force = [(12.0, 12.0, 0.0), (math.cos(a), math.sin(a), 0.0),
+                     [None, None, None], [None, None, None], None,
+                     [None, None], None]
+
+            result = ic_solver.solve_ic(group, force)
+            cx_ic, cy_ic, cce, ccu = self.legacy_ic(group, force)
+
+            self.assertLess(result.residual, 1e-10)
+            self.assertAlmostEqual(result.x_ic, cx_ic, places=2)
+            self.assertAlmostEqual(result.y_ic, cy_ic, places=2)
+            self.assertAlmostEqual(result.cu, ccu, places=2)
+            self.assertAlmostEqual(group.rux.sum(), -1*math.cos(a), places=6)
+            self.assertAlmostEqual(group.ruy.sum(), -1*math.sin(a), places=6)
+
+    def test_solve_ic_batch_irregular_group(self):
+        group = bolt_group.BoltGroup([0.0, 0.0, 3.0], [0.0, 3.0, 0.0], 1.0)
+        angles = [math.radians(a) for a in range(0, 360, 30)]
+        points = [(12.0, 12.0, 0.0)]*len(angles)
+        loads = [(math.cos(a), math.sin(a), 0.0) for a in angles]
+
+        result = ic_solver.solve_ic_batch(group, points, loads)
+
+        self.assertTrue(result.converged[~result.concentric].all())
+        for i, (point, load) in enumerate(zip(points, loads)):
+            if result.concentric[i]:
+                continue
+            cresult = ic_solver.solve_ic(group, [point, load])
+            self.assertAlmostEqual(result.x_ic[i], cresult.x_ic, places=6)
+            self.assertAlmostEqual(result.y_ic[i], cresult.y_ic, places=6)
+            self.assertAlmostEqual(result.cu[i], cresult.cu, places=8)
+            self.assertEqual(result.iterations[i], cresult.iterations)
+
+    def test_solve_ic_concentric(self):
+        force = [(3.0, 3.0, 0.0), (0.0, -1.0, 0.0), [None, None, None],
+                 [None, None, None], None, [None, None], None]
+
+        with self.assertRaises(ValueError):
+            ic_solver.solve_ic(self.group2, force)
+
+    def test_solve_ic_max_iter(self):
+        with self.assertRaises(ic_solver.ConvergenceError) as cm:
+            ic_solver.solve_ic(self.group2, self.force2, max_iter=1)
+
+        self.assertEqual(cm.exception.result.iterations, 1)
+
+    def test_solve_ic_batch_matches_solve_ic(self):
+        points = [(23.0, 8.0, 0.0), (4.0, 0.0, 0.0), (3.1, 3.0, 0.0),
+                  (3.001, 3.0, 0.0), (-12.0, 20.0, 0.0)]
+        loads = [(0.6, -0.8, 0.0), (0.0, -1.0, 0.0), (0.3, -1.0, 0.0),
+                 (0.3, -1.0, 0.0), (5.0, 2.0, 0.0)]
+
+        result = ic_solver.solve_ic_batch(self.group2, points, loads,
+                                          chunk_size=2)
+
+        self.assertTrue(result.converged.all())
+        self.assertFalse(result.concentric.any())
+        for i, (point, load) in enumerate(zip(points, loads)):
+            cresult = ic_solver.solve_ic(self.group2, [point, load])
+            self.assertAlmostEqual(result.x_ic[i], cresult.x_ic, delta=1e-6*
+                                   max(1.0, abs(cresult.x_ic)))
+            self.assertAlmostEqual(result.y_ic[i], cresult.y_ic, delta=1e-6*
+                                   max(1.0, abs(cresult.y_ic)))
+            self.assertAlmostEqual(result.ce[i], cresult.ce, places=9)
+            self.assertAlmostEqual(result.cu[i], cresult.cu, places=6)
+
+    def test_solve_ic_batch_concentric(self):
+        points = [(3.0, 3.0, 0.0), (23.0, 8.0, 0.0), (1.0, 1.0, 0.0)]
+        loads = [(0.0, -1.0, 0.0), (0.6, -0.8, 0.0), (0.0, 0.0, 0.0)]
+
+        result = ic_solver.solve_ic_batch(self.group2, points, loads)
+
+        self.assertEqual(list(result.concentric), [True, False, True])
+        self.assertEqual(list(result.converged), [False, True, False])
+        self.assertTrue(math.isnan(result.x_ic[0]))
+        self.assertTrue(math.isnan(result.cu[2]))
+        self.assertEqual(result.iterations[0], 0)
+
+    def test_solve_ic_batch_max_iter(self):
+        result = ic_solver.solve_ic_batch(self.group2, [(23.0, 8.0, 0.0)],
+                                          [(0.6, -0.8, 0.0)], max_iter=1)
+
+        self.assertFalse(result.converged[0])
+        self.assertEqual(result.iterations[0], 1)
+
+    def test_sweep_ic(self):
+        angles = [math.radians(a) for a in range(0, 91, 5)]
+        points = [(15.0, 3.0, 0.0)]*len(angles)
+        loads = [(math.sin(a), -1*math.cos(a), 0.0) for a in angles]
+
+        result = ic_solver.sweep_ic(self.group2, points, loads, compare=True)
+
+        # the last load case passes through the centroid
+        self.assertTrue(result.concentric[-1])
+        self.assertTrue(result.converged[:-1].all())
+        self.assertTrue(result.warm_started[1:-1].all())
+        self.assertTrue(result.iterations_saved > 0)
+        for i in range(len(angles) - 1):
+            cold = ic_solver.solve_ic(self.group2, (points[i], loads[i]))
+            self.assertAlmostEqual(result.x_ic[i], cold.x_ic, places=6)
+            self.assertAlmostEqual(result.y_ic[i], cold.y_ic, places=6)
+            self.assertAlmostEqual(result.cu[i], cold.cu, places=8)
+
+    def test_sweep_ic_fallback(self):
+        points = [(23.0, 8.0, 0.0)]*2
+        loads = [(0.6, -0.8, 0.0)]*2
+
+        result = ic_solver.sweep_ic(self.group2, points, loads, x0=1e6,
+                                    y0=-1e6, max_iter=8)
+        cold = ic_solver.solve_ic(self.group2, self.force2)
+
+        self.assertEqual(list(result.warm_started), [False, True])
+        self.assertTrue(result.converged.all())
+        self.assertEqual(result.iterations[0], 8 + cold.iterations)
+        self.assertAlmostEqual(result.x_ic[0], cold.x_ic)
+        self.assertIsNone(result.iterations_saved)
@@ -0,0 +1,64 @@
+import demand
+import bolt_group
+import ic_solver
+import instrument
+import unittest
+
+class TestInstrument(unittest.TestCase):
+
+    def setUp(self):
+        self.group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                          [0.0, 3.0, 6.0, 0.0, 3.0, 6.0], 1.0)
+        self.force = [(23.0, 8.0, 0.0), (0.6, -0.8, 0.0), [None, None, None],
+                      [None, None, None], None, [None, None], None]
+
+    def tearDown(self):
+        del self.group
+        del self.force
+
+    def test_record_iterate_to_ic(self):
+        bolts = self.group.to_bolts()
+        demand.calc_bolt_coords_wrt_centroid(bolts)
+        demand.calc_force_coords_wrt_centroid(bolts, self.force)
+        demand.calc_moments_about_centroid(self.force)
+        original = demand.calc_moment_about_ic
+
+        with instrument.record() as report:
+            demand.iterate_to_ic(bolts, self.force)
+
+        self.assertIs(demand.calc_moment_about_ic, original)
+        self.assertIsNone(instrument.recorder)
+        self.assertEqual(report.calls['demand.iterate_to_ic'], 1)
+        history = report.solves[0]
+        self.assertEqual(history.solver, 'demand.iterate_to_ic')
+        self.assertTrue(history.converged)
+        self.assertEqual(history.iterations, len(history.residuals))
+        self.assertEqual(report.calls['demand.calc_instanteous_center'],
+                         history.iterations)
+        self.assertTrue(history.residuals[-1] < 0.01)
+        self.assertTrue(report.time['demand.iterate_to_ic'] >=
+                        report.time['demand.calc_moment_about_ic'])
+        self.assertIn('demand.iterate_to_ic', report.format())
+
+    def test_record_ic_solver(self):
+        with instrument.record() as report:
+            result = ic_solver.solve_ic(self.group, self.force)
+            ic_solver.solve_ic_batch(self.group, [self.force[0]],
+                                     [self.force[1]])
+
+        single, batch = report.solves
+        self.assertEqual(single.iterations, result.iterations)
+        self.assertEqual(len(single.residuals), result.iterations + 1)
+        self.assertEqual(single.residuals[-1], result.residual)
+        self.assertTrue(batch.converged)
+        self.assertEqual(report.iterations('ic_solver.solve_ic_batch'),
+                         batch.iterations)
+        self.assertEqual(report.as_dict()['solves'][0]['iterations'],
+                         result.iterations)
+
+    def test_disabled(self):
+        self.assertIsNone(instrument.start_solve('demand.iterate_to_ic'))
+        with instrument.record():
+            with self.assertRaises(RuntimeError):
+                with instrument.record():
+                    pass
@@ -0,0 +1,81 @@
+import kernels
+import unittest
+import math
+import numpy as np
+
+class TestKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.d = np.array([[0.0, 1.0, 2.5, 4.0],
+                           [3.0, 3.0, 6.0, 1.5]])
+
+    def tearDown(self):
+        del self.d
+
+    def check_backend(self, name):
+        previous = kernels.set_backend(name)
+        try:
+            delta, r, sum_m = kernels.crawford_kulak(self.d)
+            fraction = kernels.force_fraction(self.d, np.array([[4.0], [6.0]]))
+        finally:
+            kernels.set_backend(previous)
+
+        # a single load case gives a float sum_m from every backend
+        previous = kernels.set_backend(name)
+        try:
+            single = kernels.crawford_kulak(self.d[0])
+        finally:
+            kernels.set_backend(previous)
+        self.assertIs(type(single[2]), float)
+        self.assertAlmostEqual(single[2], sum_m[0])
+        self.assertEqual(single[1].shape, (4,))
+
+        for i, d_max in enumerate((4.0, 6.0)):
+            total = 0.0
+            for j, d in enumerate(self.d[i]):
+                expected = math.pow(1 - math.exp(-10*0.34*d/d_max), 0.55)
+                self.assertAlmostEqual(delta[i, j], 0.34*d/d_max)
+                self.assertAlmostEqual(r[i, j], expected)
+                self.assertAlmostEqual(fraction[i, j], expected)
+                total += expected*d
+            self.assertAlmostEqual(sum_m[i], total)
+
+    def test_numpy_backend(self):
+        self.check_backend('numpy')
+
+    @unittest.skipUnless(kernels.numba, 'numba is not installed')
+    def test_numba_backend(self):
+        self.check_backend('numba')
+
+    @unittest.skipUnless(kernels.numba, 'numba is not installed')
+    def test_backends_zero_d_max(self):
+        d = np.array([[0.0, 0.0], [0.0, 1.0]])
+        d_max = np.zeros(2)
+        results = {}
+        for name in kernels.available_backends():
+            previous = kernels.set_backend(name)
+            try:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    fraction = kernels.force_fraction(d, d_max[:, np.newaxis])
+                    results[name] = (kernels.crawford_kulak(d, d_max) +
+                                     (fraction,))
+            finally:
+                kernels.set_backend(previous)
+
+        for numba_value, numpy_value in zip(results['numba'],
+                                            results['numpy']):
+            np.testing.assert_array_equal(numba_value, numpy_value)
+        self.assertTrue(np.isnan(results['numpy'][1][0]).all())
+        self.assertEqual(results['numpy'][1][1, 1], 1.0)
+
+    def test_set_backend(self):
+        self.assertEqual(kernels.backend, kernels.available_backends()[0])
+        with self.assertRaises(ValueError):
+            kernels.set_backend('fortran')
+        if kernels.numba is None:
+            with self.assertRaises(ImportError):
+                kernels.set_backend('numba')
+            self.assertEqual(kernels.backend, 'numpy')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import bolt_group
+import analysis
+import loads
+import unittest
+import os.path
+import shutil
+import tempfile
+import numpy as np
+
+class TestLoads(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'loads.csv')
+
+        rng = np.random.RandomState(0)
+        self.points = np.column_stack([rng.uniform(-20.0, 30.0, 25),
+                                       rng.uniform(-20.0, 30.0, 25),
+                                       np.zeros(25)])
+        self.loads = rng.uniform(-10.0, 10.0, (25, 3))
+
+        with open(self.path, 'w') as f:
+            f.write('case,PX,py,pz,x,y,z\n')
+            for i, (point, load) in enumerate(zip(self.points, self.loads)):
+                f.write('%d,%r,%r,%r,%r,%r,%r\n' % ((i,) +
+                                                    tuple(load.tolist()) +
+                                                    tuple(point.tolist())))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_load_csv(self):
+        chunks = list(loads.read_load_csv(self.path, chunk_size=10))
+
+        self.assertEqual([len(points) for points, _ in chunks], [10, 10, 5])
+        points = np.concatenate([points for points, _ in chunks])
+        forces = np.concatenate([forces for _, forces in chunks])
+        self.assertEqual(points.tolist(), self.points.tolist())
+        self.assertEqual(forces.tolist(), self.loads.tolist())
+
+    def test_read_load_csv_missing_column(self):
+        with self.assertRaises(ValueError):
+            list(loads.read_load_csv(self.path, columns=('x', 'y', 'z', 'fx',
+                                                         'fy', 'fz')))
+
+    def test_read_load_csv_empty(self):
+        empty = os.path.join(self.tmpdir, 'empty.csv')
+        open(empty, 'w').close()
+
+        with self.assertRaises(ValueError):
+            list(loads.read_load_csv(empty))
+
+    def test_read_loads_dispatch(self):
+        chunks = list(loads.read_loads(self.path, chunk_size=100))
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0][0].shape, (25, 3))
+
+    @unittest.skipIf(loads.pq is None, 'pyarrow is not installed')
+    def test_read_load_parquet(self):
+        import pyarrow
+        path = os.path.join(self.tmpdir, 'loads.parquet')
+        table = pyarrow.table(dict(zip(loads.COLUMNS,
+                                       np.hstack([self.points, self.loads]).T)))
+        loads.pq.write_table(table, path)
+
+        chunks = list(loads.read_loads(path, chunk_size=10))
+
+        points = np.concatenate([points for points, _ in chunks])
+        self.assertEqual(points.tolist(), self.points.tolist())
+
+    def test_envelope_stream(self):
+        group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                     [0.0, 3.0, 6.0, 0.0, 3.0, 6.0])
+
+        envelope = analysis.envelope_stream(
+            group, loads.read_load_csv(self.path, chunk_size=7))
+
+        reactions = analysis.calc_elastic_reactions(group, self.points,
+                                                    self.loads)
+        r = np.hypot(reactions[:, :, 0], reactions[:, :, 1])
+        self.assertEqual(envelope.num_cases, 25)
+        np.testing.assert_allclose(envelope.max_r, r.max(axis=0))
+        self.assertEqual(envelope.max_r_case.tolist(),
+                         r.argmax(axis=0).tolist())
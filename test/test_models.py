@@ -0,0 +1,111 @@
+import analysis
+import bolt_group
+import ic_cache
+import ic_solver
+import models
+import unittest
+import math
+import multiprocessing
+import pickle
+import numpy as np
+
+class TestModels(unittest.TestCase):
+
+    def setUp(self):
+        self.group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                          [0.0, 3.0, 6.0, 0.0, 3.0, 6.0], 1.0)
+        self.force = [(23.0, 8.0, 0.0), (0.6, -0.8, 0.0)]
+        self.curve = models.CurveModel(
+            'test_curve', lambda delta: math.pow(1 - math.exp(-10*delta), 0.55),
+            0.34)
+
+    def tearDown(self):
+        del self.group
+        del self.force
+        del self.curve
+
+    def test_tabulate(self):
+        table = self.curve.tabulate(4097, 'test_table')
+        d = np.array([[0.0, 1.0, 2.5, 4.0]])
+        expected = models.get_model('crawford_kulak').evaluate(d)
+
+        self.assertEqual(table.delta_max, 0.34)
+        for model in (self.curve, table):
+            delta, r, sum_m = model.evaluate(d)
+            np.testing.assert_allclose(delta, expected[0])
+            np.testing.assert_allclose(r, expected[1], atol=1e-3)
+            np.testing.assert_allclose(sum_m, expected[2], rtol=1e-3)
+
+        with self.assertRaises(ValueError):
+            models.TabulatedModel('bad', [0.0, 0.2, 0.1], [0.0, 0.5, 1.0])
+
+    def test_use_model(self):
+        default = ic_solver.solve_ic(self.group, self.force)
+        table = self.curve.tabulate(4097, 'test_table')
+
+        with models.use_model(table) as model:
+            self.assertIs(models.active, table)
+            self.assertIs(model, table)
+            result = ic_solver.solve_ic(self.group, self.force)
+        self.assertEqual(models.active.name, 'crawford_kulak')
+
+        self.assertAlmostEqual(result.x_ic, default.x_ic, places=2)
+        self.assertAlmostEqual(result.y_ic, default.y_ic, places=2)
+        self.assertAlmostEqual(result.cu, default.cu, places=2)
+
+        # a steeper curve moves the IC
+        linear = models.TabulatedModel('test_linear', [0.0, 0.34],
+                                       [0.0, 1.0])
+        with models.use_model(linear):
+            result = ic_solver.solve_ic(self.group, self.force)
+        self.assertNotAlmostEqual(result.cu, default.cu, places=2)
+
+    def test_registry(self):
+        table = models.register(self.curve.tabulate(name='test_registered'))
+        try:
+            self.assertIs(models.get_model('test_registered'), table)
+            self.assertIn('test_registered', models.available_models())
+            with self.assertRaises(ValueError):
+                models.register(table)
+            models.register(table, replace=True)
+
+            cache = ic_cache.ICCache()
+            cache.solve_ic(self.group, self.force)
+            with models.use_model('test_registered'):
+                cache.solve_ic(self.group, self.force)
+            self.assertEqual(cache.misses, 2)
+        finally:
+            del models._registry['test_registered']
+
+        with self.assertRaises(ValueError):
+            models.get_model('test_registered')
+
+    def test_pool_workers(self):
+        linear = models.TabulatedModel('test_linear', [0.0, 0.34], [0.0, 1.0])
+        connections = [(self.group, [(23.0, 8.0, 0.0), (-10.0, 1.0, 0.0)],
+                        [(0.6, -0.8, 0.0), (-3.0, 4.0, 0.0)])]
+
+        # spawned workers do not inherit the model selected in this process
+        previous = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            with models.use_model(linear):
+                serial = analysis.envelope_bolt_forces(connections, 'plastic',
+                                                       max_workers=1)
+                pooled = analysis.envelope_bolt_forces(connections, 'plastic',
+                                                       max_workers=2)
+        finally:
+            multiprocessing.set_start_method(previous, force=True)
+        default = analysis.envelope_bolt_forces(connections, 'plastic',
+                                                max_workers=1)
+
+        np.testing.assert_allclose(pooled[0].max_r, serial[0].max_r)
+        self.assertFalse(np.allclose(default[0].max_r, serial[0].max_r))
+
+    def test_pickle(self):
+        curve = pickle.loads(pickle.dumps(models.CurveModel('test_pickle',
+                                                            math.sqrt, 0.34)))
+        self.assertEqual(curve.fraction([0.0, 0.25]).tolist(), [0.0, 0.5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import demand
+import bolt_group
+import out_plane
+import unittest
+import numpy as np
+
+class TestOutPlane(unittest.TestCase):
+
+    def setUp(self):
+        self.group = bolt_group.BoltGroup([-1.5, -1.5, -1.5, -1.5,
+                                           1.5, 1.5, 1.5, 1.5],
+                                          [0.0, 3.0, 6.0, 9.0,
+                                           0.0, 3.0, 6.0, 9.0], 0.75)
+        self.points = np.array([(0.0, 4.5, 6.0), (0.0, 4.5, 6.0),
+                                (0.0, 6.0, 1.0), (0.0, 4.5, 1.0),
+                                (0.0, 4.5, 6.0), (2.0, 2.0, 0.0),
+                                (0.0, 4.5, 10.0)])
+        self.loads = np.array([(0.0, -10.0, 0.0), (0.0, -10.0, 50.0),
+                               (0.0, -10.0, 100.0), (0.0, 1.0, -1000.0),
+                               (0.0, 10.0, 0.0), (0.0, 0.0, -20.0),
+                               (0.0, -14.0, -20.0)])
+        self.width = 6.0
+        self.y_top = 10.5
+        self.y_bottom = -1.5
+
+    def tearDown(self):
+        del self.group
+        del self.points
+        del self.loads
+
+    def find_na(self):
+        return out_plane.ecc_out_plane_find_na_batch(self.group, self.points,
+                                                     self.loads, self.width,
+                                                     self.y_top, self.y_bottom)
+
+    def test_assume_na(self):
+        rz = out_plane.ecc_out_plane_assume_na_batch(self.group, self.points,
+                                                     self.loads)
+
+        # ixx = 90 and iyy = 18 about the centroid at (0, 4.5)
+        for j, yc in enumerate(self.group.local_coords[1]):
+            self.assertAlmostEqual(rz[0, j], -60.0*yc/90.0)
+        # mx = 50, my = 40
+        self.assertAlmostEqual(rz[5, 0], -1*(-20.0/8 - 50.0*4.5/90.0 +
+                                             40.0*1.5/18.0))
+
+    def test_assume_na_single_row(self):
+        row = bolt_group.BoltGroup([0.0, 3.0, 6.0], [0.0, 0.0, 0.0], 0.75)
+
+        # my = -30 about the centroid at (3, 0), iyy = 18 and ixx = 0
+        rz = out_plane.ecc_out_plane_assume_na_resultants(row, 6.0, 0.0,
+                                                          -30.0)
+        np.testing.assert_allclose(rz, [[3.0, -2.0, -7.0]])
+        with self.assertRaises(ValueError):
+            out_plane.ecc_out_plane_assume_na_resultants(row, 6.0, 30.0, 0.0)
+        with self.assertRaises(ValueError):
+            out_plane.ecc_out_plane_assume_na_batch(row, [(3.0, 5.0, 0.0)],
+                                                    [(0.0, 0.0, 6.0)])
+
+        # the list based demand function follows the same rule
+        bolts = row.to_bolts()
+        demand.calc_bolt_coords_wrt_centroid(bolts)
+        force = [(3.0, 5.0, 0.0), (0.0, 0.0, 6.0), [None, None, None],
+                 [None, None, None], None, [None, None], None]
+        demand.calc_force_coords_wrt_centroid(bolts, force)
+        demand.calc_moments_about_centroid(force)
+        with self.assertRaises(ValueError):
+            demand.ecc_out_plane_assume_na(bolts, force)
+        force[0] = (8.0, 0.0, 0.0)
+        demand.calc_force_coords_wrt_centroid(bolts, force)
+        demand.calc_moments_about_centroid(force)
+        self.assertEqual(demand.ecc_out_plane_assume_na(bolts, force),
+                         [3.0, -2.0, -7.0])
+
+    def test_find_na_equilibrium(self):
+        y_na, rz = self.find_na()
+        area = out_plane.calc_bolt_area(0.75)
+        y = self.group.y
+
+        for i in (0, 4, 6):
+            pz = self.loads[i, 2]
+            mx = pz*(self.points[i, 1] - 4.5) - self.loads[i, 1]*self.points[i, 2]
+            sign = 1.0 if mx >= 0.0 else -1.0
+            s = sign*(y - 4.5)
+            a = sign*(y_na[i] - 4.5)
+            edge = -6.0
+            tension = -1*rz[i]
+            top = s.argmax()
+            k = tension[top]/(area*(s[top] - a))
+            t = a - edge
+
+            self.assertTrue(edge < a < s.max())
+            for j in range(len(self.group)):
+                self.assertAlmostEqual(tension[j],
+                                       area*k*max(s[j] - a, 0.0), places=8)
+            self.assertAlmostEqual(tension.sum() - self.width*k*t*t/2, pz,
+                                   places=6)
+            self.assertAlmostEqual(np.dot(tension, s) +
+                                   self.width*k*(t**3/3 - a*t*t/2),
+                                   abs(mx), places=6)
+
+    def test_find_na_mirror(self):
+        y_na, rz = self.find_na()
+
+        self.assertAlmostEqual(y_na[0] - 4.5, 4.5 - y_na[4])
+        self.assertAlmostEqual(rz[0, 3], rz[4, 0])
+
+    def test_find_na_elastic_and_slack(self):
+        y_na, rz = self.find_na()
+        elastic = out_plane.ecc_out_plane_assume_na_batch(self.group,
+                                                          self.points,
+                                                          self.loads)
+
+        np.testing.assert_allclose(rz[2], elastic[2])
+        self.assertTrue(np.all(rz[2] < 0.0))
+        # the connected parts separate, the NA is past the bottom edge
+        self.assertTrue(y_na[1] < self.y_bottom)
+        np.testing.assert_allclose(rz[1], elastic[1])
+        # compression that the bearing area takes without the bolts
+        for i in (3, 5):
+            self.assertTrue(np.all(rz[i] == 0.0))
+            self.assertTrue(np.isnan(y_na[i]))
+
+    def test_find_na_outside_bearing_area(self):
+        with self.assertRaises(ValueError):
+            out_plane.ecc_out_plane_find_na_batch(self.group, self.points,
+                                                  self.loads, 6.0, 8.0, -1.0)
+
+    def test_init_ten(self):
+        rz = out_plane.ecc_out_plane_init_ten_batch(self.group, self.points,
+                                                    self.loads, 5.0)
+        elastic = out_plane.ecc_out_plane_assume_na_batch(self.group,
+                                                          self.points,
+                                                          self.loads)
+
+        np.testing.assert_allclose(rz, np.minimum(elastic, -5.0))
+
+    def test_demand(self):
+        y_na, rz = self.find_na()
+        assume = out_plane.ecc_out_plane_assume_na_batch(self.group,
+                                                         self.points,
+                                                         self.loads)
+        bolts = self.group.to_bolts()
+        demand.calc_bolt_coords_wrt_centroid(bolts)
+
+        for i, (point, load) in enumerate(zip(self.points, self.loads)):
+            force = [tuple(point.tolist()), tuple(load.tolist()),
+                     [None, None, None], [None, None, None], None,
+                     [None, None], None]
+            demand.calc_force_coords_wrt_centroid(bolts, force)
+            demand.calc_moments_about_centroid(force)
+
+            np.testing.assert_allclose(demand.tension(bolts, force),
+                                       -1*load[2]/8)
+            np.testing.assert_allclose(demand.ecc_out_plane_assume_na(bolts,
+                                                                      force),
+                                       assume[i])
+            np.testing.assert_allclose(demand.ecc_out_plane_init_ten(bolts,
+                                                                     force,
+                                                                     5.0),
+                                       np.minimum(assume[i], -5.0))
+            y, r = demand.ecc_out_plane_find_na(bolts, force, self.width,
+                                                self.y_top, self.y_bottom)
+            np.testing.assert_allclose(r, rz[i], atol=1e-12)
+            if not np.isnan(y_na[i]):
+                self.assertAlmostEqual(y, y_na[i])
+                self.assertAlmostEqual(demand.calc_neutral_axis(bolts, force,
+                                                                self.width,
+                                                                self.y_top,
+                                                                self.y_bottom),
+                                       y)
@@ -0,0 +1,89 @@
+import demand
+import bolt_group
+import records
+import unittest
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.bolts = [[1,(0.0, 0.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                      [2,(0.0, 3.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                      [3,(0.0, 6.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                      [4,(6.0, 0.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                      [5,(6.0, 3.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]],
+                      [6,(6.0, 6.0), 1.0, [None, None], [None, None],
+                       [None, None], [None, None], None, None, None,
+                       [None, None]]]
+        self.force = [(23.0, 8.0, 0.0), (0.6, -0.8, 0.0), [None, None, None],
+                      [None, None, None], None, [None, None], None]
+
+    def tearDown(self):
+        del self.bolts
+        del self.force
+
+    def test_round_trip(self):
+        bolts = records.bolts_from_legacy(self.bolts)
+        force = records.Force.from_legacy(self.force)
+
+        self.assertEqual(records.bolts_to_legacy(bolts), self.bolts)
+        self.assertEqual(force.to_legacy(), self.force)
+        self.assertEqual(bolts[4].user_y, 3.0)
+        self.assertEqual(bolts[4][1], (6.0, 3.0))
+
+    def test_constructors(self):
+        bolt = records.Bolt(7, 1.5, 2.5, 0.75)
+        force = records.Force(1.0, 2.0, 0.0, 3.0, 4.0, 0.0)
+
+        self.assertEqual(len(bolt), 11)
+        self.assertEqual(bolt[1], (1.5, 2.5))
+        self.assertEqual(bolt[6], [None, None])
+        self.assertEqual(len(force), 7)
+        self.assertEqual(force[1], (3.0, 4.0, 0.0))
+
+    def test_slot_view(self):
+        bolt = records.Bolt(1, 0.0, 0.0, 1.0)
+
+        bolt[6][0] = 2.0
+        bolt[6][1] = 3.0
+        bolt[7] = 4.0
+
+        self.assertEqual((bolt.dx, bolt.dy, bolt.d), (2.0, 3.0, 4.0))
+        self.assertEqual(list(bolt[6]), [2.0, 3.0])
+        self.assertFalse(hasattr(bolt, '__dict__'))
+
+    def test_demand_accepts_records(self):
+        bolts = records.bolts_from_legacy(self.bolts)
+        force = records.Force.from_legacy(self.force)
+
+        for b, f in ((self.bolts, self.force), (bolts, force)):
+            demand.calc_bolt_coords_wrt_centroid(b)
+            demand.calc_force_coords_wrt_centroid(b, f)
+            demand.calc_moments_about_centroid(f)
+            demand.shear(b, f)
+            demand.ecc_in_plane_elastic(b, f)
+        cresult = demand.iterate_to_ic(self.bolts, self.force)
+        result = demand.iterate_to_ic(bolts, force)
+        demand.calc_bolt_reactions(self.bolts, 74.0)
+        demand.calc_bolt_reactions(bolts, 74.0)
+
+        self.assertEqual(result, cresult)
+        self.assertEqual(records.bolts_to_legacy(bolts), self.bolts)
+        self.assertEqual(force.to_legacy(), self.force)
+
+    def test_bolt_group_from_records(self):
+        bolts = records.bolts_from_legacy(self.bolts)
+
+        group = bolt_group.BoltGroup.from_bolts(bolts)
+
+        self.assertEqual(list(group.y), [0.0, 3.0, 6.0, 0.0, 3.0, 6.0])
+        self.assertEqual(list(group.bolt_num), [1, 2, 3, 4, 5, 6])
@@ -0,0 +1,100 @@
+import analysis
+import bolt_group
+import sbc
+import unittest
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+class TestSbc(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.loads = [[23.0, 8.0, 0.0, 0.6, -0.8, 0.0],
+                      [4.0, 0.0, 0.0, 0.0, -1.0, 0.0]]
+        with open(os.path.join(self.tmp, 'bolts.csv'), 'w') as f:
+            f.write('bolt_num,x,y\n7,0,0\n8,0,3\n9,0,6\n')
+        with open(os.path.join(self.tmp, 'loads.csv'), 'w') as f:
+            f.write('x,y,z,px,py,pz\n3,3,0,0,-10,0\n0,3,0,5,0,0\n')
+        self.job = os.path.join(self.tmp, 'job.json')
+        with open(self.job, 'w') as f:
+            json.dump({'connections': [
+                {'name': 'splice', 'bolts': [[0, 0], [0, 3], [0, 6], [6, 0],
+                                             [6, 3], [6, 6]],
+                 'diameter': 1.0, 'loads': self.loads, 'method': 'plastic'},
+                {'name': 'clip', 'bolts': 'bolts.csv',
+                 'loads': 'loads.csv'}]}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_read_job(self):
+        jobs = sbc.read_job(self.job)
+
+        self.assertEqual([job.name for job in jobs], ['splice', 'clip'])
+        self.assertEqual(jobs[0].method, 'plastic')
+        self.assertEqual(jobs[0].loads.shape, (2, 6))
+        self.assertEqual(jobs[1].group.bolt_num.tolist(), [7, 8, 9])
+        self.assertEqual(jobs[1].loads, os.path.join(self.tmp, 'loads.csv'))
+
+        table = os.path.join(self.tmp, 'job.csv')
+        with open(table, 'w') as f:
+            f.write('name,bolts,loads,diameter,method\n'
+                    'clip,bolts.csv,loads.csv,0.75,\n')
+        jobs = sbc.read_job(table)
+        self.assertEqual(jobs[0].method, 'elastic')
+        self.assertEqual(jobs[0].group.diameter.tolist(), [0.75]*3)
+
+    def test_main(self):
+        output = os.path.join(self.tmp, 'out.jsonl')
+        self.assertEqual(sbc.main(['run', self.job, '-o', output, '--jobs',
+                                   '1', '--quiet']), 0)
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertEqual([r['connection'] for r in records],
+                         ['splice', 'clip'])
+        group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                     [0.0, 3.0, 6.0, 0.0, 3.0, 6.0])
+        loads = np.array(self.loads)
+        reactions = analysis.calc_plastic_reactions(group, loads[:, :3],
+                                                    loads[:, 3:])
+        np.testing.assert_allclose(records[0]['max_r'],
+                                   np.hypot(reactions[:, :, 0],
+                                            reactions[:, :, 1]).max(axis=0))
+
+        output = os.path.join(self.tmp, 'out.csv')
+        sbc.main(['run', self.job, '-o', output, '--format', 'csv', '-j', '1',
+                  '-q'])
+        with open(output) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(rows[6]['connection'], 'clip')
+        self.assertEqual(rows[6]['bolt_num'], '7')
+        self.assertEqual(int(rows[6]['max_r_case']), 0)
+
+    def test_help(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with self.assertRaises(SystemExit):
+                sbc.main(['--help'])
+        self.assertIn(sbc.__doc__.splitlines()[0], stdout.getvalue())
+
+    def test_envelope_record_failed(self):
+        job = sbc.read_job(self.job)[1]
+        envelope = analysis.Envelope(3)
+        envelope.update(np.full((2, 3, 2), np.nan))
+
+        record = sbc.envelope_record(job, envelope)
+
+        self.assertEqual(record['num_failed'], 2)
+        self.assertEqual(record['max_r'], [None]*3)
+        json.loads(json.dumps(record, allow_nan=False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import bolt_group
+import spatial
+import unittest
+import numpy as np
+
+class TestSpatial(unittest.TestCase):
+
+    def setUp(self):
+        x, y = np.meshgrid(np.arange(10)*3.0, np.arange(8)*3.0)
+        self.x = x.ravel()
+        self.y = y.ravel()
+
+    def tearDown(self):
+        del self.x
+        del self.y
+
+    def test_convex_hull(self):
+        hull = spatial.convex_hull(self.x, self.y)
+
+        corners = set(zip(self.x[hull].tolist(), self.y[hull].tolist()))
+        self.assertEqual(corners, set([(0.0, 0.0), (27.0, 0.0), (27.0, 21.0),
+                                       (0.0, 21.0)]))
+
+    def test_degenerate_hull(self):
+        self.assertEqual(len(spatial.convex_hull([0.0, 0.0, 0.0],
+                                                 [0.0, 3.0, 6.0])), 2)
+        self.assertEqual(len(spatial.convex_hull([1.0, 1.0], [2.0, 2.0])), 1)
+
+    def test_farthest(self):
+        rng = np.random.RandomState(1)
+        x = rng.uniform(-10.0, 10.0, 500)
+        y = rng.uniform(-10.0, 10.0, 500)
+        index = spatial.BoltIndex(x, y)
+        x0 = rng.uniform(-30.0, 30.0, 50)
+        y0 = rng.uniform(-30.0, 30.0, 50)
+
+        farthest, d_max = index.farthest(x0, y0)
+        d = np.hypot(x - x0[:, np.newaxis], y - y0[:, np.newaxis])
+
+        np.testing.assert_allclose(d_max, d.max(axis=1))
+        self.assertEqual(farthest.tolist(), d.argmax(axis=1).tolist())
+        self.assertAlmostEqual(index.d_max(x0[0], y0[0]), d[0].max())
+
+    def test_distances_reuse(self):
+        index = spatial.BoltIndex(self.x, self.y)
+        out = (np.empty(80), np.empty(80), np.empty(80))
+
+        dx, dy, d = index.distances(1.0, 2.0, out=out)
+
+        self.assertIs(d, out[2])
+        np.testing.assert_allclose(d, np.hypot(self.x - 1.0, self.y - 2.0))
+
+    def test_group_d_max(self):
+        group = bolt_group.BoltGroup(self.x, self.y)
+
+        bolt_group.calc_bolt_location_wrt_ic(group, -5.0, 4.0)
+
+        self.assertEqual(len(group.index.hull), 4)
+        self.assertAlmostEqual(bolt_group.calc_d_max(group), group.d.max())
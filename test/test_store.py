@@ -0,0 +1,72 @@
+import analysis
+import bolt_group
+import store
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'reactions')
+        self.reactions = np.random.RandomState(0).standard_normal((23, 5, 3))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_write_read(self):
+        with store.ReactionWriter(self.path, 5, 3, chunk_size=8,
+                                  bolt_num=[10, 11, 12, 13, 14]) as writer:
+            # blocks that straddle the chunk boundaries
+            for start, stop in ((0, 3), (3, 10), (10, 11), (11, 20),
+                                (20, 23)):
+                writer.append(self.reactions[start:stop])
+
+        reader = store.ReactionStore(self.path)
+        self.assertEqual(reader.shape, (23, 5, 3))
+        self.assertEqual(reader.bolt_num.tolist(), [10, 11, 12, 13, 14])
+        self.assertEqual(len(os.listdir(self.path)), 4)
+
+        for i in range(5):
+            np.testing.assert_array_equal(reader.bolt(i),
+                                          self.reactions[:, i])
+        np.testing.assert_array_equal(reader.cases(), self.reactions)
+        np.testing.assert_array_equal(reader.cases(6, 19),
+                                      self.reactions[6:19])
+        np.testing.assert_array_equal(reader.cases(-2), self.reactions[-2:])
+        self.assertEqual(reader.cases(5, 5).shape, (0, 5, 3))
+
+        with self.assertRaises(ValueError):
+            store.ReactionWriter(self.path, 5)
+        store.ReactionWriter(self.path, 5, overwrite=True).close()
+        self.assertEqual(len(store.ReactionStore(self.path)), 0)
+        self.assertEqual(os.listdir(self.path), ['manifest.json'])
+
+    def test_save_reactions(self):
+        group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                     [0.0, 3.0, 6.0, 0.0, 3.0, 6.0], 1.0)
+        rng = np.random.RandomState(1)
+        points = rng.uniform(-20.0, 20.0, (50, 3))
+        loads = rng.uniform(-5.0, 5.0, (50, 3))
+        chunks = [(points[i:i + 16], loads[i:i + 16])
+                  for i in range(0, 50, 16)]
+
+        reader = store.save_reactions(self.path, group, chunks,
+                                      chunk_size=20)
+
+        expected = analysis.calc_elastic_reactions(group, points, loads)
+        np.testing.assert_allclose(reader.cases(), expected)
+        np.testing.assert_allclose(reader.bolt(4), expected[:, 4])
+
+        envelope = reader.envelope()
+        full = analysis.Envelope(len(group))
+        full.update(expected)
+        np.testing.assert_allclose(envelope.max_r, full.max_r)
+        np.testing.assert_array_equal(envelope.max_r_case, full.max_r_case)
+        self.assertEqual(envelope.num_cases, 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import bolt_group
+import analysis
+import superposition
+import unittest
+import numpy as np
+
+class TestSuperposition(unittest.TestCase):
+
+    def setUp(self):
+        self.group = bolt_group.BoltGroup([0.0, 0.0, 0.0, 6.0, 6.0, 6.0],
+                                          [0.0, 3.0, 6.0, 0.0, 3.0, 6.0], 1.0)
+        self.points = np.array([(23.0, 8.0, 0.0), (4.0, 0.0, 2.0),
+                                (3.0, 3.0, 0.0), (-10.0, 1.0, 0.0)])
+        self.loads = np.array([(0.6, -0.8, 0.0), (0.0, -1.0, 5.0),
+                               (2.0, -1.0, 0.0), (-3.0, 4.0, 0.0)])
+
+    def tearDown(self):
+        del self.group
+        del self.points
+        del self.loads
+
+    def test_superpose_matches_elastic(self):
+        coefficients = superposition.influence_coefficients(self.group)
+        actions = superposition.calc_actions(self.group, self.points,
+                                             self.loads)
+        reactions = superposition.superpose(coefficients, actions)
+
+        expected = analysis.calc_elastic_reactions(self.group, self.points,
+                                                   self.loads)
+        self.assertEqual(reactions.shape, (4, 6, 2))
+        np.testing.assert_allclose(reactions, expected, atol=1e-12)
+
+    def test_combination_reactions(self):
+        factors = np.array([[1.2, 1.6, 0.0, 0.0],
+                            [0.9, 0.0, 1.0, 0.5],
+                            [1.4, 0.0, 0.0, 0.0]])
+        reactions = superposition.calc_combination_reactions(
+            self.group, self.points, self.loads, factors)
+
+        single = analysis.calc_elastic_reactions(self.group, self.points,
+                                                 self.loads)
+        expected = np.einsum('km,mjc->kjc', factors, single)
+        self.assertEqual(reactions.shape, (3, 6, 2))
+        np.testing.assert_allclose(reactions, expected, atol=1e-12)
+
+        with self.assertRaises(ValueError):
+            superposition.combine(factors[:, :3], np.zeros((4, 3)))
+
+    def test_single_bolt(self):
+        single = bolt_group.BoltGroup([2.0], [1.0], 1.0)
+
+        # concentric, the one bolt takes the whole force
+        reactions = superposition.calc_combination_reactions(
+            single, [(2.0, 1.0, 0.0)], [(0.0, -10.0, 0.0)], [[1.0]])
+        np.testing.assert_allclose(reactions, [[[0.0, 10.0]]])
+
+        # ex = 5, one bolt can not resist the moment
+        with self.assertRaises(ValueError):
+            superposition.calc_combination_reactions(
+                single, [(7.0, 1.0, 0.0)], [(0.0, -10.0, 0.0)], [[1.0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import workbook
+import unittest
+import csv
+import os
+import shutil
+import tempfile
+import numpy as np
+
+PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                    'ConnectionCheck_Elastic.xlsm')
+
+@unittest.skipIf(workbook.openpyxl is None, 'openpyxl is not installed')
+class TestWorkbook(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_read_workbook(self):
+        connection = workbook.read_workbook(PATH)
+
+        self.assertEqual(len(connection.group), 24)
+        self.assertEqual(connection.group.bolt_num[0], 1)
+        self.assertEqual(connection.group.diameter[0], 0.875)
+        self.assertAlmostEqual(connection.area, np.pi*0.875**2/4)
+        np.testing.assert_allclose(connection.loads,
+                                   [24.0, 0.0, 0.0, 0.0, -4896.0, 0.0])
+        np.testing.assert_allclose(connection.actions, [24.0, 0.0, 0.0])
+        self.assertEqual(connection.group.centroid, (0.0, 0.0))
+
+    def test_check_workbooks(self):
+        paths = []
+        for i in range(3):
+            paths.append(os.path.join(self.tmp, 'cnxn%d.xlsm' % i))
+            shutil.copy(PATH, paths[-1])
+
+        results = list(workbook.check_workbooks(paths, max_workers=1))
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            # direct shear only, matches the value calculated by Excel
+            np.testing.assert_allclose(result.reactions,
+                                       [[-1.0, 0.0]]*24, atol=1e-12)
+            self.assertAlmostEqual(result.v_max, 1.0)
+            self.assertAlmostEqual(result.v_max,
+                                   result.connection.workbook_v_max)
+            # My = -4896 kip-in, outermost bolts at x = +/-9 in, Iyy = 1008 in2
+            self.assertAlmostEqual(result.t_max, 4896.0*9/1008)
+            self.assertEqual(result.tension.shape, (24,))
+            self.assertAlmostEqual(result.tension.min(), -4896.0*9/1008)
+            self.assertAlmostEqual(result.t_stress,
+                                   result.t_max/result.connection.area)
+            # the workbook shares the moment between the tension bolts
+            self.assertAlmostEqual(result.connection.workbook_t_max, 34.0)
+
+        summary = os.path.join(self.tmp, 'summary.csv')
+        self.assertEqual(workbook.write_summary(results, summary), 3)
+        with open(summary) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1]['path'], paths[1])
+        self.assertAlmostEqual(float(rows[1]['v_max']), 1.0)
+        self.assertAlmostEqual(float(rows[1]['my']), -4896.0)
+        self.assertAlmostEqual(float(rows[1]['t_max']), 4896.0*9/1008)
+        self.assertAlmostEqual(float(rows[1]['workbook_t_max']), 34.0)
+
+    def test_check_single_bolt(self):
+        group = workbook.bolt_group.BoltGroup([0.0], [0.0], 0.875)
+        loads = np.array([0.0, -10.0, 0.0, 0.0, 0.0, 0.0])
+        connection = workbook.Connection('single.xlsm', 'single', group, 0.6,
+                                         loads, None, None, None)
+
+        result = workbook.check_connection(connection)
+        self.assertAlmostEqual(result.v_max, 10.0)
+
+        # a single bolt has j = 0 and can not resist Mz
+        loads[5] = -50.0
+        with self.assertRaises(ValueError):
+            workbook.check_connection(connection)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""The workbook module reads connections from copies of the
+ConnectionCheck_Elastic.xlsm workbook and checks them in bulk.
+
+Each workbook describes one connection. The bolts and the loads are read
+without Excel, with openpyxl in read-only mode. The elastic in plane bolt
+reactions of every workbook are calculated with the superposition module and
+the bolt tension due to Pz, Mx and My with the neutral axis at the centroid
+with the out_plane module. The results are collected in a summary that can be
+written to a CSV file.
+
+Workbook layout:
+    Input sheet:
+        rows 11 to 110: one bolt per row, bolt number in column C, x in
+                        column D, y in column E and "x" in column F when the
+                        bolt is part of the connection
+        K11: bolt diameter db
+        K12: bolt area Ab
+    woInitialTension_NAatCenter sheet:
+        C5: title of the connection
+        D9 to D14: Px, Py, Pz, Mx, My, Mz about the centroid of the bolts
+        D131: maximum bolt shear Vmax calculated by Excel
+        D134: maximum bolt tension Tmax calculated by Excel
+        D135: tension stress tmax = Tmax/Ab calculated by Excel
+
+Notes:
+    The formulas of the workbook are not evaluated. The values Excel cached
+    when the workbook was last saved are read, so a workbook must have been
+    saved by Excel after its inputs were changed.
+
+    The workbook shares each moment equally between the bolts on the tension
+    side of the centroid, with the distance between the average tension and
+    compression bolt as lever arm. check_connection treats the bolt pattern
+    as a linear elastic section, see out_plane.ecc_out_plane_assume_na_batch,
+    which puts more tension on the outermost bolts, so t_max and
+    workbook_t_max differ when a moment is applied.
+
+    openpyxl is optional and only needed for read_workbook.
+"""
+import collections
+import concurrent.futures
+import csv
+
+import numpy as np
+
+import bolt_group
+import models
+import out_plane
+import superposition
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+INPUT_SHEET = 'Input'
+LOAD_SHEET = 'woInitialTension_NAatCenter'
+FIRST_BOLT_ROW = 11
+LAST_BOLT_ROW = 110
+
+SUMMARY_COLUMNS = ('path', 'title', 'num_bolts', 'diameter', 'px', 'py', 'pz',
+                   'mx', 'my', 'mz', 'v_max', 'v_max_bolt', 'v_stress',
+                   'workbook_v_max', 't_max', 't_max_bolt', 't_stress',
+                   'workbook_t_max', 'workbook_t_stress')
+
+
+class Connection(collections.namedtuple('Connection',
+                                        ['path', 'title', 'group', 'area',
+                                         'loads', 'workbook_v_max',
+                                         'workbook_t_max',
+                                         'workbook_t_stress'])):
+    """Connection read from a workbook.
+
+    path (str): file name of the workbook
+    title (str): title of the connection
+    group (BoltGroup): selected bolts of the workbook
+    area (float): bolt area Ab
+    loads (ndarray): (Px, Py, Pz, Mx, My, Mz) about the centroid
+    workbook_v_max (float): maximum bolt shear calculated by Excel, None if
+                            the workbook has no cached value
+    workbook_t_max (float): maximum bolt tension calculated by Excel, None if
+                            the workbook has no cached value
+    workbook_t_stress (float): tension stress calculated by Excel, None if
+                               the workbook has no cached value
+    """
+    __slots__ = ()
+
+    @property
+    def actions(self):
+        """In plane resultant (Px, Py, Mz), see the superposition module."""
+        return np.array([self.loads[0], self.loads[1], self.loads[5]])
+
+
+class Result(collections.namedtuple('Result',
+                                    ['connection', 'reactions', 'v_max',
+                                     'v_max_bolt', 'tension', 't_max',
+                                     't_max_bolt'])):
+    """Elastic check of one connection.
+
+    connection (Connection): connection checked
+    reactions (ndarray): (num_bolts, 2) reactions (Rx, Ry) of each bolt
+    v_max (float): largest resultant bolt reaction
+    v_max_bolt: bolt number of the bolt with the largest reaction
+    tension (ndarray): (num_bolts,) tension of each bolt, negative for bolts
+                       on the compression side
+    t_max (float): largest bolt tension, 0 if no bolt is in tension
+    t_max_bolt: bolt number of the bolt with the largest tension, None if no
+                bolt is in tension
+    """
+    __slots__ = ()
+
+    @property
+    def v_stress(self):
+        """Shear stress of the most loaded bolt, v_max/Ab."""
+        return self.v_max/self.connection.area
+
+    @property
+    def t_stress(self):
+        """Tension stress of the most loaded bolt, t_max/Ab."""
+        return self.t_max/self.connection.area
+
+    def summary(self):
+        """Return the row of the result in the summary, see SUMMARY_COLUMNS."""
+        connection = self.connection
+        px, py, pz, mx, my, mz = connection.loads.tolist()
+        return (connection.path, connection.title, len(connection.group),
+                connection.group.diameter[0].item(), px, py, pz, mx, my, mz,
+                self.v_max, self.v_max_bolt, self.v_stress,
+                connection.workbook_v_max, self.t_max, self.t_max_bolt,
+                self.t_stress, connection.workbook_t_max,
+                connection.workbook_t_stress)
+
+
+def _number(value, cell):
+    if not isinstance(value, (int, float)):
+        raise ValueError('%s must be a number, found %r; save the workbook in '
+                         'Excel so its formulas have values' % (cell, value))
+    return float(value)
+
+
+def read_workbook(path):
+    """Read the connection of a workbook.
+
+    Args:
+        path (str): file name of the workbook
+
+    Returns:
+        connection (Connection): bolts and loads of the workbook
+
+    Raises:
+        ImportError: openpyxl is not installed
+        ValueError: a required cell is empty or not a number, or no bolt is
+                    selected
+    """
+    if openpyxl is None:
+        raise ImportError('reading workbooks requires openpyxl')
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        inputs = wb[INPUT_SHEET]
+        bolt_num, x, y = [], [], []
+        for row, (num, bolt_x, bolt_y, selected) in enumerate(
+                inputs.iter_rows(min_row=FIRST_BOLT_ROW,
+                                 max_row=LAST_BOLT_ROW, min_col=3, max_col=6,
+                                 values_only=True), FIRST_BOLT_ROW):
+            if selected == 'x':
+                bolt_num.append(num)
+                x.append(_number(bolt_x, '%s!D%d' % (INPUT_SHEET, row)))
+                y.append(_number(bolt_y, '%s!E%d' % (INPUT_SHEET, row)))
+        if not x:
+            raise ValueError('%s has no selected bolts' % (path,))
+
+        (diameter,), (area,) = inputs.iter_rows(min_row=11, max_row=12,
+                                                min_col=11, max_col=11,
+                                                values_only=True)
+        diameter = _number(diameter, '%s!K11' % (INPUT_SHEET,))
+        area = _number(area, '%s!K12' % (INPUT_SHEET,))
+
+        sheet = wb[LOAD_SHEET]
+        title = next(sheet.iter_rows(min_row=5, max_row=5, min_col=3,
+                                     max_col=3, values_only=True))[0]
+        loads = [_number(value, '%s!D%d' % (LOAD_SHEET, row))
+                 for row, (value,) in enumerate(
+                     sheet.iter_rows(min_row=9, max_row=14, min_col=4,
+                                     max_col=4, values_only=True), 9)]
+        cached = [value for (value,) in sheet.iter_rows(
+            min_row=131, max_row=135, min_col=4, max_col=4, values_only=True)]
+    finally:
+        wb.close()
+
+    group = bolt_group.BoltGroup(x, y, diameter, bolt_num)
+    # D131, D134 and D135
+    v_max, t_max, t_stress = [value if isinstance(value, (int, float))
+                              else None
+                              for value in (cached[0], cached[3], cached[4])]
+
+    return Connection(path, title, group, area, np.array(loads), v_max, t_max,
+                      t_stress)
+
+
+def check_connection(connection):
+    """Calculate the elastic bolt shear and tension of a connection.
+
+    Args:
+        connection (Connection): connection read by read_workbook
+
+    Returns:
+        result (Result): reactions, tension and the most loaded bolts
+
+    Raises:
+        ValueError: a moment the selected bolts can not resist, for example
+                    Mz on a single bolt, see superposition.superpose and
+                    out_plane.divide_moment
+    """
+    group = connection.group
+    coefficients = superposition.influence_coefficients(group)
+    reactions = superposition.superpose(coefficients, connection.actions)[0]
+    r = np.hypot(reactions[:, 0], reactions[:, 1])
+    i = int(r.argmax())
+
+    pz, mx, my = connection.loads[2:5]
+    tension = -1*out_plane.ecc_out_plane_assume_na_resultants(group, pz, mx,
+                                                              my)[0]
+    k = int(tension.argmax())
+    if tension[k] > 0.0:
+        t_max, t_max_bolt = tension[k].item(), group.bolt_num[k].item()
+    else:
+        t_max, t_max_bolt = 0.0, None
+
+    return Result(connection, reactions, r[i].item(),
+                  group.bolt_num[i].item(), tension, t_max, t_max_bolt)
+
+
+def _check_task(path):
+    """Read and check one workbook in a worker."""
+    return check_connection(read_workbook(path))
+
+
+def check_workbooks(paths, max_workers=None, tasks_per_submit=4):
+    """Read and check many workbooks over a pool of processes.
+
+    Args:
+        paths (iterable): file names of the workbooks
+        max_workers (int): number of worker processes, 0 or 1 runs in the
+                           calling process, None uses one per CPU
+        tasks_per_submit (int): number of workbooks sent to a worker at a time
+
+    Yields:
+        result (Result): result of each workbook in input order
+    """
+    if max_workers is not None and max_workers <= 1:
+        for path in paths:
+            yield _check_task(path)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers, initializer=models.init_worker,
+                initargs=(models.active,)) as executor:
+            for result in executor.map(_check_task, paths,
+                                       chunksize=tasks_per_submit):
+                yield result
+
+
+def write_summary(results, path):
+    """Write one row per workbook result to a CSV file.
+
+    Args:
+        results (iterable): Result of each workbook
+        path (str): file name of the summary
+
+    Returns:
+        count (int): number of rows written
+    """
+    count = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_COLUMNS)
+        for result in results:
+            writer.writerow(['' if value is None else value
+                             for value in result.summary()])
+            count += 1
+    return count